@@ -1,11 +1,13 @@
 
 from fastapi import FastAPI
-from app.routers.test_route import TestRouter
-from app.routers.chat_route import ChatRouter
-from app.routers.docs_route import DocsRouter
 
 class RouterRegistration:
     def __init__(self, app:FastAPI):
+        # Imported when the app is built, the routers pull in their controllers and managers
+        from app.routers.test_route import TestRouter
+        from app.routers.chat_route import ChatRouter
+        from app.routers.docs_route import DocsRouter
+
         docs_router = DocsRouter()
         chat_router = ChatRouter()
         test_router = TestRouter()
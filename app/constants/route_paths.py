@@ -17,3 +17,4 @@ class RoutePaths:
     INGEST = "/ingest"
     INGEST_SEARCH = "/ingest/search"
     CHAT = "/chat"
+    CHAT_STREAM = "/chat/stream"
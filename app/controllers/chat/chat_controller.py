@@ -1,4 +1,7 @@
-from fastapi import HTTPException
+import json
+import logging
+from typing import AsyncIterator
+from fastapi import HTTPException, Request
 from app.databases.sqlite_database_manager import SQLiteDBManager
 from app.models.response_model import ResponseModel
 from app.models.chat_model import ChatRequestModel
@@ -6,7 +9,49 @@ from app.models.chat_model import ChatRequestModel
 class ChatController(SQLiteDBManager):
     def __init__(self) -> None:
         super().__init__()
-        pass
+        self.llm_manager = None
     
     def chat_with_llm(self, chat_model: ChatRequestModel) -> ResponseModel:
-        raise HTTPException(status_code=ResponseModel.INTERNAL_SERVER_ERROR_500, detail="Unimplemented method!")
\ No newline at end of file
+        raise HTTPException(status_code=ResponseModel.INTERNAL_SERVER_ERROR_500, detail="Unimplemented method!")
+
+    def get_llm_manager(self):
+        if self.llm_manager is None:
+            # Imported on first use, LangChain is not needed until the first chat
+            from app.langchain.local_llm_manager import LocalLLMManager
+            self.llm_manager = LocalLLMManager()
+        return self.llm_manager
+
+    async def stream_chat_with_llm(self, chat_model: ChatRequestModel, request: Request) -> AsyncIterator[str]:
+        """
+        Yields the answer as server-sent events: one `data` event per token, then an `end` event.
+        Stops pulling tokens from the LLM as soon as the client disconnects.
+        """
+        tokens = None
+        try:
+            llm_manager = self.get_llm_manager()
+            if chat_model.store:
+                tokens = llm_manager.astream_conversational_chain(prompt=chat_model.question)
+            else:
+                from langchain_core.prompts import PromptTemplate
+                tokens = llm_manager.astream_llm_chain(
+                    prompt_template=PromptTemplate.from_template("{question}"),
+                    input_values={"question": chat_model.question},
+                )
+
+            async for token in tokens:
+                if await request.is_disconnected():
+                    logging.info("Client disconnected, stopping the chat stream")
+                    return
+                yield self.format_event({"token": token})
+            yield self.format_event({}, event="end")
+        except Exception as e:
+            logging.error(f"Error while streaming chat response: {e}")
+            yield self.format_event({"error": str(e)}, event="error")
+        finally:
+            if tokens is not None:
+                await tokens.aclose()
+
+    @staticmethod
+    def format_event(data: dict, event: str = None) -> str:
+        prefix = f"event: {event}\n" if event else ""
+        return f"{prefix}data: {json.dumps(data)}\n\n"
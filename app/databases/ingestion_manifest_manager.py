@@ -0,0 +1,48 @@
+import json
+from typing import Dict, List
+from app.databases.sqlite_database_manager import SQLiteDBManager
+
+class IngestionManifestManager(SQLiteDBManager):
+    """Keeps the checksum and vector ids of every ingested file per collection in the SQLite database."""
+    TABLE_NAME = "ingestion_manifest"
+
+    def __init__(self):
+        super().__init__()
+        self.create_manifest_table()
+
+    def create_manifest_table(self):
+        query = f'''
+            CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                collection_name TEXT NOT NULL,
+                source TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                chunk_ids TEXT NOT NULL,
+                ingested_at TEXT NOT NULL,
+                PRIMARY KEY (collection_name, source)
+            )
+        '''
+        self._execute_query(query)
+
+    def get_manifest(self, collection_name: str) -> Dict[str, Dict]:
+        """Returns the manifest entries of a collection keyed by source path."""
+        query = f"SELECT source, checksum, chunk_ids FROM {self.TABLE_NAME} WHERE collection_name = ?"
+        rows = self._execute_query(query, (collection_name,)) or []
+        return {
+            row['source']: {"checksum": row['checksum'], "chunk_ids": json.loads(row['chunk_ids'])}
+            for row in rows
+        }
+
+    def save_entry(self, collection_name: str, source: str, checksum: str, chunk_ids: List[str]):
+        query = f'''
+            INSERT OR REPLACE INTO {self.TABLE_NAME} (collection_name, source, checksum, chunk_ids, ingested_at)
+            VALUES (?, ?, ?, ?, ?)
+        '''
+        self._execute_query(query, (collection_name, source, checksum, json.dumps(chunk_ids), self.get_current_timestamp_str()))
+
+    def delete_entry(self, collection_name: str, source: str):
+        query = f"DELETE FROM {self.TABLE_NAME} WHERE collection_name = ? AND source = ?"
+        self._execute_query(query, (collection_name, source))
+
+    def delete_collection(self, collection_name: str):
+        query = f"DELETE FROM {self.TABLE_NAME} WHERE collection_name = ?"
+        self._execute_query(query, (collection_name,))
@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import psycopg2
+
+class PostgresConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    Keeps between `min_size` and `max_size` connections open. `acquire` waits up to
+    `acquire_timeout` seconds for a free connection and raises TimeoutError after that.
+    Connections idle for longer than `health_check_interval` seconds are checked with
+    `SELECT 1` before they are handed out and replaced when the check fails.
+    """
+    _pools: Dict[Tuple, "PostgresConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(
+        self,
+        conn_params: Dict[str, Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        acquire_timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        connect: Callable[..., Any] = psycopg2.connect,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.conn_params = conn_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.__CONNECT = connect
+        self.__CONDITION = threading.Condition()
+        # Idle connections with the time they were returned, most recently used last
+        self.__IDLE: List[Tuple[Any, float]] = []
+        self.__SIZE = 0
+        self.__METRICS = {
+            "acquired": 0,
+            "created": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "total_wait_time": 0.0,
+        }
+        try:
+            for _ in range(min_size):
+                self.__IDLE.append((self.__open_connection(), time.monotonic()))
+        except Exception as e:
+            # The database may not be up yet, connections are then opened on demand
+            logging.warning(f"Could not pre-open PostgreSQL connections: {e}")
+
+    @classmethod
+    def for_params(cls, conn_params: Dict[str, Any], **kwargs) -> "PostgresConnectionPool":
+        """
+        Returns the process wide pool for these connection parameters, creating it on first use.
+        Sizes and timeouts are fixed by the first caller; differing ones are logged and ignored.
+        """
+        key = tuple(sorted((name, str(value)) for name, value in conn_params.items()))
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls._pools[key] = cls(conn_params, **kwargs)
+            else:
+                ignored = {name: value for name, value in kwargs.items() if getattr(pool, name, value) != value}
+                if ignored:
+                    current = {name: getattr(pool, name) for name in ignored}
+                    logging.warning(f"PostgreSQL pool for these connection parameters already exists with {current}, ignoring {ignored}")
+            return pool
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            with self.__CONDITION:
+                while not self.__IDLE and self.__SIZE >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.__METRICS["timeouts"] += 1
+                        raise TimeoutError(f"No PostgreSQL connection available within {timeout}s (pool size {self.max_size})")
+                    self.__CONDITION.wait(remaining)
+                if self.__IDLE:
+                    connection, released_at = self.__IDLE.pop()
+                else:
+                    # Reserve the slot now, the handshake itself happens outside the lock
+                    connection, released_at = None, None
+                    self.__SIZE += 1
+
+            if connection is None:
+                try:
+                    connection = self.__CONNECT(**self.conn_params)
+                except Exception:
+                    with self.__CONDITION:
+                        self.__SIZE -= 1
+                        self.__CONDITION.notify()
+                    raise
+                with self.__CONDITION:
+                    self.__METRICS["created"] += 1
+            elif not self.__is_healthy(connection, released_at):
+                with self.__CONDITION:
+                    self.__METRICS["health_check_failures"] += 1
+                    self.__discard(connection)
+                    self.__CONDITION.notify()
+                continue
+
+            with self.__CONDITION:
+                self.__METRICS["acquired"] += 1
+                self.__METRICS["total_wait_time"] += time.monotonic() - started
+            return connection
+
+    def release(self, connection: Any, discard: bool = False):
+        with self.__CONDITION:
+            if discard or getattr(connection, "closed", False):
+                self.__discard(connection)
+            else:
+                self.__IDLE.append((connection, time.monotonic()))
+            self.__CONDITION.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Lends a connection, rolling back and returning it to the pool when the block exits."""
+        connection = self.acquire(timeout=timeout)
+        discard = False
+        try:
+            yield connection
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.__CONDITION:
+            idle = len(self.__IDLE)
+            acquired = self.__METRICS["acquired"]
+            return {
+                "size": self.__SIZE,
+                "idle": idle,
+                "in_use": self.__SIZE - idle,
+                "max_size": self.max_size,
+                **self.__METRICS,
+                "average_wait_time": self.__METRICS["total_wait_time"] / acquired if acquired else 0.0,
+            }
+
+    def close(self):
+        with self.__CONDITION:
+            while self.__IDLE:
+                connection, _ = self.__IDLE.pop()
+                self.__discard(connection)
+            self.__CONDITION.notify_all()
+
+    def __open_connection(self) -> Any:
+        connection = self.__CONNECT(**self.conn_params)
+        self.__SIZE += 1
+        self.__METRICS["created"] += 1
+        return connection
+
+    def __is_healthy(self, connection: Any, released_at: float) -> bool:
+        if getattr(connection, "closed", False):
+            return False
+        if time.monotonic() - released_at < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception as e:
+            logging.warning(f"Discarding PostgreSQL connection that failed its health check: {e}")
+            return False
+
+    def __discard(self, connection: Any):
+        self.__SIZE -= 1
+        self.__METRICS["discarded"] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -1,13 +1,16 @@
+import asyncio
 import json
 import psycopg2
 import traceback
 import logging
+from typing import Any, Dict
+from app.databases.postgres_connection_pool import PostgresConnectionPool
 from app.utils.utility_manager import UtilityManager
 from app.enums.env_keys import EnvKeys
 
 class PostgreSQLManager(UtilityManager):
 
-    def __init__(self):
+    def __init__(self, min_pool_size: int = 1, max_pool_size: int = 10, acquire_timeout: float = 30.0, health_check_interval: float = 30.0):
         super().__init__()
         self.conn_params = {
             'host': self.get_env_variable(EnvKeys.POSTGRES_DB_HOST.value),
@@ -16,30 +19,40 @@ class PostgreSQLManager(UtilityManager):
             'password': self.get_env_variable(EnvKeys.POSTGRES_DB_PASSWORD.value),
             'port': self.get_env_variable(EnvKeys.POSTGRES_DB_PORT.value)
         }
-
-    def _get_connection(self):
-        return psycopg2.connect(**self.conn_params)
+        # Every manager with the same connection parameters shares one pool
+        self.pool = PostgresConnectionPool.for_params(
+            self.conn_params,
+            min_size=min_pool_size,
+            max_size=max_pool_size,
+            acquire_timeout=acquire_timeout,
+            health_check_interval=health_check_interval,
+        )
 
     def _execute_query(self, query, params=None, fetch_one=False, return_headers=False):
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            if fetch_one:
-                result = cursor.fetchone()
-            else:
-                result = cursor.fetchall() if cursor.description else None
-            headers = [desc[0] for desc in cursor.description] if cursor.description else []
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with self.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params)
+                    if fetch_one:
+                        result = cursor.fetchone()
+                    else:
+                        result = cursor.fetchall() if cursor.description else None
+                    headers = [desc[0] for desc in cursor.description] if cursor.description else []
+                conn.commit()
             if return_headers:
                 return result, headers
             return result
         except (psycopg2.Error, Exception) as e:
-            logging.error("Error executing query:", e)
+            logging.error(f"Error executing query: {e}")
             return None
 
+    async def _aexecute_query(self, query, params=None, fetch_one=False, return_headers=False):
+        """Runs `_execute_query` on a worker thread so async FastAPI handlers do not block the event loop."""
+        return await asyncio.to_thread(self._execute_query, query, params, fetch_one, return_headers)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        return self.pool.stats()
+
     def find_collection(self, collection_id: str = 'vectorstore'):
         try:
             __findcollection_query = "SELECT * FROM langchain_pg_collection WHERE name = %s"
@@ -1,30 +1,63 @@
+import os
 import json
 import redis
+from typing import Any, Dict, Iterable, Optional
 
 from app.enums.env_keys import EnvKeys
+from app.enums.redis_serializer import RedisSerializer
 from app.utils.utility_manager import UtilityManager
 
+BATCH_SIZE = 1000
+
 class RedisManager(UtilityManager):
-    def __init__(self):
-        self.__HOST = self.get_env_variable(EnvKeys.REDIS_HOST.value)
-        self.__PORT = self.get_env_variable(EnvKeys.REDIS_PORT.value)
-        self.__PASSWROD = self.get_env_variable(EnvKeys.REDIS_PASSWORD.value)
-        self.__DATABASE = self.get_env_variable(EnvKeys.REDIS_DATABASE.value)
-        
-        self.redis_client = redis.StrictRedis(
-            host=self.__HOST,
-            port=self.__PORT,
-            password=self.__PASSWROD,
-            db=self.__DATABASE,
-            decode_responses=True  # To get string responses instead of bytes
-        )
-
-    def set_value(self, key, value):
-        """
-        Set the value for a given key.
+    def __init__(self, redis_client=None, serializer: Optional[str] = None, default_ttl: Optional[int] = None):
+        """
+        Values are serialized with JSON, or with msgpack when `serializer` (or the optional
+        REDIS_SERIALIZER variable) is "msgpack". Keys set without a TTL expire after
+        `default_ttl` seconds (or REDIS_DEFAULT_TTL), if given.
+        """
+        self.serializer = RedisSerializer((serializer or os.getenv(EnvKeys.REDIS_SERIALIZER.value) or RedisSerializer.JSON.value).lower())
+        if self.serializer == RedisSerializer.MSGPACK:
+            # msgpack is an optional dependency, only needed for this serializer
+            import msgpack
+            self.__MSGPACK = msgpack
+        default_ttl = default_ttl or os.getenv(EnvKeys.REDIS_DEFAULT_TTL.value)
+        self.default_ttl = int(default_ttl) if default_ttl else None
+
+        if redis_client is None:
+            self.__HOST = self.get_env_variable(EnvKeys.REDIS_HOST.value)
+            self.__PORT = self.get_env_variable(EnvKeys.REDIS_PORT.value)
+            self.__PASSWROD = self.get_env_variable(EnvKeys.REDIS_PASSWORD.value)
+            self.__DATABASE = self.get_env_variable(EnvKeys.REDIS_DATABASE.value)
+
+            redis_client = redis.StrictRedis(
+                host=self.__HOST,
+                port=self.__PORT,
+                password=self.__PASSWROD,
+                db=self.__DATABASE,
+                # To get string responses instead of bytes; msgpack values are binary
+                decode_responses=self.serializer == RedisSerializer.JSON
+            )
+        self.redis_client = redis_client
+
+    def serialize(self, value: Any):
+        if self.serializer == RedisSerializer.MSGPACK:
+            return self.__MSGPACK.packb(value, use_bin_type=True)
+        return json.dumps(value)
+
+    def deserialize(self, payload) -> Any:
+        if payload is None:
+            return None
+        if self.serializer == RedisSerializer.MSGPACK:
+            return self.__MSGPACK.unpackb(payload, raw=False)
+        return json.loads(payload)
+
+    def set_value(self, key, value, ttl: Optional[int] = None):
+        """
+        Set the value for a given key, expiring after `ttl` seconds if given.
         """
         try:
-            self.redis_client.set(key, json.dumps(value))
+            self.redis_client.set(key, self.serialize(value), ex=ttl or self.default_ttl)
             print(f"Value set for key: {key}")
         except Exception as e:
             print(f"Error setting value: {e}")
@@ -37,7 +70,7 @@ class RedisManager(UtilityManager):
             value = self.redis_client.get(key)
             if value is None:
                 print(f"No value found for key: {key}")
-            return json.loads(value)
+            return self.deserialize(value)
         except Exception as e:
             print(f"Error getting value: {e}")
 
@@ -54,8 +87,68 @@ class RedisManager(UtilityManager):
         except Exception as e:
             print(f"Error deleting key: {e}")
 
-    def update_value(self, key, value):
+    def update_value(self, key, value, ttl: Optional[int] = None):
         """
         Update the value for a given key. This is effectively the same as set_value.
         """
-        self.set_value(key, value)
+        self.set_value(key, value, ttl=ttl)
+
+    def mset(self, values: Dict[str, Any], ttl: Optional[int] = None, batch_size: int = BATCH_SIZE) -> int:
+        """
+        Set many keys, one pipelined round-trip per `batch_size` keys. Returns the number of keys set.
+        """
+        ttl = ttl or self.default_ttl
+        count = 0
+        try:
+            for batch in self.iter_batches(values.items(), batch_size):
+                pipeline = self.redis_client.pipeline(transaction=False)
+                if ttl:
+                    # MSET takes no expiry, so every key gets its own SET ... EX
+                    for key, value in batch:
+                        pipeline.set(key, self.serialize(value), ex=ttl)
+                else:
+                    pipeline.mset({key: self.serialize(value) for key, value in batch})
+                pipeline.execute()
+                count += len(batch)
+        except Exception as e:
+            print(f"Error setting values: {e}")
+        return count
+
+    def mget(self, keys: Iterable[str], batch_size: int = BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Get many keys with one MGET per `batch_size` keys. Missing keys are left out of the result.
+        """
+        values = {}
+        try:
+            for batch in self.iter_batches(keys, batch_size):
+                for key, payload in zip(batch, self.redis_client.mget(batch)):
+                    if payload is not None:
+                        values[key] = self.deserialize(payload)
+        except Exception as e:
+            print(f"Error getting values: {e}")
+        return values
+
+    def delete_many(self, keys: Iterable[str], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Delete many keys with one UNLINK per `batch_size` keys. Returns the number of keys deleted.
+        """
+        deleted = 0
+        try:
+            for batch in self.iter_batches(keys, batch_size):
+                deleted += self.redis_client.unlink(*batch)
+        except Exception as e:
+            print(f"Error deleting keys: {e}")
+        return deleted
+
+    def delete_by_prefix(self, prefix: str, batch_size: int = BATCH_SIZE) -> int:
+        """
+        Delete every key starting with `prefix`. Keys are found with SCAN, which unlike KEYS
+        does not block the server, and unlinked `batch_size` at a time.
+        """
+        pattern = self.__escape_pattern(prefix) + "*"
+        return self.delete_many(self.redis_client.scan_iter(match=pattern, count=batch_size), batch_size=batch_size)
+
+    @staticmethod
+    def __escape_pattern(prefix: str) -> str:
+        # Glob characters in the prefix must match literally
+        return "".join("\\" + char if char in "*?[]\\" else char for char in prefix)
@@ -1,13 +1,26 @@
-import json
 import sqlite3
+import threading
 from sqlite3 import Error
-from datetime import datetime
+from typing import Iterable, Sequence
 from app.utils.utility_manager import UtilityManager
 from app.enums.env_keys import EnvKeys
 
+# Applied once when a thread opens its connection; WAL lets readers run alongside a writer.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+CACHED_STATEMENTS = 256
+
 class SQLiteDBManager(UtilityManager):
     _instance = None
-    
+    # One persistent connection per (thread, database file); sqlite3 connections are not shared across threads.
+    _thread_local = threading.local()
+
     def __init__(self):
         # super().__init__()
         project_dir = self.get_project_dir()
@@ -15,25 +28,44 @@ class SQLiteDBManager(UtilityManager):
         db_path = self.clean_path(path=db_path)
         self.conn_params = {
             'database': db_path,
+            'cached_statements': CACHED_STATEMENTS,
         }
 
     def _get_connection(self):
+        connections = self._thread_connections()
+        database = self.conn_params['database']
+        conn = connections.get(database)
+        if conn is not None:
+            return conn
         try:
             conn = sqlite3.connect(**self.conn_params)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            connections[database] = conn
             return conn
         except Error as e:
             print(f"Error connecting to SQLite database: {e}")
             return None
 
+    def _thread_connections(self) -> dict:
+        connections = getattr(self._thread_local, 'connections', None)
+        if connections is None:
+            connections = self._thread_local.connections = {}
+        return connections
+
+    def close(self):
+        """Closes the calling thread's connection to this database."""
+        conn = self._thread_connections().pop(self.conn_params['database'], None)
+        if conn is not None:
+            conn.close()
+
     def _execute_query(self, query, params=None, fetch_one=False):
         conn = self._get_connection()
+        if conn is None:
+            return None
         cursor = conn.cursor()
         try:
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-
+            cursor.execute(query, params or ())
             if fetch_one:
                 result = cursor.fetchone()
                 if result:
@@ -42,20 +74,36 @@ class SQLiteDBManager(UtilityManager):
             else:
                 result = cursor.fetchall() if cursor.description else None
                 if result:
+                    # Column names are resolved once per result set and zipped with the fetched tuples
                     column_names = [column[0] for column in cursor.description]
-                    # Convert each row to a dictionary
                     result = [dict(zip(column_names, row)) for row in result]
 
-            conn.commit()
-            if result:
-                # Convert to JSON string here
-                result = json.loads(json.dumps(result))
-            print("---Query-Executed--Successfully----")
+            if conn.in_transaction:
+                conn.commit()
             return result
-        
+
         except Error as e:
             print(f"Error executing query: {e}")
+            if conn.in_transaction:
+                conn.rollback()
             return None
         finally:
             cursor.close()
-            conn.close()
+
+    def _execute_many(self, query: str, params_list: Iterable[Sequence]) -> int:
+        """
+        Runs one statement for every parameter tuple inside a single transaction.
+
+        Returns:
+            int: The number of affected rows, or -1 when the batch was rolled back.
+        """
+        conn = self._get_connection()
+        if conn is None:
+            return -1
+        try:
+            with conn:
+                cursor = conn.executemany(query, params_list)
+            return cursor.rowcount
+        except Error as e:
+            print(f"Error executing batch query: {e}")
+            return -1
@@ -3,8 +3,10 @@ from typing import Dict, List
 from langchain.vectorstores.azuresearch import AzureSearch
 from langchain_openai import AzureOpenAIEmbeddings
 from langchain_core.documents import Document
+from app.embeddings.cached_embeddings import CachedEmbeddings
 from app.enums.env_keys import EnvKeys
 from app.utils.utility_manager import UtilityManager
+from app.utils.http_client_registry import HTTPClientRegistry
 from langchain_community.retrievers import (
     AzureCognitiveSearchRetriever
 )
@@ -21,11 +23,12 @@ class AzureAISearchManager(UtilityManager):
         # self.azure_openai_api_version = self.get_env_variable(EnvKeys.AZURE_OPENAI_API_VERSION.value)
         self.azure_deployment = self.get_env_variable(EnvKeys.AZURE_EMBEDDING_DEPLOYMENT.value)
 
-        self.embeddings = AzureOpenAIEmbeddings(
+        self.embeddings = CachedEmbeddings(AzureOpenAIEmbeddings(
             model=self.azure_deployment,
             azure_endpoint=self.azure_endpoint,
             openai_api_key=self.azure_openai_api_key,
-        )
+            http_client=HTTPClientRegistry.shared().get_client("azure_openai_embeddings"),
+        ))
 
         self.vector_store = AzureSearch(
             embedding_function=self.embeddings.embed_query,
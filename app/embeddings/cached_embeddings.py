@@ -0,0 +1,226 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+from langchain_core.embeddings import Embeddings
+from app.utils.file_system import FileSystem
+
+
+class EmbeddingCache:
+    """
+    Two tier embedding cache keyed by (model, normalized text hash).
+
+    The first tier is an in-process LRU of `max_memory_entries` vectors. The second tier is a
+    SQLite file that is trimmed to `max_disk_bytes` by evicting the least recently used vectors.
+    Vectors are stored as float32, which halves their size and is well within embedding noise.
+    Both tiers hold the float32-rounded vector, so a text gets the same vector from either.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None, max_memory_entries: int = 50000, max_disk_bytes: int = 1024 * 1024 * 1024):
+        file_system = FileSystem()
+        self.path = file_system.clean_path(path=path or f"{file_system.get_project_dir()}/app/vectors/embedding_cache.db")
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.__LOCK = threading.Lock()
+        self.__MEMORY: "OrderedDict[str, List[float]]" = OrderedDict()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.__CONNECTION = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.__CONNECTION.execute("PRAGMA journal_mode=WAL")
+        self.__CONNECTION.execute("PRAGMA synchronous=NORMAL")
+        self.__CONNECTION.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache (key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.__CONNECTION.execute("CREATE INDEX IF NOT EXISTS embedding_cache_last_access ON embedding_cache (last_access)")
+        self.__CONNECTION.commit()
+        self.__DISK_BYTES = self.__CONNECTION.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache").fetchone()[0]
+
+    @classmethod
+    def shared(cls) -> "EmbeddingCache":
+        """Process wide cache used by all vector managers."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        text_hash = hashlib.sha256(EmbeddingCache.normalize(text).encode("utf-8")).hexdigest()
+        return f"{model}:{text_hash}"
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        keys = [self.make_key(model, text) for text in texts]
+        vectors: List[Optional[List[float]]] = [None] * len(keys)
+        disk_lookups: Dict[str, List[int]] = {}
+
+        with self.__LOCK:
+            for index, key in enumerate(keys):
+                vector = self.__MEMORY.get(key)
+                if vector is not None:
+                    self.__MEMORY.move_to_end(key)
+                    self.memory_hits += 1
+                    vectors[index] = vector
+                else:
+                    disk_lookups.setdefault(key, []).append(index)
+
+            if disk_lookups:
+                found = self.__read_disk(list(disk_lookups))
+                for key, indexes in disk_lookups.items():
+                    vector = found.get(key)
+                    if vector is None:
+                        self.misses += len(indexes)
+                        continue
+                    self.disk_hits += len(indexes)
+                    self.__remember(key, vector)
+                    for index in indexes:
+                        vectors[index] = vector
+        return vectors
+
+    def set_many(self, model: str, texts: Sequence[str], vectors: Sequence[List[float]]) -> List[List[float]]:
+        """Caches the vectors of `texts` and returns them as cached, i.e. rounded to float32."""
+        now = time.time()
+        rows = []
+        stored = []
+        with self.__LOCK:
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(model, text)
+                packed = array("f", vector)
+                stored.append(packed.tolist())
+                self.__remember(key, stored[-1])
+                rows.append((key, packed.tobytes(), now))
+            self.__write_disk(rows)
+        return stored
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self.__MEMORY),
+            "disk_bytes": self.__DISK_BYTES,
+        }
+
+    def clear(self):
+        with self.__LOCK:
+            self.__MEMORY.clear()
+            self.__CONNECTION.execute("DELETE FROM embedding_cache")
+            self.__CONNECTION.commit()
+            self.__DISK_BYTES = 0
+
+    def __remember(self, key: str, vector: List[float]):
+        self.__MEMORY[key] = vector
+        self.__MEMORY.move_to_end(key)
+        while len(self.__MEMORY) > self.max_memory_entries:
+            self.__MEMORY.popitem(last=False)
+
+    def __read_disk(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        # Stay below SQLite's default limit of bound variables per statement
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.__CONNECTION.execute(
+                f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for key, blob in rows:
+                vector = array("f")
+                vector.frombytes(blob)
+                found[key] = vector.tolist()
+        if found:
+            now = time.time()
+            self.__CONNECTION.executemany("UPDATE embedding_cache SET last_access = ? WHERE key = ?", [(now, key) for key in found])
+            self.__CONNECTION.commit()
+        return found
+
+    def __write_disk(self, rows: List[tuple]):
+        keys = [row[0] for row in rows]
+        existing = self.__read_sizes(keys)
+        self.__CONNECTION.executemany("INSERT OR REPLACE INTO embedding_cache (key, vector, last_access) VALUES (?, ?, ?)", rows)
+        self.__DISK_BYTES += sum(len(row[1]) for row in rows) - sum(existing.values())
+        if self.__DISK_BYTES > self.max_disk_bytes:
+            self.__evict_disk()
+        self.__CONNECTION.commit()
+
+    def __read_sizes(self, keys: List[str]) -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            sizes.update(self.__CONNECTION.execute(
+                f"SELECT key, LENGTH(vector) FROM embedding_cache WHERE key IN ({placeholders})", batch
+            ).fetchall())
+        return sizes
+
+    def __evict_disk(self):
+        # Drop the least recently used tenth below the limit so eviction does not run on every write
+        target = self.max_disk_bytes * 0.9
+        cursor = self.__CONNECTION.execute("SELECT key, LENGTH(vector) FROM embedding_cache ORDER BY last_access")
+        evicted = []
+        for key, size in cursor:
+            if self.__DISK_BYTES <= target:
+                break
+            evicted.append((key,))
+            self.__DISK_BYTES -= size
+        self.__CONNECTION.executemany("DELETE FROM embedding_cache WHERE key = ?", evicted)
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps any LangChain Embeddings so identical chunks and queries are only embedded once."""
+
+    def __init__(self, embeddings: Embeddings, cache: Optional[EmbeddingCache] = None, model_name: Optional[str] = None):
+        self.embeddings = embeddings
+        self.cache = cache or EmbeddingCache.shared()
+        self.model_name = model_name or self.__resolve_model_name(embeddings)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(self.model_name, texts)
+        # Embed every distinct missing text once, even when it repeats inside the batch
+        missing: Dict[str, List[int]] = {}
+        for index, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(EmbeddingCache.normalize(texts[index]), []).append(index)
+        if missing:
+            missing_texts = [texts[indexes[0]] for indexes in missing.values()]
+            new_vectors = self.cache.set_many(self.model_name, missing_texts, self.embeddings.embed_documents(missing_texts))
+            for indexes, vector in zip(missing.values(), new_vectors):
+                for index in indexes:
+                    vectors[index] = vector
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        # Some models embed queries differently from documents, so they are cached under their own namespace
+        query_model = f"{self.model_name}:query"
+        vector = self.cache.get_many(query_model, [text])[0]
+        if vector is None:
+            vector = self.cache.set_many(query_model, [text], [self.embeddings.embed_query(text)])[0]
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        query_model = f"{self.model_name}:query"
+        vector = self.cache.get_many(query_model, [text])[0]
+        if vector is None:
+            vector = self.cache.set_many(query_model, [text], [await self.embeddings.aembed_query(text)])[0]
+        return vector
+
+    @staticmethod
+    def __resolve_model_name(embeddings: Embeddings) -> str:
+        for attribute in ("model", "model_name", "model_id", "deployment"):
+            value = getattr(embeddings, attribute, None)
+            if isinstance(value, str) and value:
+                return value
+        return type(embeddings).__name__
@@ -0,0 +1,100 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+
+def _open_client(persist_directory: str) -> Any:
+    # chromadb is an optional dependency, only needed when a Chroma store is used
+    import chromadb
+    return chromadb.PersistentClient(path=persist_directory)
+
+
+def _open_store(client: Any, collection_name: str, embedding_function: Embeddings) -> Any:
+    from langchain_community.vectorstores.chroma import Chroma
+    return Chroma(client=client, collection_name=collection_name, embedding_function=embedding_function)
+
+
+class ChromaClientRegistry:
+    """
+    Open Chroma clients and collections shared by the process.
+
+    One client is opened per persist directory and one store per (directory, collection),
+    so searches no longer reopen the SQLite-backed store and re-resolve the collection on
+    every call. A store keeps the embedding function it was first opened with. `close`
+    drops clients and stores, e.g. after a collection was deleted; `refresh` reopens a
+    store, e.g. after another process recreated its collection.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        open_client: Callable[[str], Any] = _open_client,
+        open_store: Callable[[Any, str, Embeddings], Any] = _open_store,
+    ):
+        self.__OPEN_CLIENT = open_client
+        self.__OPEN_STORE = open_store
+        self.__LOCK = threading.Lock()
+        self.__CLIENTS: Dict[str, Any] = {}
+        self.__STORES: Dict[Tuple[str, str], Any] = {}
+        self.__COUNTERS = {"clients_opened": 0, "stores_opened": 0, "store_reuses": 0}
+
+    @classmethod
+    def shared(cls) -> "ChromaClientRegistry":
+        """Process wide registry used by the Chroma vector managers."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+        return cls._instance
+
+    def get_client(self, persist_directory: str) -> Any:
+        path = os.path.abspath(persist_directory)
+        with self.__LOCK:
+            return self.__client(path)
+
+    def get_store(self, persist_directory: str, collection_name: str, embedding_function: Embeddings) -> Any:
+        key = (os.path.abspath(persist_directory), collection_name)
+        with self.__LOCK:
+            store = self.__STORES.get(key)
+            if store is None:
+                store = self.__STORES[key] = self.__OPEN_STORE(self.__client(key[0]), collection_name, embedding_function)
+                self.__COUNTERS["stores_opened"] += 1
+            else:
+                self.__COUNTERS["store_reuses"] += 1
+            return store
+
+    def refresh(self, persist_directory: str, collection_name: str) -> Optional[Any]:
+        """Reopens the store of a collection with its embedding function; None if it was not open."""
+        key = (os.path.abspath(persist_directory), collection_name)
+        with self.__LOCK:
+            store = self.__STORES.pop(key, None)
+        if store is None:
+            return None
+        return self.get_store(persist_directory, collection_name, store.embeddings)
+
+    def close(self, persist_directory: Optional[str] = None, collection_name: Optional[str] = None):
+        """
+        Drops the store of one collection, every store and the client of one directory,
+        or, without arguments, everything.
+        """
+        path = os.path.abspath(persist_directory) if persist_directory else None
+        with self.__LOCK:
+            for key in list(self.__STORES):
+                if (path is None or key[0] == path) and (collection_name is None or key[1] == collection_name):
+                    del self.__STORES[key]
+            if collection_name is None:
+                for client_path in list(self.__CLIENTS):
+                    if path is None or client_path == path:
+                        del self.__CLIENTS[client_path]
+
+    def stats(self) -> Dict[str, int]:
+        with self.__LOCK:
+            return dict(self.__COUNTERS, open_clients=len(self.__CLIENTS), open_stores=len(self.__STORES))
+
+    def __client(self, path: str) -> Any:
+        client = self.__CLIENTS.get(path)
+        if client is None:
+            client = self.__CLIENTS[path] = self.__OPEN_CLIENT(path)
+            self.__COUNTERS["clients_opened"] += 1
+        return client
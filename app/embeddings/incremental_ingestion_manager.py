@@ -0,0 +1,93 @@
+import glob
+import logging
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+from app.databases.ingestion_manifest_manager import IngestionManifestManager
+from app.utils.utility_manager import UtilityManager
+
+class IncrementalIngestionManager(UtilityManager):
+    def __init__(self):
+        super().__init__()
+        self.__MANIFEST = IngestionManifestManager()
+
+    def sync_directory(
+        self,
+        vector_store: VectorStore,
+        collection_name: str,
+        directory: str,
+        load_chunks: Callable[[str], Iterable[Document]],
+        pattern: str = "*",
+        batch_size: int = 256,
+        on_sources_changed: Optional[Callable[[List[str]], Any]] = None,
+    ) -> Dict[str, int]:
+        """
+        Brings a collection in line with the files of a directory using the SHA-256 checksum manifest.
+
+        Args:
+            vector_store (VectorStore): Store holding the collection, must support `add_documents(ids=...)` and `delete(ids=...)`.
+            collection_name (str): Manifest scope of the collection.
+            directory (str): Directory to ingest.
+            load_chunks (Callable[[str], Iterable[Document]]): Returns the chunks to embed for a file path.
+            pattern (str): Glob pattern of the files to ingest. Defaults to "*".
+            batch_size (int): Number of chunks per `add_documents` call. Defaults to 256.
+            on_sources_changed (Optional[Callable[[List[str]], Any]]): Called with the updated and deleted sources,
+                e.g. `invalidate_cached_sources` of the semantic response cache. Defaults to None.
+
+        Returns:
+            Dict[str, int]: Number of added, updated, unchanged and deleted files.
+        """
+        directory = self.clean_path(path=directory)
+        manifest = self.__MANIFEST.get_manifest(collection_name=collection_name)
+        summary = {"added": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+        changed_sources: List[str] = []
+
+        file_paths = sorted(self.clean_path(path=path) for path in glob.glob(os.path.join(directory, pattern)) if os.path.isfile(path))
+        for file_path in file_paths:
+            checksum = self.create_new_checksum(file_path=file_path)
+            entry = manifest.get(file_path)
+            if entry and entry["checksum"] == checksum:
+                summary["unchanged"] += 1
+                continue
+
+            # New vectors go in before the old ones are removed, so the file never disappears from search
+            chunk_ids = self.__add_chunks(vector_store=vector_store, chunks=load_chunks(file_path), batch_size=batch_size)
+            if entry:
+                self.__delete_chunks(vector_store=vector_store, chunk_ids=entry["chunk_ids"])
+                summary["updated"] += 1
+                changed_sources.append(file_path)
+            else:
+                summary["added"] += 1
+            self.__MANIFEST.save_entry(collection_name=collection_name, source=file_path, checksum=checksum, chunk_ids=chunk_ids)
+
+        # Purge files of this directory that were ingested before and no longer exist
+        current_files = set(file_paths)
+        for source, entry in manifest.items():
+            if os.path.dirname(source) == directory and source not in current_files:
+                self.__delete_chunks(vector_store=vector_store, chunk_ids=entry["chunk_ids"])
+                self.__MANIFEST.delete_entry(collection_name=collection_name, source=source)
+                summary["deleted"] += 1
+                changed_sources.append(source)
+
+        if changed_sources and on_sources_changed:
+            on_sources_changed(changed_sources)
+
+        logging.info(f"Incremental ingestion of {directory} into {collection_name}: {summary}")
+        return summary
+
+    def forget_collection(self, collection_name: str):
+        """Drops the manifest of a collection, e.g. after the collection itself was deleted."""
+        self.__MANIFEST.delete_collection(collection_name=collection_name)
+
+    def __add_chunks(self, vector_store: VectorStore, chunks: Iterable[Document], batch_size: int) -> List[str]:
+        chunk_ids: List[str] = []
+        for batch in self.iter_batches(chunks, batch_size):
+            ids = [self.generate_uuid() for _ in batch]
+            vector_store.add_documents(documents=batch, ids=ids)
+            chunk_ids.extend(ids)
+        return chunk_ids
+
+    def __delete_chunks(self, vector_store: VectorStore, chunk_ids: List[str]):
+        if chunk_ids:
+            vector_store.delete(ids=chunk_ids)
@@ -0,0 +1,251 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from app.enums.embedding_backend import EmbeddingBackend
+from app.enums.env_keys import EnvKeys
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# Engine of a process pool worker, created once by its initializer
+_WORKER_ENGINE: Optional["LocalEmbeddingEngine"] = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = LocalEmbeddingEngine(**config)
+
+
+def _encode_in_worker(texts: List[str]) -> np.ndarray:
+    return _WORKER_ENGINE.encode(texts)
+
+
+class OnnxEmbeddingRunner:
+    """Runs an exported transformer with ONNX Runtime; `quantize` converts its weights to int8 once and keeps the file."""
+
+    def __init__(self, model_file: str, intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None, quantize: bool = False):
+        # onnxruntime is an optional dependency, only needed for this backend
+        import onnxruntime
+        if quantize:
+            model_file = self.quantized(model_file)
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            # Inter-op threads only run independent graph nodes in parallel mode
+            options.inter_op_num_threads = inter_op_threads
+            options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+        self.session = onnxruntime.InferenceSession(model_file, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    @staticmethod
+    def quantized(model_file: str) -> str:
+        target = os.path.splitext(model_file)[0] + "_int8.onnx"
+        if not os.path.exists(target):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            quantize_dynamic(model_file, target, weight_type=QuantType.QInt8)
+        return target
+
+    def __call__(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        return self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+
+
+class TorchEmbeddingRunner:
+    """Runs the transformer with PyTorch; `quantize` applies dynamic int8 quantization to its linear layers."""
+
+    def __init__(self, model_name_or_path: str, intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None, quantize: bool = False):
+        import torch
+        from transformers import AutoModel
+        self.torch = torch
+        if intra_op_threads:
+            torch.set_num_threads(intra_op_threads)
+        if inter_op_threads:
+            try:
+                torch.set_num_interop_threads(inter_op_threads)
+            except RuntimeError:
+                # Can only be set before the first parallel work of the process
+                pass
+        model = AutoModel.from_pretrained(model_name_or_path).eval()
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+
+    def __call__(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        with self.torch.inference_mode():
+            output = self.model(**{name: self.torch.from_numpy(value) for name, value in inputs.items()})
+        return output.last_hidden_state.numpy()
+
+
+class LocalEmbeddingEngine(Embeddings):
+    """
+    Sentence embeddings of a local transformer (mean pooling, L2 normalized), as
+    sentence-transformers computes them for models such as all-MiniLM-L6-v2.
+
+    Texts are tokenized once, sorted by length and packed into batches whose padded size
+    stays within `max_batch_tokens`, so short texts share large batches and little time is
+    spent on padding. The model runs on PyTorch or ONNX Runtime, optionally int8 quantized,
+    with the given intra/inter-op threads. With `processes` > 1 the batches are spread over
+    a pool of worker processes that each load the model, e.g. one per socket.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        model_path: Optional[str] = None,
+        backend: str = EmbeddingBackend.TORCH.value,
+        quantize: bool = False,
+        max_batch_tokens: int = 2048,
+        max_batch_size: int = 256,
+        max_seq_length: int = 256,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        processes: int = 0,
+    ):
+        self.base_model_name = model_name
+        self.model_path = model_path
+        self.backend = EmbeddingBackend(backend)
+        self.quantize = quantize
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_seq_length = max_seq_length
+        self.processes = processes
+        if processes > 1 and not intra_op_threads:
+            intra_op_threads = max(1, (os.cpu_count() or 1) // processes)
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        # int8 vectors differ slightly from the fp32 ones, so they get their own embedding cache namespace
+        self.model_name = f"{model_name}:int8" if quantize else model_name
+        self.tokenizer = None
+        self.runner = None
+        self.__LOCK = threading.Lock()
+        self.__POOL: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls, model_name: str = DEFAULT_MODEL) -> "LocalEmbeddingEngine":
+        """Engine configured from the optional LOCAL_EMBEDDING_* environment variables."""
+        intra_op_threads = os.getenv(EnvKeys.LOCAL_EMBEDDING_INTRA_OP_THREADS.value)
+        inter_op_threads = os.getenv(EnvKeys.LOCAL_EMBEDDING_INTER_OP_THREADS.value)
+        return cls(
+            model_name=model_name,
+            backend=os.getenv(EnvKeys.LOCAL_EMBEDDING_BACKEND.value) or EmbeddingBackend.TORCH.value,
+            quantize=os.getenv(EnvKeys.LOCAL_EMBEDDING_QUANTIZE.value, "false").lower() in ("true", "1", "yes"),
+            max_batch_tokens=int(os.getenv(EnvKeys.LOCAL_EMBEDDING_MAX_BATCH_TOKENS.value) or 2048),
+            intra_op_threads=int(intra_op_threads) if intra_op_threads else None,
+            inter_op_threads=int(inter_op_threads) if inter_op_threads else None,
+            processes=int(os.getenv(EnvKeys.LOCAL_EMBEDDING_PROCESSES.value) or 0),
+        )
+
+    def load(self):
+        """Loads the tokenizer and, unless the worker processes run it, the model."""
+        with self.__LOCK:
+            if self.tokenizer is None:
+                from tokenizers import Tokenizer
+                tokenizer = Tokenizer.from_file(self.__model_file("tokenizer.json"))
+                tokenizer.enable_truncation(max_length=self.max_seq_length)
+                tokenizer.no_padding()
+                self.tokenizer = tokenizer
+            if self.runner is None and self.processes <= 1:
+                self.runner = self.__create_runner()
+
+    def plan_batches(self, lengths: List[int]) -> List[List[int]]:
+        """Indexes of the texts of every batch, longest texts first."""
+        order = sorted(range(len(lengths)), key=lengths.__getitem__, reverse=True)
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        for index in order:
+            # The first text of a batch is its longest, so it sets the padded width
+            width = max(lengths[batch[0]] if batch else lengths[index], 1)
+            if batch and (len(batch) == self.max_batch_size or (len(batch) + 1) * width > self.max_batch_tokens):
+                batches.append(batch)
+                batch = []
+            batch.append(index)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self.load()
+        encodings = self.tokenizer.encode_batch(texts)
+        batches = self.plan_batches([len(encoding.ids) for encoding in encodings])
+        if self.processes > 1:
+            results = self.__pool().map(_encode_in_worker, [[texts[index] for index in batch] for batch in batches])
+        else:
+            results = (self.__run([encodings[index] for index in batch]) for batch in batches)
+
+        vectors: Optional[np.ndarray] = None
+        for batch, batch_vectors in zip(batches, results):
+            if vectors is None:
+                vectors = np.empty((len(texts), batch_vectors.shape[1]), dtype=np.float32)
+            vectors[batch] = batch_vectors
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+    def close(self):
+        with self.__LOCK:
+            if self.__POOL is not None:
+                self.__POOL.shutdown()
+                self.__POOL = None
+
+    def __run(self, encodings: List[Any]) -> np.ndarray:
+        width = max(len(encoding.ids) for encoding in encodings)
+        input_ids = np.zeros((len(encodings), width), dtype=np.int64)
+        token_type_ids = np.zeros_like(input_ids)
+        attention_mask = np.zeros_like(input_ids)
+        for row, encoding in enumerate(encodings):
+            length = len(encoding.ids)
+            input_ids[row, :length] = encoding.ids
+            token_type_ids[row, :length] = encoding.type_ids
+            attention_mask[row, :length] = 1
+
+        hidden = self.runner({"input_ids": input_ids, "attention_mask": attention_mask, "token_type_ids": token_type_ids})
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def __create_runner(self):
+        if self.backend == EmbeddingBackend.ONNX:
+            model_file = self.__model_file("onnx/model.onnx")
+            return OnnxEmbeddingRunner(model_file, self.intra_op_threads, self.inter_op_threads, self.quantize)
+        return TorchEmbeddingRunner(self.model_path or self.base_model_name, self.intra_op_threads, self.inter_op_threads, self.quantize)
+
+    def __model_file(self, filename: str) -> str:
+        if self.model_path:
+            # A local export may keep model.onnx next to tokenizer.json
+            path = os.path.join(self.model_path, filename)
+            return path if os.path.exists(path) else os.path.join(self.model_path, os.path.basename(filename))
+        from huggingface_hub import hf_hub_download
+        return hf_hub_download(self.base_model_name, filename)
+
+    def __pool(self) -> ProcessPoolExecutor:
+        with self.__LOCK:
+            if self.__POOL is None:
+                config = dict(
+                    model_name=self.base_model_name,
+                    model_path=self.model_path,
+                    backend=self.backend.value,
+                    quantize=self.quantize,
+                    max_batch_tokens=self.max_batch_tokens,
+                    max_batch_size=self.max_batch_size,
+                    max_seq_length=self.max_seq_length,
+                    intra_op_threads=self.intra_op_threads,
+                    inter_op_threads=self.inter_op_threads,
+                )
+                # Spawned, as forking a process with live runtime thread pools can deadlock
+                self.__POOL = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(config,),
+                )
+            return self.__POOL
@@ -0,0 +1,114 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+_STOP = object()
+
+
+class MicroBatchingEmbeddings(Embeddings):
+    """
+    Coalesces concurrent query embeddings into one forward pass of the wrapped model.
+
+    A background thread takes the first waiting query, collects whatever else arrives
+    within `max_wait_ms` (up to `max_batch_size` queries), embeds the distinct texts with
+    a single `embed_documents` call and resolves every caller's future. While queries come
+    one at a time, they are embedded right away without waiting for the window. Meant for models
+    that embed queries and documents alike, such as all-MiniLM-L6-v2. Document batches
+    are passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = 32, max_wait_ms: float = 3.0):
+        self.embeddings = embeddings
+        self.model_name = getattr(embeddings, "model_name", None) or type(embeddings).__name__
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.queries = 0
+        self.max_batch = 0
+        self.__QUEUE: "queue.Queue[object]" = queue.Queue()
+        self.__LOCK = threading.Lock()
+        self.__WORKER: Optional[threading.Thread] = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.submit(text).result()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.wrap_future(self.submit(text))
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        with self.__LOCK:
+            if self.__WORKER is None:
+                self.__WORKER = threading.Thread(target=self.__run, name="query-embedding-batcher", daemon=True)
+                self.__WORKER.start()
+        self.__QUEUE.put((text, future))
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        with self.__LOCK:
+            return {
+                "queries": self.queries,
+                "batches": self.batches,
+                "mean_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+                "max_batch_size": self.max_batch,
+            }
+
+    def close(self):
+        with self.__LOCK:
+            worker, self.__WORKER = self.__WORKER, None
+        if worker is not None:
+            self.__QUEUE.put(_STOP)
+            worker.join()
+
+    def __run(self):
+        last_batch_size = 1
+        while True:
+            item = self.__QUEUE.get()
+            if item is _STOP:
+                return
+            batch: List[Tuple[str, Future]] = [item]
+            stop = False
+            # A lone caller is not kept waiting; the window only opens once queries arrive concurrently
+            concurrent = last_batch_size > 1 or not self.__QUEUE.empty()
+            deadline = time.monotonic() + (self.max_wait_ms / 1000 if concurrent else 0)
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self.__QUEUE.get(timeout=timeout) if timeout > 0 else self.__QUEUE.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self.__embed(batch)
+            last_batch_size = len(batch)
+            if stop:
+                return
+
+    def __embed(self, batch: List[Tuple[str, Future]]):
+        # Callers that gave up (e.g. a cancelled request) are dropped
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        # Identical queries in one window are embedded once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = dict(zip(texts, self.embeddings.embed_documents(texts)))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        with self.__LOCK:
+            self.batches += 1
+            self.queries += len(batch)
+            self.max_batch = max(self.max_batch, len(batch))
+        for text, future in batch:
+            future.set_result(vectors[text])
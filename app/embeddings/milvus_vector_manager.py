@@ -1,12 +1,23 @@
+import heapq
 import logging
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
-import spacy
 from pymilvus import connections, Collection, CollectionSchema, FieldSchema, DataType, utility
 import openai
+from app.embeddings.cached_embeddings import EmbeddingCache
+from app.utils.http_client_registry import HTTPClientRegistry
+from app.utils.keyword_extractor import get_keyword_extractor
 
-# Load spaCy model for keyword extraction
-nlp = spacy.load("en_core_web_sm")
+HTTP_CLIENT_NAME = "openai_embeddings"
+
+# Transient embedding API errors that are retried with exponential backoff
+RETRYABLE_EMBEDDING_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
 
 class MilvusManager:
     _instance = None
@@ -26,7 +37,16 @@ class MilvusManager:
         if not openai_api_key:
             raise ValueError("OpenAI API key is not provided and is missing from the environment variables.")
 
-        openai.api_key = openai_api_key
+        # Retries are handled by _request_embeddings, so the SDK's own retries are disabled
+        self._openai_client = openai.OpenAI(
+            api_key=openai_api_key,
+            http_client=HTTPClientRegistry.shared().get_client(HTTP_CLIENT_NAME),
+            max_retries=0,
+        )
+
+        # Collections already loaded into Milvus memory, so searches skip the load round-trip
+        self._loaded_collections: Dict[str, Collection] = {}
+        self._collections_lock = threading.Lock()
 
         # Connect to Milvus
         try:
@@ -36,6 +56,17 @@ class MilvusManager:
             logging.error(f"Failed to connect to Milvus at {host}:{port} - {e}")
             raise
 
+    def get_loaded_collection(self, collection_name: str) -> Collection:
+        """Returns the collection, loading it into Milvus memory only the first time it is searched."""
+        collection = self._loaded_collections.get(collection_name)
+        if collection is None:
+            # Loaded outside the lock so first searches of different collections load in parallel
+            collection = Collection(collection_name)
+            collection.load()
+            with self._collections_lock:
+                self._loaded_collections[collection_name] = collection
+        return collection
+
     def create_index(self, collection_name: str, field_name: str = "embedding", index_type: str = "IVF_FLAT", metric_type: str = "L2", nlist: int = 100, **kwargs):
         """Creates an index for the collection on the embedding field if it doesn't already exist."""
         collection = Collection(collection_name)
@@ -72,117 +103,172 @@ class MilvusManager:
         schema = CollectionSchema(fields, description=f"Collection for {collection_name}")
         Collection(name=collection_name, schema=schema)
 
-    def create_embedding(self, text: str, model: str = "text-embedding-ada-002", **kwargs) -> List[float]:
-        """Generates an embedding for the given text."""
-        response = openai.embeddings.create(input=text, model=model)
-        return response.data[0].embedding
+    def create_embedding(self, text: str, model: str = "text-embedding-ada-002", max_retries: int = 5, **kwargs) -> List[float]:
+        """Generates an embedding for the given text, served from the shared embedding cache when possible."""
+        return self.create_embeddings([text], model=model, max_retries=max_retries)[0]
+
+    def create_embeddings(self, texts: List[str], model: str = "text-embedding-ada-002", batch_size: int = 64, max_concurrency: int = 4, max_retries: int = 5) -> List[List[float]]:
+        """Generates embeddings for many texts with one request per `batch_size` texts and at most `max_concurrency` requests in flight."""
+        cache = EmbeddingCache.shared()
+        embeddings = cache.get_many(model, texts)
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None]
+        if not missing:
+            return embeddings
+
+        batches = [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+
+        def embed_batch(indexes: List[int]) -> List[List[float]]:
+            return self._request_embeddings([texts[index] for index in indexes], model=model, max_retries=max_retries)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as executor:
+            for indexes, batch_embeddings in zip(batches, executor.map(embed_batch, batches)):
+                batch_embeddings = cache.set_many(model, [texts[index] for index in indexes], batch_embeddings)
+                for index, embedding in zip(indexes, batch_embeddings):
+                    embeddings[index] = embedding
+        return embeddings
+
+    def _request_embeddings(self, texts: List[str], model: str, max_retries: int) -> List[List[float]]:
+        """Embeds one batch in a single request, retrying rate limits and transient errors with exponential backoff."""
+        for attempt in range(max_retries + 1):
+            try:
+                response = self._openai_client.embeddings.create(input=texts, model=model)
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            except RETRYABLE_EMBEDDING_ERRORS as e:
+                if attempt == max_retries:
+                    raise
+                # Full jitter keeps concurrent workers from retrying in lockstep
+                delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+                logging.warning(f"Embedding request failed ({e}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+                time.sleep(delay)
 
     def extract_keywords(self, text: str) -> List[str]:
-        """Extracts keywords from the text using SpaCy."""
-        doc = nlp(text)
-        keywords = [token.text for token in doc if token.pos_ in ['NOUN', 'PROPN', 'ADJ']]
-        return keywords[:10]  # Limit to top 10 keywords
-
-    def insert_document(self, collection_name: str, texts: List[str], file_names: Optional[List[str]] = None, keywords: Optional[List[List[str]]] = None, **kwargs):
-        """Inserts multiple documents with embeddings into a specific collection."""
+        """Extracts the top 10 keywords from the text using SpaCy."""
+        return get_keyword_extractor().extract_one(text)
+
+    def extract_keywords_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extracts the top 10 keywords of every text in one batched spaCy pass, ranked across the texts (TF-IDF by default)."""
+        return get_keyword_extractor().extract(texts)
+
+    def insert_document(
+        self,
+        collection_name: str,
+        texts: List[str],
+        file_names: Optional[List[str]] = None,
+        keywords: Optional[List[List[str]]] = None,
+        model: str = "text-embedding-ada-002",
+        embedding_batch_size: int = 64,
+        max_concurrency: int = 4,
+        insert_batch_size: int = 1000,
+        max_retries: int = 5,
+        **kwargs,
+    ):
+        """Inserts multiple documents with embeddings into a specific collection, `insert_batch_size` documents per insert."""
         self.create_collection(collection_name, **kwargs)
         collection = Collection(collection_name)
 
-        # Generate embeddings for all texts
-        embeddings = [self.create_embedding(text, **kwargs) for text in texts]
-        
         # Handle file names
         file_names = file_names or [""] * len(texts)
-        
-        # Handle keywords - if not provided, extract them from texts
-        if keywords is None:
-            keywords = [self.extract_keywords(text) for text in texts]
 
-        # Convert keywords list of lists into strings
-        keyword_strings = [', '.join(keyword_list) for keyword_list in keywords]
-
-        # Verify all lists have the same length
-        if not all(len(lst) == len(texts) for lst in [embeddings, file_names, keyword_strings]):
+        # Verify all lists have the same length before anything is inserted
+        if not all(len(lst) == len(texts) for lst in [file_names, keywords if keywords is not None else texts]):
             raise ValueError("Field data sizes do not align. Please ensure all fields have the same number of elements.")
 
-        # Prepare data to insert
-        insert_data = [
-            embeddings,      # List of embeddings
-            file_names,      # List of file names
-            keyword_strings, # List of keywords as strings
-            texts           # List of text content (full text)
-        ]
-        
-        collection.insert(insert_data)
+        for start in range(0, len(texts), insert_batch_size):
+            end = start + insert_batch_size
+            batch_texts = texts[start:end]
+
+            # Generate embeddings for the texts of this insert
+            embeddings = self.create_embeddings(
+                batch_texts,
+                model=model,
+                batch_size=embedding_batch_size,
+                max_concurrency=max_concurrency,
+                max_retries=max_retries,
+            )
+
+            # Handle keywords - if not provided, extract them from texts
+            batch_keywords = keywords[start:end] if keywords is not None else self.extract_keywords_batch(batch_texts)
+
+            # Convert keywords list of lists into strings
+            keyword_strings = [', '.join(keyword_list) for keyword_list in batch_keywords]
+
+            # Prepare data to insert
+            insert_data = [
+                embeddings,              # List of embeddings
+                file_names[start:end],   # List of file names
+                keyword_strings,         # List of keywords as strings
+                batch_texts              # List of text content (full text)
+            ]
+
+            collection.insert(insert_data)
 
         # Create index after inserting the documents
         self.create_index(collection_name, **kwargs)
 
-    def search_similar(self, query: str, top_k: int = 5, collection_name: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict]:
-        """Searches for similar documents in a specific collection with optional filters."""
-        query_embedding = self.create_embedding(query, **kwargs)
+    def search_similar(self, query: str, top_k: int = 5, collection_name: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, max_concurrency: int = 8, model: str = "text-embedding-ada-002", **kwargs) -> List[Dict]:
+        """Searches for similar documents in a specific collection, or all collections in parallel, with optional filters."""
+        query_embedding = self.create_embedding(query, model=model)
         search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
 
         collections_to_search = [collection_name] if collection_name else utility.list_collections()
-        results = []
-
-        for col_name in collections_to_search:
-            collection = Collection(col_name)
-            collection.load()
-
-            # Build the expression string properly
-            expr = None
-            if filters:
-                expr_parts = []
-                if "file" in filters and isinstance(filters["file"], list):
-                    # Handle file name filter
-                    file_conditions = [f'file_name == "{fname}"' for fname in filters["file"]]
-                    if file_conditions:
-                        expr_parts.append(f"({' or '.join(file_conditions)})")
-                
-                if "keywords" in filters and isinstance(filters["keywords"], list):
-                    # Handle keywords filter using LIKE operator for partial matches
-                    keyword_conditions = [f'keywords like "%{kw}%"' for kw in filters["keywords"]]
-                    if keyword_conditions:
-                        expr_parts.append(f"({' or '.join(keyword_conditions)})")
-                
-                # Combine all conditions with AND
-                if expr_parts:
-                    expr = " and ".join(expr_parts)
-
-            try:
-                search_result = collection.search(
-                    data=[query_embedding],
-                    anns_field="embedding",
-                    param=search_params,
-                    limit=top_k,
-                    expr=expr
-                )
-
-                # Fetch text content and other metadata
-                if search_result[0]:
-                    ids = [str(result.id) for result in search_result[0]]
-                    id_expr = f"id in [{','.join(ids)}]"
-                    query_results = collection.query(
-                        expr=id_expr,
-                        output_fields=["file_name", "keywords", "text_content"]
-                    )
-
-                    for result, doc in zip(search_result[0], query_results):
-                        results.append({
-                            "collection": col_name,
-                            "id": result.id,
-                            "distance": result.distance,
-                            "file_name": doc.get("file_name", ""),
-                            "keywords": doc.get("keywords", ""),
-                            "text_content": doc.get("text_content", "")
-                        })
-
-            except Exception as e:
-                logging.error(f"Error searching collection {col_name}: {str(e)}")
-                continue
-
-        return sorted(results, key=lambda x: x["distance"])    
+        if not collections_to_search:
+            return []
+
+        # Build the expression string properly
+        expr = None
+        if filters:
+            expr_parts = []
+            if "file" in filters and isinstance(filters["file"], list):
+                # Handle file name filter
+                file_conditions = [f'file_name == "{fname}"' for fname in filters["file"]]
+                if file_conditions:
+                    expr_parts.append(f"({' or '.join(file_conditions)})")
+            
+            if "keywords" in filters and isinstance(filters["keywords"], list):
+                # Handle keywords filter using LIKE operator for partial matches
+                keyword_conditions = [f'keywords like "%{kw}%"' for kw in filters["keywords"]]
+                if keyword_conditions:
+                    expr_parts.append(f"({' or '.join(keyword_conditions)})")
+            
+            # Combine all conditions with AND
+            if expr_parts:
+                expr = " and ".join(expr_parts)
+
+        def search_collection(col_name: str) -> List[Dict]:
+            return self._search_collection(col_name, query_embedding, top_k, search_params, expr)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(collections_to_search)))) as executor:
+            per_collection_results = list(executor.map(search_collection, collections_to_search))
+
+        # Every collection is already sorted, keep only the global top_k with a bounded heap
+        return heapq.nsmallest(top_k, (result for results in per_collection_results for result in results), key=lambda x: x["distance"])
+
+    def _search_collection(self, col_name: str, query_embedding: List[float], top_k: int, search_params: Dict[str, Any], expr: Optional[str]) -> List[Dict]:
+        try:
+            collection = self.get_loaded_collection(col_name)
+            # Text content and metadata come back with the hits, no follow-up query needed
+            search_result = collection.search(
+                data=[query_embedding],
+                anns_field="embedding",
+                param=search_params,
+                limit=top_k,
+                expr=expr,
+                output_fields=["file_name", "keywords", "text_content"]
+            )
+            return [
+                {
+                    "collection": col_name,
+                    "id": hit.id,
+                    "distance": hit.distance,
+                    "file_name": hit.entity.get("file_name", ""),
+                    "keywords": hit.entity.get("keywords", ""),
+                    "text_content": hit.entity.get("text_content", "")
+                }
+                for hit in search_result[0]
+            ]
+        except Exception as e:
+            logging.error(f"Error searching collection {col_name}: {str(e)}")
+            return []
 
     def delete_document(self, collection_name: str, doc_id: int, **kwargs):
         """Deletes a document by ID in a specific collection."""
@@ -190,9 +276,9 @@ class MilvusManager:
             collection = Collection(collection_name)
             collection.delete(f"id in [{doc_id}]")
 
-    def update_document(self, collection_name: str, doc_id: int, new_text: str, new_file_name: Optional[str] = None, new_keywords: Optional[List[str]] = None, **kwargs):
+    def update_document(self, collection_name: str, doc_id: int, new_text: str, new_file_name: Optional[str] = None, new_keywords: Optional[List[str]] = None, model: str = "text-embedding-ada-002", **kwargs):
         """Updates a document embedding in a specific collection."""
-        new_embedding = self.create_embedding(new_text, **kwargs)
+        new_embedding = self.create_embedding(new_text, model=model)
         collection = Collection(collection_name)
         
         update_data = {"embedding": new_embedding, "text_content": new_text}
@@ -209,6 +295,8 @@ class MilvusManager:
 
     def drop_collection(self, collection_name: str, **kwargs):
         """Drops a specific collection."""
+        with self._collections_lock:
+            self._loaded_collections.pop(collection_name, None)
         if utility.has_collection(collection_name):
             utility.drop_collection(collection_name)
 
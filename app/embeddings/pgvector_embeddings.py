@@ -1,7 +1,9 @@
-from typing import List
+from typing import Iterable, List
 from app.databases.postgres_database_manager import PostgreSQLManager
+from app.embeddings.cached_embeddings import CachedEmbeddings
 from app.enums.env_keys import EnvKeys
 from app.utils.utility_manager import UtilityManager
+from app.utils.http_client_registry import HTTPClientRegistry
 from langchain_core.documents import Document
 from langchain.vectorstores.pgvector import PGVector
 from langchain.embeddings.azure_openai import AzureOpenAIEmbeddings
@@ -23,13 +25,14 @@ class PGVectorEmbeddings(UtilityManager):
         
         self.__CONNECTION_STRING = f"postgresql://{self.__PG_USERNAME}:{self.__PG_PASSWORD}@{self.__PG_HOST}:{self.__PG_PORT}/{self.__PG_DATABASE}"
         
-        self.__EMBEDDINGS = AzureOpenAIEmbeddings(
+        self.__EMBEDDINGS = CachedEmbeddings(AzureOpenAIEmbeddings(
             openai_api_key=self.__KEY,
             azure_deployment=self.__DEPLOYMENT,
             azure_endpoint=self.__URL,
             api_version=self.__VERSION,
             model=self.__MODEL,
-        )
+            http_client=HTTPClientRegistry.shared().get_client("azure_openai_embeddings"),
+        ))
         self.__POSTGRES_DB = PostgreSQLManager()
         
     def get_pgvector(self, collection_name:str = 'vectorstore') -> PGVector:
@@ -40,14 +43,13 @@ class PGVectorEmbeddings(UtilityManager):
         )
         return vectorstore
     
-    def create_vector_embeddings(self, docs: List[Document], collection_name:str = 'vectorstore') -> dict:
-            result = self.get_pgvector().from_documents(
-                embedding=self.__EMBEDDINGS,
-                documents=docs,
-                collection_name=collection_name,
-                connection_string=self.__CONNECTION_STRING,
-            )
-            if result:
+    def create_vector_embeddings(self, docs: Iterable[Document], collection_name:str = 'vectorstore', batch_size: int = 256) -> dict:
+            """Embeds `docs` in batches of `batch_size`, so a generator is never materialized as a whole."""
+            vectorstore = self.get_pgvector(collection_name=collection_name)
+            added = 0
+            for batch in self.iter_batches(docs, batch_size):
+                added += len(vectorstore.add_documents(documents=batch))
+            if added:
                 return {"message": f"Embedding created successfully for: {collection_name}"}
             else:
                 return {"error": "something went wrong!"}
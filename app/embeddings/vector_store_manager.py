@@ -5,6 +5,10 @@ from app.utils.utility_manager import UtilityManager
 from langchain_community.embeddings import OpenAIEmbeddings
 from langchain.document_loaders.text import TextLoader
 from app.constants.log_messages import LogMessages
+from app.embeddings.cached_embeddings import CachedEmbeddings
+from app.embeddings.incremental_ingestion_manager import IncrementalIngestionManager
+from app.langchain.semantic_response_cache import invalidate_cached_sources
+from app.utils.http_client_registry import HTTPClientRegistry
 import glob
 
 class ChromaVectorStoreManager(UtilityManager):
@@ -15,25 +19,41 @@ class ChromaVectorStoreManager(UtilityManager):
         self.vector_path = self.clean_path(path=f'{self.project_dir}/app/vectors')
         os.makedirs(self.vector_path, exist_ok=True)
         # Using OpenAI embeddings
-        self.embedding = OpenAIEmbeddings(openai_api_key=self.get_env_variable(EnvKeys.APP_OPENAI_KEY.value), chunk_size=chunk_size)
+        self.embedding = CachedEmbeddings(OpenAIEmbeddings(openai_api_key=self.get_env_variable(EnvKeys.APP_OPENAI_KEY.value), chunk_size=chunk_size, http_client=HTTPClientRegistry.shared().get_client("openai_embeddings")))
         self.vectordb = Chroma(persist_directory=self.vector_path, 
                                embedding_function=self.embedding)
     
-    def create_vector_store(self, document_path: str, collection_name:str='langchain',chunk_size: int = 2000, chunk_overlap: int = 200):
-        """Create a vector store from all .txt files in a directory."""
+    def create_vector_store(self, document_path: str, collection_name:str='langchain',chunk_size: int = 2000, chunk_overlap: int = 200, batch_size: int = 256, incremental: bool = False):
+        """
+        Create a vector store from all .txt files in a directory, embedding `batch_size` documents at a time.
+        With `incremental`, files whose checksum did not change since the last run are skipped,
+        changed files have their vectors replaced and deleted files are purged.
+        """
         try:
-            txt_files = glob.glob(os.path.join(document_path, "*.txt"))
-            all_documents = []
-            for txt_file in txt_files:
-                loader = TextLoader(file_path=self.clean_path(txt_file))
-                documents = loader.load()
-                all_documents.extend(documents)
-            
-            chroma_db = self.vectordb.from_documents(documents=all_documents, 
-                                                     embedding=self.embedding,
-                                                     collection_name=collection_name,
-                                                     persist_directory=self.vector_path,
-                                                     )
+            chroma_db = Chroma(collection_name=collection_name,
+                               embedding_function=self.embedding,
+                               persist_directory=self.vector_path,
+                               )
+            if incremental:
+                IncrementalIngestionManager().sync_directory(
+                    vector_store=chroma_db,
+                    collection_name=collection_name,
+                    directory=document_path,
+                    load_chunks=lambda txt_file: TextLoader(file_path=txt_file).lazy_load(),
+                    pattern="*.txt",
+                    batch_size=batch_size,
+                    on_sources_changed=invalidate_cached_sources,
+                )
+            else:
+                txt_files = glob.glob(os.path.join(document_path, "*.txt"))
+                documents = (
+                    document
+                    for txt_file in txt_files
+                    for document in TextLoader(file_path=self.clean_path(txt_file)).lazy_load()
+                )
+                for batch in self.iter_batches(documents, batch_size):
+                    chroma_db.add_documents(documents=batch)
+                    invalidate_cached_sources({document.metadata.get('source') for document in batch})
             chroma_db.persist()
             print(LogMessages.VECTOR_CREATED)
         
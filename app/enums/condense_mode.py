@@ -0,0 +1,5 @@
+from enum import Enum
+
+class CondenseMode(Enum):
+    ALWAYS = 'always'
+    HEURISTIC = 'heuristic'
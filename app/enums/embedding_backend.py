@@ -0,0 +1,5 @@
+from enum import Enum
+
+class EmbeddingBackend(Enum):
+    TORCH = 'torch'
+    ONNX = 'onnx'
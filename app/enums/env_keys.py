@@ -9,6 +9,17 @@ class EnvKeys(Enum):
     UPLOAD_ALLOWED_EXTENTIONS = 'UPLOAD_ALLOWED_EXTENTIONS'
     # URLs
     LOCAL_LLM_URL = 'LOCAL_LLM_URL'
+    # Shared HTTP clients (optional)
+    HTTP_MAX_CONNECTIONS = 'HTTP_MAX_CONNECTIONS'
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 'HTTP_MAX_KEEPALIVE_CONNECTIONS'
+    HTTP_MAX_CONNECTIONS_PER_HOST = 'HTTP_MAX_CONNECTIONS_PER_HOST'
+    HTTP_TIMEOUT = 'HTTP_TIMEOUT'
+    HTTP_CONNECT_TIMEOUT = 'HTTP_CONNECT_TIMEOUT'
+    HTTP_HTTP2 = 'HTTP_HTTP2'
+    # LLM response cache (optional)
+    LLM_RESPONSE_CACHE_BACKEND = 'LLM_RESPONSE_CACHE_BACKEND'
+    LLM_RESPONSE_CACHE_MAX_ENTRIES = 'LLM_RESPONSE_CACHE_MAX_ENTRIES'
+    LLM_RESPONSE_CACHE_TTL = 'LLM_RESPONSE_CACHE_TTL'
     # LLM
     APP_OPENAI_KEY = 'APP_OPENAI_KEY'
     APP_OPENAI_MODEL = 'APP_OPENAI_MODEL'
@@ -19,6 +30,19 @@ class EnvKeys(Enum):
     LOCAL_LLM_MAX_TOKENS = 'LOCAL_LLM_MAX_TOKENS'
     LOCAL_LLM_STREAM = 'LOCAL_LLM_STREAM'
     LOCAL_LLM_VERBOSE = 'LOCAL_LLM_VERBOSE'
+    # Local embedding engine (optional)
+    LOCAL_EMBEDDING_BACKEND = 'LOCAL_EMBEDDING_BACKEND'
+    LOCAL_EMBEDDING_QUANTIZE = 'LOCAL_EMBEDDING_QUANTIZE'
+    LOCAL_EMBEDDING_MAX_BATCH_TOKENS = 'LOCAL_EMBEDDING_MAX_BATCH_TOKENS'
+    LOCAL_EMBEDDING_INTRA_OP_THREADS = 'LOCAL_EMBEDDING_INTRA_OP_THREADS'
+    LOCAL_EMBEDDING_INTER_OP_THREADS = 'LOCAL_EMBEDDING_INTER_OP_THREADS'
+    LOCAL_EMBEDDING_PROCESSES = 'LOCAL_EMBEDDING_PROCESSES'
+    LOCAL_EMBEDDING_QUERY_BATCH_SIZE = 'LOCAL_EMBEDDING_QUERY_BATCH_SIZE'
+    LOCAL_EMBEDDING_QUERY_WAIT_MS = 'LOCAL_EMBEDDING_QUERY_WAIT_MS'
+    # Keyword extraction (optional)
+    KEYWORD_EXTRACTION_BATCH_SIZE = 'KEYWORD_EXTRACTION_BATCH_SIZE'
+    KEYWORD_EXTRACTION_PROCESSES = 'KEYWORD_EXTRACTION_PROCESSES'
+    KEYWORD_EXTRACTION_RANKING = 'KEYWORD_EXTRACTION_RANKING'
     # Groq
     GROQ_API_KEY = 'GROQ_API_KEY'
     GROQ_MODEL = 'GROQ_MODEL'
@@ -69,6 +93,8 @@ class EnvKeys(Enum):
     REDIS_PORT='REDIS_PORT'
     REDIS_PASSWORD='REDIS_PASSWORD'
     REDIS_DATABASE='REDIS_DATABASE'
+    REDIS_SERIALIZER='REDIS_SERIALIZER'
+    REDIS_DEFAULT_TTL='REDIS_DEFAULT_TTL'
     #POSTGRES
     POSTGRES_DB_HOST='POSTGRES_DB_HOST'
     POSTGRES_DB_NAME='POSTGRES_DB_NAME'
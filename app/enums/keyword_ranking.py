@@ -0,0 +1,5 @@
+from enum import Enum
+
+class KeywordRanking(Enum):
+    TFIDF = 'tfidf'
+    FREQUENCY = 'frequency'
@@ -0,0 +1,5 @@
+from enum import Enum
+
+class RedisSerializer(Enum):
+    JSON = 'json'
+    MSGPACK = 'msgpack'
@@ -6,6 +6,7 @@ from langchain_community.chat_message_histories import RedisChatMessageHistory
 from langchain.prompts import ChatPromptTemplate
 from app.enums.env_keys import EnvKeys
 from app.utils.utility_manager import UtilityManager
+from app.utils.http_client_registry import HTTPClientRegistry
 
 
 class LLMWithRedisHistory(UtilityManager):
@@ -33,6 +34,7 @@ class LLMWithRedisHistory(UtilityManager):
             azure_deployment=self.__AZURE_DEPLOYMENT,
             azure_endpoint=self.__AZURE_BASE_URL,
             verbose=self.__AZURE_VERBOSE,
+            http_client=HTTPClientRegistry.shared().get_client("azure_openai"),
         )
         
 
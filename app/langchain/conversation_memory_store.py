@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from app.databases.sqlite_database_manager import SQLiteDBManager
+
+Turn = Tuple[str, str]
+
+
+class ConversationMemoryStore(ABC):
+    """
+    Keeps the last `window` (human, ai) turns of every user.
+
+    Turns are stored as one compact JSON document per user instead of LangChain
+    message objects, so an idle conversation costs a single string.
+    """
+
+    def __init__(self, window: int = 10, ttl_seconds: Optional[float] = 3600):
+        self.window = window
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def load_turns(self, user_id: str) -> List[Turn]:
+        """Returns the stored turns of a user, oldest first. Unknown or expired users have none."""
+
+    @abstractmethod
+    def save_turns(self, user_id: str, turns: List[Turn]):
+        """Replaces the stored turns of a user and restarts its TTL."""
+
+    @abstractmethod
+    def delete(self, user_id: str) -> bool:
+        """Forgets a user. Returns False when the user was not stored."""
+
+    def append_turn(self, user_id: str, human: str, ai: str):
+        turns = self.load_turns(user_id)
+        turns.append((human, ai))
+        self.save_turns(user_id, turns)
+
+    def serialize(self, turns: List[Turn]) -> str:
+        return json.dumps(turns[-self.window:], separators=(",", ":"), ensure_ascii=False)
+
+    @staticmethod
+    def deserialize(payload: Optional[str]) -> List[Turn]:
+        return [tuple(turn) for turn in json.loads(payload)] if payload else []
+
+
+class InMemoryConversationStore(ConversationMemoryStore):
+    """Per-process LRU with a TTL: the least recently active user is evicted beyond `max_users`."""
+
+    def __init__(self, window: int = 10, ttl_seconds: Optional[float] = 3600, max_users: int = 10000):
+        super().__init__(window=window, ttl_seconds=ttl_seconds)
+        self.max_users = max_users
+        self.__LOCK = threading.Lock()
+        # user_id -> (expires_at, UTF-8 encoded turns)
+        self.__USERS: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def load_turns(self, user_id: str) -> List[Turn]:
+        with self.__LOCK:
+            entry = self.__USERS.get(user_id)
+            if entry is None:
+                return []
+            if entry[0] < time.monotonic():
+                del self.__USERS[user_id]
+                return []
+            self.__USERS.move_to_end(user_id)
+        return self.deserialize(entry[1].decode("utf-8"))
+
+    def save_turns(self, user_id: str, turns: List[Turn]):
+        payload = self.serialize(turns).encode("utf-8")
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        with self.__LOCK:
+            self.__USERS[user_id] = (expires_at, payload)
+            self.__USERS.move_to_end(user_id)
+            while len(self.__USERS) > self.max_users:
+                self.__USERS.popitem(last=False)
+
+    def delete(self, user_id: str) -> bool:
+        with self.__LOCK:
+            return self.__USERS.pop(user_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self.__USERS)
+
+
+class RedisConversationStore(ConversationMemoryStore):
+    """Shared across workers through Redis; the TTL is enforced by Redis key expiry."""
+
+    def __init__(self, window: int = 10, ttl_seconds: Optional[float] = 3600, redis_client=None, key_prefix: str = "chat_memory:"):
+        super().__init__(window=window, ttl_seconds=ttl_seconds)
+        if redis_client is None:
+            # redis is an optional dependency, only needed when this store is used
+            from app.databases.redis_store_manager import RedisManager
+            redis_client = RedisManager().redis_client
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+
+    def load_turns(self, user_id: str) -> List[Turn]:
+        payload = self.redis_client.get(self.key_prefix + user_id)
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        return self.deserialize(payload)
+
+    def save_turns(self, user_id: str, turns: List[Turn]):
+        ttl = int(self.ttl_seconds) if self.ttl_seconds else None
+        self.redis_client.set(self.key_prefix + user_id, self.serialize(turns), ex=ttl)
+
+    def delete(self, user_id: str) -> bool:
+        return self.redis_client.delete(self.key_prefix + user_id) == 1
+
+
+class SQLiteConversationStore(ConversationMemoryStore, SQLiteDBManager):
+    """Shared across workers on one host through the application's SQLite database."""
+    TABLE_NAME = "conversation_memory"
+
+    def __init__(self, window: int = 10, ttl_seconds: Optional[float] = 3600):
+        ConversationMemoryStore.__init__(self, window=window, ttl_seconds=ttl_seconds)
+        SQLiteDBManager.__init__(self)
+        self._execute_query(f'''
+            CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                user_id TEXT PRIMARY KEY,
+                turns TEXT NOT NULL,
+                expires_at REAL
+            )
+        ''')
+        self.purge_expired()
+
+    def load_turns(self, user_id: str) -> List[Turn]:
+        query = f"SELECT turns FROM {self.TABLE_NAME} WHERE user_id = ? AND (expires_at IS NULL OR expires_at > ?)"
+        row = self._execute_query(query, (user_id, time.time()), fetch_one=True)
+        return self.deserialize(row['turns'] if row else None)
+
+    def save_turns(self, user_id: str, turns: List[Turn]):
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        query = f"INSERT OR REPLACE INTO {self.TABLE_NAME} (user_id, turns, expires_at) VALUES (?, ?, ?)"
+        self._execute_query(query, (user_id, self.serialize(turns), expires_at))
+
+    def delete(self, user_id: str) -> bool:
+        existed = self._execute_query(f"SELECT 1 AS found FROM {self.TABLE_NAME} WHERE user_id = ?", (user_id,), fetch_one=True)
+        self._execute_query(f"DELETE FROM {self.TABLE_NAME} WHERE user_id = ?", (user_id,))
+        return existed is not None
+
+    def purge_expired(self):
+        self._execute_query(f"DELETE FROM {self.TABLE_NAME} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
@@ -1,21 +1,45 @@
 from datetime import datetime
 import logging
-from typing import Any, Dict, List, Union
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
 from langchain_core.documents import Document
 from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferWindowMemory
 from langchain_community.callbacks import get_openai_callback
+from app.enums.condense_mode import CondenseMode
+from app.langchain.conversation_memory_store import ConversationMemoryStore, InMemoryConversationStore, Turn
+from app.langchain.question_condenser import QuestionCondenser
+from app.langchain.semantic_response_cache import SemanticResponseCache
 from app.utils.utility_manager import UtilityManager
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain.vectorstores.pgvector import PGVector
 
 class ConversationalRAGChatbot(UtilityManager):
-    def __init__(self, llm: Any, vectorstore: PGVector, memory_window: int = 10):
-        """Initializes the chatbot with an LLM and vectorstore for document retrieval."""
+    def __init__(
+        self,
+        llm: Any,
+        vectorstore: PGVector,
+        memory_window: int = 10,
+        memory_store: Optional[ConversationMemoryStore] = None,
+        condense_mode: CondenseMode = CondenseMode.ALWAYS,
+        response_cache: Optional[SemanticResponseCache] = None,
+    ):
+        """
+        Initializes the chatbot with an LLM and vectorstore for document retrieval.
+        Chat history lives in `memory_store`, a bounded per-process LRU unless a shared
+        Redis or SQLite store is passed. The question-condensing LLM call is skipped on
+        the first turn, and with `CondenseMode.HEURISTIC` also for self-contained follow-ups.
+        With a `response_cache`, near-duplicate standalone questions are answered from it
+        without retrieval or completion.
+        """
         self.__LLM = llm
         self.__VECTORSTORE = vectorstore
-        self.__CONVERSATION_MEMORY: Dict[str, ConversationBufferWindowMemory] = {}
+        self.__MEMORY_STORE = memory_store or InMemoryConversationStore(window=memory_window)
         self.memory_window = memory_window
+        self.condenser = QuestionCondenser(mode=condense_mode)
+        self.__RESPONSE_CACHE = response_cache
+        # Compiled chains hold no per-user state, so one per (top_k, relevancy) serves every user
+        self.__CHAINS: Dict[Tuple[int, float], ConversationalRetrievalChain] = {}
+        self.__CHAINS_LOCK = threading.Lock()
 
     def chat(
         self, 
@@ -43,51 +67,157 @@ class ConversationalRAGChatbot(UtilityManager):
         """
         logging.info(f"Handling query for user_id: {user_id} with query: {query}")
         start_time = datetime.now()
+        turns = self.__MEMORY_STORE.load_turns(user_id)
+        history = self.__window(turns)
+        conversation_chain = self.get_conversation_chain(top_k=top_k, relevancy=relevancy)
 
-        if user_id not in self.__CONVERSATION_MEMORY:
-            self.__CONVERSATION_MEMORY[user_id] = ConversationBufferWindowMemory(
-                memory_key='chat_history', 
-                return_messages=True, 
-                output_key='answer',
-                k=self.memory_window,
-            )
-
-        conversation_chain = ConversationalRetrievalChain.from_llm(
-            llm=self.__LLM,
-            retriever=self.__VECTORSTORE.as_retriever(k=top_k, lambda_mult=relevancy),
-            memory=self.__CONVERSATION_MEMORY[user_id],
-            return_source_documents=True,
-        )
+        try:
+            with get_openai_callback() as cb:
+                condensed = self.condenser.needs_condensing(query, history)
+                question = self.condenser.condense(conversation_chain, query, history, cb) if condensed else query
+                vector = self.__RESPONSE_CACHE.embed(question) if self.__RESPONSE_CACHE else None
+                response = self.__cached_response(vector, top_k, relevancy)
+                if response is None:
+                    spent = (cb.total_tokens, cb.total_cost)
+                    # The question is standalone by now, so the chain gets no history and makes no rewrite of its own
+                    response = conversation_chain({"question": question, "chat_history": []})
+                    self.__cache_response(vector, question, response, top_k, relevancy, cb, spent)
+                self.__MEMORY_STORE.save_turns(user_id, turns + [(query, response['answer'])])
+                return self.__build_answer(query, response, history, condensed, cb, start_time, return_documents, return_history)
+
+        except Exception as e:
+            logging.error("Error during chat response generation: {}".format(str(e)))
+            raise e
+
+    async def achat(
+        self, 
+        query: str, 
+        user_id: str = '33', 
+        return_history: bool = False, 
+        top_k: int = 5, 
+        return_documents: bool = False, 
+        relevancy: float = 0.5
+    ) -> Dict[str, Any]:
+        """
+        Async version of `chat`. The LLM calls are awaited, so concurrent chats
+        share the event loop instead of blocking it.
+        
+        Args:
+            query (str): The user query.
+            user_id (str): The user identifier. Defaults to '33'.
+            return_history (bool): Whether to return the chat history. Defaults to False.
+            top_k (int): The number of top documents to retrieve. Defaults to 5.
+            return_documents (bool): Whether to return the source documents. Defaults to False.
+            relevancy (float): Multiplier for document relevancy. Defaults to 0.5.
+        
+        Returns:
+            Dict[str, Any]: The chatbot's answer, source documents, tokens used, and more.
+        """
+        logging.info(f"Handling query for user_id: {user_id} with query: {query}")
+        start_time = datetime.now()
+        turns = self.__MEMORY_STORE.load_turns(user_id)
+        history = self.__window(turns)
+        conversation_chain = self.get_conversation_chain(top_k=top_k, relevancy=relevancy)
 
         try:
             with get_openai_callback() as cb:
-                response = conversation_chain({"question": query})
-                total_time = self.calculate_response_time(start_time)
-
-                docs: List[Document] = response['source_documents']
-                chat_history: List[Union[HumanMessage, AIMessage]] = response['chat_history']
-                
-                sources = {doc.metadata['source'] for doc in docs}
-
-                answer = {
-                    "question": query,
-                    "answer": response['answer'],
-                    "sources": list(sources),
-                    "documents": docs if return_documents else [],
-                    "chat_history": chat_history if return_history else [],
-                    "total_tokens": cb.total_tokens,
-                    "completion_tokens": cb.completion_tokens,
-                    "total_cost": cb.total_cost,
-                    "prompt_tokens": cb.prompt_tokens,
-                    "time_taken": total_time,
-                }
-
-                return answer
+                condensed = self.condenser.needs_condensing(query, history)
+                question = await self.condenser.acondense(conversation_chain, query, history, cb) if condensed else query
+                vector = await self.__RESPONSE_CACHE.aembed(question) if self.__RESPONSE_CACHE else None
+                response = self.__cached_response(vector, top_k, relevancy)
+                if response is None:
+                    spent = (cb.total_tokens, cb.total_cost)
+                    # The question is standalone by now, so the chain gets no history and makes no rewrite of its own
+                    response = await conversation_chain.ainvoke({"question": question, "chat_history": []})
+                    self.__cache_response(vector, question, response, top_k, relevancy, cb, spent)
+                self.__MEMORY_STORE.save_turns(user_id, turns + [(query, response['answer'])])
+                return self.__build_answer(query, response, history, condensed, cb, start_time, return_documents, return_history)
 
         except Exception as e:
             logging.error("Error during chat response generation: {}".format(str(e)))
             raise e
 
+    def get_conversation_chain(self, top_k: int = 5, relevancy: float = 0.5) -> ConversationalRetrievalChain:
+        """
+        Returns the retrieval chain for `top_k` and `relevancy`, building it on first use.
+        The chain has no memory attached; chat history is passed in with every call.
+        """
+        key = (top_k, relevancy)
+        chain = self.__CHAINS.get(key)
+        if chain is None:
+            with self.__CHAINS_LOCK:
+                chain = self.__CHAINS.get(key)
+                if chain is None:
+                    chain = self.__CHAINS[key] = ConversationalRetrievalChain.from_llm(
+                        llm=self.__LLM,
+                        retriever=self.__VECTORSTORE.as_retriever(k=top_k, lambda_mult=relevancy),
+                        return_source_documents=True,
+                    )
+        return chain
+
+    def __cached_response(self, vector: Any, top_k: int, relevancy: float) -> Optional[Dict[str, Any]]:
+        if vector is None:
+            return None
+        entry = self.__RESPONSE_CACHE.lookup(vector, scope=(top_k, relevancy))
+        if entry is None:
+            return None
+        return {"answer": entry.answer, "source_documents": entry.documents, "cache_hit": True}
+
+    def __cache_response(self, vector: Any, question: str, response: Dict[str, Any], top_k: int, relevancy: float, cb: Any, spent: Tuple[int, float]):
+        if vector is None:
+            return
+        self.__RESPONSE_CACHE.store(
+            vector,
+            query=question,
+            answer=response['answer'],
+            documents=response['source_documents'],
+            scope=(top_k, relevancy),
+            total_tokens=cb.total_tokens - spent[0],
+            total_cost=cb.total_cost - spent[1],
+        )
+
+    def __window(self, turns: List[Turn]) -> List[Turn]:
+        return turns[-self.memory_window:] if self.memory_window else []
+
+    def __build_answer(
+        self,
+        query: str,
+        response: Dict[str, Any],
+        history: List[Turn],
+        condensed: bool,
+        cb: Any,
+        start_time: datetime,
+        return_documents: bool,
+        return_history: bool,
+    ) -> Dict[str, Any]:
+        total_time = self.calculate_response_time(start_time)
+
+        docs: List[Document] = response['source_documents']
+        chat_history: List[Union[HumanMessage, AIMessage]] = []
+        for human, ai in history:
+            chat_history.extend((HumanMessage(content=human), AIMessage(content=ai)))
+        # Without history the chain never rewrote the question, so only skipped follow-ups save anything
+        time_saved, tokens_saved = self.condenser.estimated_savings() if history and not condensed else (0.0, 0)
+        
+        sources = {doc.metadata['source'] for doc in docs}
+
+        return {
+            "question": query,
+            "answer": response['answer'],
+            "sources": list(sources),
+            "documents": docs if return_documents else [],
+            "chat_history": chat_history if return_history else [],
+            "total_tokens": cb.total_tokens,
+            "completion_tokens": cb.completion_tokens,
+            "total_cost": cb.total_cost,
+            "prompt_tokens": cb.prompt_tokens,
+            "time_taken": total_time,
+            "cache_hit": response.get("cache_hit", False),
+            "question_condensed": condensed,
+            "condense_time_saved": time_saved,
+            "condense_tokens_saved": tokens_saved,
+        }
+
     def delete_chat_history(self, user_id: str) -> Dict[str, str]:
         """
         Deletes the chat history for a given user.
@@ -98,8 +228,7 @@ class ConversationalRAGChatbot(UtilityManager):
         Returns:
             Dict[str, str]: Message confirming deletion or user not found.
         """
-        if user_id in self.__CONVERSATION_MEMORY:
-            del self.__CONVERSATION_MEMORY[user_id]
+        if self.__MEMORY_STORE.delete(user_id):
             return {"message": "Chat history deleted."}
         else:
             return {"message": "User not found."}
@@ -114,17 +243,4 @@ class ConversationalRAGChatbot(UtilityManager):
         Returns:
             List[Dict[str, str]]: List of human/AI message pairs.
         """
-        if user_id in self.__CONVERSATION_MEMORY:
-            messages: List[Union[HumanMessage, AIMessage]] = self.__CONVERSATION_MEMORY[user_id].buffer
-            human_messages = [message for message in messages if isinstance(message, HumanMessage)]
-            ai_messages = [message for message in messages if isinstance(message, AIMessage)]
-
-            final_messages = [
-                {"human": human_message.content, "ai": ai_message.content}
-                for human_message, ai_message in zip(human_messages, ai_messages)
-            ]
-
-            return final_messages
-        else:
-            return []
-
+        return [{"human": human, "ai": ai} for human, ai in self.__MEMORY_STORE.load_turns(user_id)]
@@ -1,23 +1,59 @@
+import asyncio
 import json
 import os
-import requests
-from typing import Any, List, Optional
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from langchain.memory import ConversationBufferMemory
 from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
 from langchain.chains import ConversationChain, LLMChain
 from langchain.output_parsers import StructuredOutputParser
 from langchain.prompts import PromptTemplate
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun
+from langchain_core.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from pydantic import Field
 from app.utils.utility_manager import UtilityManager
 from app.enums.env_keys import EnvKeys
+from app.langchain.streaming_chat_manager import StreamingChatManager
+from app.utils.http_client_registry import HTTPClientRegistry
 from dotenv import load_dotenv
-from groq import Groq
+from groq import APIError, AsyncGroq, Groq
+
+HTTP_CLIENT_NAME = "groq"
+_groq_client: Optional[Groq] = None
+_groq_client_lock = threading.Lock()
+# Async connections belong to the event loop that opened them, so the shared client is kept per loop
+_async_groq_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGroq]" = weakref.WeakKeyDictionary()
+
+
+def get_groq_client(api_key: str) -> Groq:
+    """Returns the Groq client shared by every GROQLLM instance, backed by the registry's keep-alive HTTP client."""
+    global _groq_client
+    with _groq_client_lock:
+        if _groq_client is None:
+            _groq_client = Groq(api_key=api_key, http_client=HTTPClientRegistry.shared().get_client(HTTP_CLIENT_NAME))
+        return _groq_client
+
+
+def get_async_groq_client(api_key: str) -> AsyncGroq:
+    """Returns the AsyncGroq client shared by every GROQLLM instance on the running loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_groq_clients.get(loop)
+    if client is None:
+        http_client = HTTPClientRegistry.shared().get_async_client(HTTP_CLIENT_NAME)
+        client = _async_groq_clients[loop] = AsyncGroq(api_key=api_key, http_client=http_client)
+    return client
+
+
+def _setting(key: str) -> Optional[str]:
+    """Reads a setting when a GROQLLM is created, so importing this module does not load .env."""
+    load_dotenv()
+    return os.getenv(key)
 
-load_dotenv()
 
 class GROQLLM(LLM, UtilityManager):
-    GROQ_API_KEY = os.getenv(EnvKeys.GROQ_API_KEY.value)
-    MODEL = os.getenv(EnvKeys.GROQ_MODEL.value)
+    GROQ_API_KEY: Optional[str] = Field(default_factory=lambda: _setting(EnvKeys.GROQ_API_KEY.value), repr=False)
+    MODEL: Optional[str] = Field(default_factory=lambda: _setting(EnvKeys.GROQ_MODEL.value))
     
     def _call(
         self,
@@ -29,22 +65,8 @@ class GROQLLM(LLM, UtilityManager):
         
         """Run the LLM on the given input by making a request to the GROQ API."""
         try:
-                
-            groq_client = Groq(
-                api_key=self.GROQ_API_KEY,
-            )
-            
-            chat_completion = groq_client.chat.completions.create(
-                    messages=[
-                        {
-                            "role": "system",
-                            "content":"Your an excellent assistant" ,
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt,
-                        }
-                    ],
+            chat_completion = get_groq_client(self.GROQ_API_KEY).chat.completions.create(
+                    messages=self._build_messages(prompt),
                     model=self.MODEL,
                     )
             response_data = json.loads(chat_completion.model_dump_json())
@@ -53,20 +75,90 @@ class GROQLLM(LLM, UtilityManager):
             # total_time = response_data["usage"]["total_time"]
             return message_content
         
-        except requests.exceptions.RequestException as e:
-                return f"Request failed: {e}"
+        except APIError as e:
+            return f"Request failed: {e}"
         except (ValueError, KeyError) as e:
             return f"Error processing response: {e}"
 
         
+    async def _acall(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        """Same request as `_call`, awaited on the shared AsyncGroq client."""
+        try:
+            chat_completion = await get_async_groq_client(self.GROQ_API_KEY).chat.completions.create(
+                    messages=self._build_messages(prompt),
+                    model=self.MODEL,
+                    )
+            return chat_completion.choices[0].message.content
+
+        except APIError as e:
+            return f"Request failed: {e}"
+        except (ValueError, KeyError, IndexError) as e:
+            return f"Error processing response: {e}"
+
+    def _stream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[GenerationChunk]:
+        """Streams the completion token by token from the GROQ API."""
+        try:
+            stream = get_groq_client(self.GROQ_API_KEY).chat.completions.create(messages=self._build_messages(prompt), model=self.MODEL, stream=True)
+            for completion_chunk in stream:
+                # Usage-only chunks at the end of a stream carry no choices
+                if completion_chunk.choices and (text := completion_chunk.choices[0].delta.content):
+                    chunk = GenerationChunk(text=text)
+                    if run_manager:
+                        run_manager.on_llm_new_token(text, chunk=chunk)
+                    yield chunk
+
+        except APIError as e:
+            yield GenerationChunk(text=f"Request failed: {e}")
+
+    async def _astream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[GenerationChunk]:
+        """Async version of `_stream` on the shared AsyncGroq client."""
+        try:
+            stream = await get_async_groq_client(self.GROQ_API_KEY).chat.completions.create(
+                messages=self._build_messages(prompt), model=self.MODEL, stream=True
+            )
+            async for completion_chunk in stream:
+                if completion_chunk.choices and (text := completion_chunk.choices[0].delta.content):
+                    chunk = GenerationChunk(text=text)
+                    if run_manager:
+                        await run_manager.on_llm_new_token(text, chunk=chunk)
+                    yield chunk
+
+        except APIError as e:
+            yield GenerationChunk(text=f"Request failed: {e}")
+
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "Your an excellent assistant"},
+            {"role": "user", "content": prompt},
+        ]
+
     @property
     def _llm_type(self) -> str:
         """Get the type of language model used by this chat model. Used for logging purposes only."""
         return "GROQ"
 
-class LangchainGroqManager(UtilityManager):
+class LangchainGroqManager(UtilityManager, StreamingChatManager):
     def __init__(self):
         super().__init__()
+        load_dotenv()
         
         self.TEMPERATURE = float(self.get_env_variable(EnvKeys.GROQ_TEMPERATURE.value))
         self.GROQ_VERBOSE = self.get_env_variable(EnvKeys.GROQ_VERBOSE.value)
@@ -90,6 +182,18 @@ class LangchainGroqManager(UtilityManager):
 
         return {"response": response}
 
+    async def arun_conversational_chain(self, prompt: str, output_parser: StructuredOutputParser = None) -> dict:
+        """
+        Async version of `run_conversational_chain`.
+        """
+        response = await self.conversation_chain.apredict(input=prompt)
+
+        if output_parser:
+            parsed_response = output_parser.parse(response)
+            return parsed_response
+
+        return {"response": response}
+
     def run_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
         """
         This LLM chain without memory, Chats will be stored by default.
@@ -105,3 +209,19 @@ class LangchainGroqManager(UtilityManager):
             return output_parser.parse(result)
 
         return {"response": result}
+
+    async def arun_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
+        """
+        Async version of `run_llm_chain`.
+        """
+        llm_chain = LLMChain(
+            llm=self.llm_model,
+            prompt=prompt_template,
+        )
+
+        result = await llm_chain.arun(input_values)
+
+        if output_parser:
+            return output_parser.parse(result)
+
+        return {"response": result}
@@ -8,9 +8,12 @@ from langchain.prompts import PromptTemplate
 from langchain_community.embeddings import  AzureOpenAIEmbeddings
 from app.utils.utility_manager import UtilityManager
 from app.enums.env_keys import EnvKeys
+from app.langchain.streaming_chat_manager import StreamingChatManager
+from app.langchain.llm_response_cache import CachedLLMChainManager
+from app.utils.http_client_registry import HTTPClientRegistry
 
 
-class LangchainOpenAIManager(UtilityManager):
+class LangchainOpenAIManager(UtilityManager, StreamingChatManager, CachedLLMChainManager):
     def __init__(
         self,STOP:Any = None, 
         MAX_RETRY:int = 1,
@@ -38,6 +41,7 @@ class LangchainOpenAIManager(UtilityManager):
             azure_deployment=self.AZURE_DEPLOYMENT,
             azure_endpoint=self.AZURE_BASE_URL,
             stop=self.STOP,
+            http_client=HTTPClientRegistry.shared().get_client("azure_openai"),
         )
 
         # self.embedding = AzureOpenAIEmbeddings(openai_api_key=self.AZURE_OPENAI_KEY, chunk_size=2000)
@@ -63,16 +67,50 @@ class LangchainOpenAIManager(UtilityManager):
             
         return {"response": response}
 
+    async def arun_conversational_chain(self, prompt: str, output_parser: StructuredOutputParser = None, dont_store:bool = False) -> dict:
+        """
+        Async version of `run_conversational_chain`.
+        """
+        response = await self.conversation_chain.apredict(input=prompt)
+        if output_parser:
+            response = output_parser.parse(response)
+        
+        if dont_store:
+            # Remove last message from buffer
+            self.clean_and_add_updated_message()
+            
+        return {"response": response}
+
+    def response_cache_identity(self) -> tuple:
+        return ("azure_openai", f"{self.AZURE_DEPLOYMENT}:{self.AZURE_MODEL}", self.AZURE_TEMPERATURE)
+
     def run_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
         """
         This LLM chain without memory, Chats will be stored by default.
+        Temperature-0 completions are served from the shared LLMResponseCache.
+        """
+        llm_chain = LLMChain(
+            llm=self.llm_model,
+            prompt=prompt_template,
+        )
+
+        result = self.cached_completion(prompt_template, input_values, lambda: llm_chain.run(input_values))
+
+        if output_parser:
+            return output_parser.parse(result)
+
+        return {"response": result}
+
+    async def arun_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
+        """
+        Async version of `run_llm_chain`.
         """
         llm_chain = LLMChain(
             llm=self.llm_model,
             prompt=prompt_template,
         )
 
-        result = llm_chain.run(input_values)
+        result = await self.acached_completion(prompt_template, input_values, lambda: llm_chain.arun(input_values))
 
         if output_parser:
             return output_parser.parse(result)
@@ -1,16 +1,14 @@
-import boto3
-from langchain.llms.bedrock import Bedrock
-from langchain_community.embeddings import BedrockEmbeddings
 from langchain.memory import ConversationBufferMemory
 from langchain.chains import ConversationChain, LLMChain
 from langchain.output_parsers import StructuredOutputParser
 from langchain.prompts import PromptTemplate
 from app.utils.utility_manager import UtilityManager
 from app.enums.env_keys import EnvKeys
+from app.langchain.llm_response_cache import CachedLLMChainManager
 
 
 
-class LangchainBedrockManager(UtilityManager):
+class LangchainBedrockManager(UtilityManager, CachedLLMChainManager):
     def __init__(self):
         super().__init__()
         self.MODEL_ID = self.get_env_variable(EnvKeys.APP_CLAUDE_MODEL_ID.value)
@@ -19,6 +17,11 @@ class LangchainBedrockManager(UtilityManager):
         self.SECRET_ACCESS_KEY = self.get_env_variable(EnvKeys.APP_AWS_SECRET_ACCESS_KEY.value)
         self.ACCESS_KEY_ID = self.get_env_variable(EnvKeys.APP_AWS_ACCESS_KEY_ID.value)
         
+        # boto3 is an optional dependency, only needed when Bedrock is used
+        import boto3
+        from langchain_community.embeddings import BedrockEmbeddings
+        from langchain_community.llms.bedrock import Bedrock
+
         self.BOTO_BEDROCK_CLIENT = boto3.client(
         service_name=self.SERVICE_NAME,
         region_name=self.REGION, 
@@ -54,19 +57,50 @@ class LangchainBedrockManager(UtilityManager):
 
         return {"response": response}
 
+    async def arun_conversational_chain(self, prompt: str, output_parser: StructuredOutputParser = None) -> dict:
+        """
+        Async version of `run_conversational_chain`.
+        """
+        response = await self.conversation_chain.apredict(input=prompt)
+
+        if output_parser:
+            parsed_response = output_parser.parse(response)
+            return parsed_response
+
+        return {"response": response}
+
+    def response_cache_identity(self) -> tuple:
+        return ("bedrock", self.MODEL_ID, (self.BEDROCK_LLM.model_kwargs or {}).get("temperature"))
+
     def run_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
         """
         This LLM chain without memory, Chats will be stored by default.
+        Temperature-0 completions are served from the shared LLMResponseCache.
         """
         llm_chain = LLMChain(
             llm=self.BEDROCK_LLM,
             prompt=prompt_template,
         )
 
-        result = llm_chain.run(input_values)
+        result = self.cached_completion(prompt_template, input_values, lambda: llm_chain.run(input_values))
 
         if output_parser:
             return output_parser.parse(result)
 
         return {"response": result}
 
+    async def arun_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
+        """
+        Async version of `run_llm_chain`.
+        """
+        llm_chain = LLMChain(
+            llm=self.BEDROCK_LLM,
+            prompt=prompt_template,
+        )
+
+        result = await self.acached_completion(prompt_template, input_values, lambda: llm_chain.arun(input_values))
+
+        if output_parser:
+            return output_parser.parse(result)
+
+        return {"response": result}
@@ -6,9 +6,12 @@ from langchain.output_parsers import StructuredOutputParser
 from langchain.prompts import PromptTemplate
 from app.utils.utility_manager import UtilityManager
 from app.enums.env_keys import EnvKeys
+from app.langchain.streaming_chat_manager import StreamingChatManager
+from app.langchain.llm_response_cache import CachedLLMChainManager
+from app.utils.http_client_registry import HTTPClientRegistry
 
 
-class OpenAIManager(UtilityManager):
+class OpenAIManager(UtilityManager, StreamingChatManager, CachedLLMChainManager):
     def __init__(self):
         super().__init__()
         
@@ -23,6 +26,7 @@ class OpenAIManager(UtilityManager):
             model_name=self.MODEL,
             temperature=self.TEMPERATURE,
             verbose=self.VERBOSE,
+            http_client=HTTPClientRegistry.shared().get_client("openai"),
         )
         
         self.conversation_memory = ConversationBufferMemory(
@@ -46,9 +50,42 @@ class OpenAIManager(UtilityManager):
 
         return {"response": response}
 
+    async def arun_conversational_chain(self, prompt: str, output_parser: StructuredOutputParser = None) -> dict:
+        """
+        Async version of `run_conversational_chain`.
+        """
+        response = await self.conversation_chain.apredict(input=prompt)
+
+        if output_parser:
+            parsed_response = output_parser.parse(response)
+            return parsed_response
+
+        return {"response": response}
+
+    def response_cache_identity(self) -> tuple:
+        return ("openai", self.MODEL, self.TEMPERATURE)
+
     def run_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
         """
         This LLM chain without memory, Chats will be stored by default.
+        Temperature-0 completions are served from the shared LLMResponseCache.
+        """
+        llm_chain = LLMChain(
+            llm=self.llm_model,
+            prompt=prompt_template,
+            verbose=self.VERBOSE,
+        )
+
+        result = self.cached_completion(prompt_template, input_values, lambda: llm_chain.run(input_values))
+
+        if output_parser:
+            return output_parser.parse(result)
+
+        return {"response": result}
+
+    async def arun_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
+        """
+        Async version of `run_llm_chain`.
         """
         llm_chain = LLMChain(
             llm=self.llm_model,
@@ -56,7 +93,7 @@ class OpenAIManager(UtilityManager):
             verbose=self.VERBOSE,
         )
 
-        result = llm_chain.run(input_values)
+        result = await self.acached_completion(prompt_template, input_values, lambda: llm_chain.arun(input_values))
 
         if output_parser:
             return output_parser.parse(result)
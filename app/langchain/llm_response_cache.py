@@ -0,0 +1,249 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from langchain.prompts import PromptTemplate
+from app.enums.env_keys import EnvKeys
+from app.utils.file_system import FileSystem
+
+# In-band error answers of the custom LLM wrappers, never worth caching
+ERROR_PREFIXES = ("Request failed:", "Error processing response:")
+
+
+class SQLiteResponseTier:
+    """Persistent tier in a local SQLite file, shared by the workers of one host."""
+
+    def __init__(self, path: Optional[str] = None):
+        file_system = FileSystem()
+        self.path = file_system.clean_path(path=path or f"{file_system.get_project_dir()}/app/vectors/llm_response_cache.db")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.__LOCK = threading.Lock()
+        self.__CONNECTION = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.__CONNECTION.execute("PRAGMA journal_mode=WAL")
+        self.__CONNECTION.execute("PRAGMA synchronous=NORMAL")
+        self.__CONNECTION.execute("CREATE TABLE IF NOT EXISTS llm_response_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL)")
+        self.__CONNECTION.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.__LOCK:
+            row = self.__CONNECTION.execute(
+                "SELECT response FROM llm_response_cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, response: str, ttl_seconds: Optional[float] = None):
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self.__LOCK:
+            self.__CONNECTION.execute("INSERT OR REPLACE INTO llm_response_cache (key, response, expires_at) VALUES (?, ?, ?)", (key, response, expires_at))
+            self.__CONNECTION.commit()
+
+    def clear(self):
+        with self.__LOCK:
+            self.__CONNECTION.execute("DELETE FROM llm_response_cache")
+            self.__CONNECTION.commit()
+
+
+class RedisResponseTier:
+    """Persistent tier in Redis, shared by every worker; expiry is left to Redis."""
+
+    def __init__(self, redis_client=None, key_prefix: str = "llm_response:"):
+        if redis_client is None:
+            # redis is an optional dependency, only needed when this tier is used
+            from app.databases.redis_store_manager import RedisManager
+            redis_client = RedisManager().redis_client
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+
+    def get(self, key: str) -> Optional[str]:
+        response = self.redis_client.get(self.key_prefix + key)
+        return response.decode("utf-8") if isinstance(response, bytes) else response
+
+    def set(self, key: str, response: str, ttl_seconds: Optional[float] = None):
+        self.redis_client.set(self.key_prefix + key, response, ex=int(ttl_seconds) if ttl_seconds else None)
+
+    def clear(self):
+        for key in self.redis_client.scan_iter(match=self.key_prefix + "*"):
+            self.redis_client.delete(key)
+
+
+class LLMResponseCache:
+    """
+    Exact-match cache of LLM completions keyed by (backend, model, temperature, rendered prompt).
+
+    Only deterministic calls are cached: `is_cacheable` rejects any temperature other
+    than 0. The first tier is an in-process LRU of `max_memory_entries` responses, the
+    optional second tier a SQLite or Redis store shared with other processes.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, persistent_tier: Any = None, max_memory_entries: int = 10000, ttl_seconds: Optional[float] = None):
+        self.persistent_tier = persistent_tier
+        self.max_memory_entries = max_memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.__LOCK = threading.Lock()
+        self.__MEMORY: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @classmethod
+    def shared(cls) -> "LLMResponseCache":
+        """Process wide cache used by all LLM managers, configured from the optional LLM_RESPONSE_CACHE_* variables."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls.from_env()
+        return cls._instance
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        # The persistent tiers are opt-in, by default responses only live in the process
+        backend = os.getenv(EnvKeys.LLM_RESPONSE_CACHE_BACKEND.value) or "memory"
+        backend = backend.lower()
+        ttl = os.getenv(EnvKeys.LLM_RESPONSE_CACHE_TTL.value)
+        persistent_tier = {"sqlite": SQLiteResponseTier, "redis": RedisResponseTier}.get(backend)
+        return cls(
+            persistent_tier=persistent_tier() if persistent_tier else None,
+            max_memory_entries=int(os.getenv(EnvKeys.LLM_RESPONSE_CACHE_MAX_ENTRIES.value, 10000)),
+            ttl_seconds=float(ttl) if ttl else None,
+        )
+
+    @staticmethod
+    def is_cacheable(temperature: Any) -> bool:
+        try:
+            return temperature is not None and float(temperature) == 0.0
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def make_key(backend: str, model: Any, temperature: Any, prompt: str) -> str:
+        payload = json.dumps([backend, str(model), float(temperature), prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        response = self.__memory_get(key)
+        if response is not None:
+            return response
+        return self.__persistent_result(key, self.persistent_tier.get(key) if self.persistent_tier else None)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Same as `get`, with the persistent tier (SQLite or Redis I/O) read on a worker thread."""
+        response = self.__memory_get(key)
+        if response is not None:
+            return response
+        return self.__persistent_result(key, await asyncio.to_thread(self.persistent_tier.get, key) if self.persistent_tier else None)
+
+    def set(self, key: str, response: str):
+        with self.__LOCK:
+            self.__remember(key, response)
+        if self.persistent_tier:
+            self.persistent_tier.set(key, response, self.ttl_seconds)
+
+    async def aset(self, key: str, response: str):
+        with self.__LOCK:
+            self.__remember(key, response)
+        if self.persistent_tier:
+            await asyncio.to_thread(self.persistent_tier.set, key, response, self.ttl_seconds)
+
+    def record_skip(self):
+        """Counts a call that bypassed the cache because it was not deterministic."""
+        with self.__LOCK:
+            self.skipped += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self.__LOCK:
+            lookups = self.memory_hits + self.persistent_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "hit_rate": (self.memory_hits + self.persistent_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self.__MEMORY),
+            }
+
+    def clear(self):
+        with self.__LOCK:
+            self.__MEMORY.clear()
+        if self.persistent_tier:
+            self.persistent_tier.clear()
+
+    def __memory_get(self, key: str) -> Optional[str]:
+        with self.__LOCK:
+            entry = self.__MEMORY.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.__MEMORY.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+        return None
+
+    def __persistent_result(self, key: str, response: Optional[str]) -> Optional[str]:
+        with self.__LOCK:
+            if response is None:
+                self.misses += 1
+                return None
+            self.persistent_hits += 1
+            self.__remember(key, response)
+        return response
+
+    def __remember(self, key: str, response: str):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        self.__MEMORY[key] = (expires_at, response)
+        self.__MEMORY.move_to_end(key)
+        while len(self.__MEMORY) > self.max_memory_entries:
+            self.__MEMORY.popitem(last=False)
+
+
+class CachedLLMChainManager(ABC):
+    """
+    Exact-match response caching for `run_llm_chain` of the LLM managers. The class it
+    is mixed into implements `response_cache_identity`, otherwise it cannot be instantiated.
+    """
+    response_cache: Optional[LLMResponseCache] = None
+
+    @abstractmethod
+    def response_cache_identity(self) -> Tuple[str, Any, Any]:
+        """(backend, model, temperature) of the completions, part of the cache key."""
+
+    def _response_cache(self) -> LLMResponseCache:
+        return self.response_cache or LLMResponseCache.shared()
+
+    def _response_cache_key(self, prompt_template: PromptTemplate, input_values: dict) -> Optional[str]:
+        backend, model, temperature = self.response_cache_identity()
+        if not LLMResponseCache.is_cacheable(temperature):
+            self._response_cache().record_skip()
+            return None
+        prompt = prompt_template.format_prompt(**input_values).to_string()
+        return LLMResponseCache.make_key(backend, model, temperature, prompt)
+
+    def cached_completion(self, prompt_template: PromptTemplate, input_values: dict, complete: Callable[[], str]) -> str:
+        """Returns the cached completion of the rendered prompt, or calls `complete` and caches its result."""
+        key = self._response_cache_key(prompt_template, input_values)
+        if key is None:
+            return complete()
+        cache = self._response_cache()
+        result = cache.get(key)
+        if result is None:
+            result = complete()
+            if not result.startswith(ERROR_PREFIXES):
+                cache.set(key, result)
+        return result
+
+    async def acached_completion(self, prompt_template: PromptTemplate, input_values: dict, complete: Callable[[], Awaitable[str]]) -> str:
+        key = self._response_cache_key(prompt_template, input_values)
+        if key is None:
+            return await complete()
+        cache = self._response_cache()
+        result = await cache.aget(key)
+        if result is None:
+            result = await complete()
+            if not result.startswith(ERROR_PREFIXES):
+                await cache.aset(key, result)
+        return result
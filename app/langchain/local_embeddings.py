@@ -1,38 +1,94 @@
 
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores.chroma import Chroma
+import os
+import threading
+from app.embeddings.cached_embeddings import CachedEmbeddings
+from app.embeddings.chroma_client_registry import ChromaClientRegistry
+from app.embeddings.incremental_ingestion_manager import IncrementalIngestionManager
+from app.embeddings.local_embedding_engine import LocalEmbeddingEngine
+from app.embeddings.micro_batching_embeddings import MicroBatchingEmbeddings
+from app.enums.env_keys import EnvKeys
+from app.langchain.semantic_response_cache import clear_cached_responses, invalidate_cached_sources
 from app.utils.utility_manager import UtilityManager
 
 class ChromaVectorStoreWithLocalEmbeddings(UtilityManager):
     error_logger = UtilityManager()
-    def __init__(self):
+    _embedding = None
+    _embedding_lock = threading.Lock()
+
+    def __init__(self, registry: ChromaClientRegistry = None):
         super().__init__()
         self.project_dir = self.get_project_dir()
         self.vector_path = 'app/vectors'
         self.create_folder(folder_path=self.vector_path)
-        self.embedding = HuggingFaceEmbeddings(model_name='sentence-transformers/all-MiniLM-L6-v2')
+        self.embedding = self.shared_embedding()
+        self.registry = registry or ChromaClientRegistry.shared()
+
+    @classmethod
+    def shared_embedding(cls) -> CachedEmbeddings:
+        """
+        The model is loaded once per process, as the registry's stores keep the embeddings they were opened with.
+        Batching, threads, backend and quantization come from the optional LOCAL_EMBEDDING_* variables;
+        concurrent search queries are embedded together in one forward pass.
+        """
+        with cls._embedding_lock:
+            if cls._embedding is None:
+                engine = LocalEmbeddingEngine.from_env(model_name='sentence-transformers/all-MiniLM-L6-v2')
+                batcher = MicroBatchingEmbeddings(
+                    engine,
+                    max_batch_size=int(os.getenv(EnvKeys.LOCAL_EMBEDDING_QUERY_BATCH_SIZE.value) or 32),
+                    max_wait_ms=float(os.getenv(EnvKeys.LOCAL_EMBEDDING_QUERY_WAIT_MS.value) or 3),
+                )
+                cls._embedding = CachedEmbeddings(batcher)
+        return cls._embedding
+
+    def get_vector_store(self, collection_name: str = 'langchain'):
+        return self.registry.get_store(persist_directory=self.vector_path, collection_name=collection_name, embedding_function=self.embedding)
     
     @error_logger.catch_api_exceptions
-    async def create_embeddings(self, document_path: str, collection_name: str = 'langchain', chunk_size: int = 2000, chunk_overlap: int = 200):
-        """Create a vector store from all .txt files in a directory."""
-        all_documents = self.load_directory(directory=document_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        vectordb = Chroma(persist_directory=self.vector_path, embedding_function=self.embedding,collection_name=collection_name)
-        chroma_db = vectordb.from_documents(documents=all_documents, embedding=self.embedding, collection_name=collection_name, persist_directory=self.vector_path)
-        chroma_db.persist()
+    async def create_embeddings(self, document_path: str, collection_name: str = 'langchain', chunk_size: int = 2000, chunk_overlap: int = 200, batch_size: int = 256, incremental: bool = False):
+        """
+        Create a vector store from all files in a directory, embedding `batch_size` chunks at a time.
+        With `incremental`, only new and changed files are embedded and deleted files are purged.
+        """
+        vectordb = self.get_vector_store(collection_name=collection_name)
+        if incremental:
+            summary = IncrementalIngestionManager().sync_directory(
+                vector_store=vectordb,
+                collection_name=collection_name,
+                directory=document_path,
+                load_chunks=lambda file_path: self.iter_file(file_path=file_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap),
+                batch_size=batch_size,
+                on_sources_changed=invalidate_cached_sources,
+            )
+            vectordb.persist()
+            return f"Vector store synced: {summary}"
+
+        documents = self.iter_directory(directory=document_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        for batch in self.iter_batches(documents, batch_size):
+            vectordb.add_documents(documents=batch)
+            # Re-ingested files may have changed, answers citing them are dropped
+            invalidate_cached_sources({document.metadata.get('source') for document in batch})
+        vectordb.persist()
         return "Vector store created"
 
     @error_logger.catch_api_exceptions
     async  def search_in_vector(self, input: str, top_k: int = 3, collection_name: str = 'langchain'):
         """Search for similar documents in the vector store based on a user question."""
-        vectordb = Chroma(persist_directory=self.vector_path, embedding_function=self.embedding, collection_name=collection_name)
-        search_response = vectordb.similarity_search(query=input, k=top_k)
+        vectordb = self.get_vector_store(collection_name=collection_name)
+        # Awaited, so concurrent searches can share one forward pass of the embedding model
+        query_vector = await self.embedding.aembed_query(input)
+        search_response = await vectordb.asimilarity_search_by_vector(embedding=query_vector, k=top_k)
         formatted_res = '\n'.join(doc.page_content for doc in search_response)
         return formatted_res
     
     @error_logger.catch_api_exceptions
     async def delete_collection_data(self, collection_name: str):
         """Delete the data for a specific collection from the vector store."""
-        vectordb = Chroma(persist_directory=self.vector_path, embedding_function=self.embedding,collection_name=collection_name)
+        vectordb = self.get_vector_store(collection_name=collection_name)
         vectordb.delete_collection()
+        # The cached store points at the deleted collection
+        self.registry.close(persist_directory=self.vector_path, collection_name=collection_name)
+        IncrementalIngestionManager().forget_collection(collection_name=collection_name)
+        clear_cached_responses()
         message = f"Collection '{collection_name}' has been deleted from the vector store."
         return message
\ No newline at end of file
@@ -1,25 +1,56 @@
-import os, requests, re
+import os, re, json
+import httpx
 from app.utils.utility_manager import UtilityManager
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from langchain.memory import ConversationBufferMemory
 from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
 from langchain.chains import ConversationChain, LLMChain
 from langchain.output_parsers import StructuredOutputParser
 from langchain.prompts import PromptTemplate
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun
+from langchain_core.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from pydantic import Field
 from app.enums.env_keys import EnvKeys
+from app.utils.http_client_registry import HTTPClientRegistry
+from app.langchain.streaming_chat_manager import StreamingChatManager
+from app.langchain.llm_response_cache import CachedLLMChainManager
 from dotenv import load_dotenv
 
-load_dotenv()
+HTTP_CLIENT_NAME = "local_llm"
+
+
+def _setting(key: str) -> str:
+    """Reads a setting when a LocalLLM is created, so importing this module needs neither .env nor the variables."""
+    load_dotenv()
+    return os.environ[key]
+
+
+def is_rate_limit_response(error: Exception) -> bool:
+    response = getattr(error, "response", None) if isinstance(error, httpx.HTTPStatusError) else None
+    return response is not None and response.status_code == 429
+
+
+def parse_stream_line(line: str) -> Optional[str]:
+    """Returns the text delta carried by one OpenAI-style server-sent event line, if any."""
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data or data == "[DONE]":
+        return None
+    choices = json.loads(data).get('choices')
+    if not choices:
+        # e.g. the usage-only chunk some servers send last
+        return None
+    return choices[0].get('delta', {}).get('content') or choices[0].get('text')
 
 
 class LocalLLM(LLM, UtilityManager):
     """A custom chat model that makes a request to an endpoint with a specified payload."""
     
-    LLM_ENDPOINT = os.environ['LOCAL_LLM_URL']
-    MAX_TOKENS = os.environ['LOCAL_LLM_MAX_TOKENS']
-    TEMPERATURE = os.environ['LOCAL_LLM_TEMPERATURE']
-    STREAM = os.environ['LOCAL_LLM_STEAM']
+    LLM_ENDPOINT: str = Field(default_factory=lambda: _setting('LOCAL_LLM_URL'))
+    MAX_TOKENS: str = Field(default_factory=lambda: _setting('LOCAL_LLM_MAX_TOKENS'))
+    TEMPERATURE: str = Field(default_factory=lambda: _setting('LOCAL_LLM_TEMPERATURE'))
+    STREAM: str = Field(default_factory=lambda: _setting('LOCAL_LLM_STEAM'))
     
  
 
@@ -32,25 +63,98 @@ class LocalLLM(LLM, UtilityManager):
 ) -> str:
         
         """Run the LLM on the given input by making a request to an endpoint."""
-        
-        payload = {
-            "messages": [
-                {"role": "system", "content": "you are helpful assistant."},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": self.TEMPERATURE,
-            "max_tokens": self.MAX_TOKENS,
-            "stream": self.STREAM,
-        }
+        if self.str_to_bool(self.STREAM):
+            return "".join(chunk.text for chunk in self._stream(prompt, stop, run_manager, **kwargs))
         try:
-            response = requests.post(self.LLM_ENDPOINT, json=payload)
+            response = HTTPClientRegistry.shared().get_client(HTTP_CLIENT_NAME).post(self.LLM_ENDPOINT, json=self._build_payload(prompt))
             response.raise_for_status()
             response_data = response.json()
             return response_data['choices'][0]['message']['content'].strip()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            if is_rate_limit_response(e):
+                # Raised, not returned as text, so callers such as DocumentProcessor can back off and retry
+                raise
             return f"Request failed: {e}"
         except (ValueError, KeyError) as e:
             return f"Error processing response: {e}"
+
+    async def _acall(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        """Same request as `_call`, sent through the shared async client so the event loop is never blocked."""
+        if self.str_to_bool(self.STREAM):
+            return "".join([chunk.text async for chunk in self._astream(prompt, stop, run_manager, **kwargs)])
+        try:
+            response = await HTTPClientRegistry.shared().get_async_client(HTTP_CLIENT_NAME).post(self.LLM_ENDPOINT, json=self._build_payload(prompt))
+            response.raise_for_status()
+            response_data = response.json()
+            return response_data['choices'][0]['message']['content'].strip()
+        except httpx.HTTPError as e:
+            if is_rate_limit_response(e):
+                # Raised, not returned as text, so callers such as DocumentProcessor can back off and retry
+                raise
+            return f"Request failed: {e}"
+        except (ValueError, KeyError) as e:
+            return f"Error processing response: {e}"
+
+    def _stream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[GenerationChunk]:
+        """Streams the completion token by token from the endpoint's server-sent events."""
+        try:
+            with HTTPClientRegistry.shared().get_client(HTTP_CLIENT_NAME).stream("POST", self.LLM_ENDPOINT, json=self._build_payload(prompt, stream=True)) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if text := parse_stream_line(line):
+                        chunk = GenerationChunk(text=text)
+                        if run_manager:
+                            run_manager.on_llm_new_token(text, chunk=chunk)
+                        yield chunk
+        except httpx.HTTPError as e:
+            yield GenerationChunk(text=f"Request failed: {e}")
+        except (ValueError, KeyError, IndexError) as e:
+            yield GenerationChunk(text=f"Error processing response: {e}")
+
+    async def _astream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[GenerationChunk]:
+        """Async version of `_stream`. Closing the iterator closes the upstream response."""
+        try:
+            async with HTTPClientRegistry.shared().get_async_client(HTTP_CLIENT_NAME).stream("POST", self.LLM_ENDPOINT, json=self._build_payload(prompt, stream=True)) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if text := parse_stream_line(line):
+                        chunk = GenerationChunk(text=text)
+                        if run_manager:
+                            await run_manager.on_llm_new_token(text, chunk=chunk)
+                        yield chunk
+        except httpx.HTTPError as e:
+            yield GenerationChunk(text=f"Request failed: {e}")
+        except (ValueError, KeyError, IndexError) as e:
+            yield GenerationChunk(text=f"Error processing response: {e}")
+
+    def _build_payload(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        return {
+            "messages": [
+                {"role": "system", "content": "you are helpful assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.TEMPERATURE,
+            "max_tokens": self.MAX_TOKENS,
+            "stream": stream,
+        }
         
     @property
     def _llm_type(self) -> str:
@@ -59,9 +163,10 @@ class LocalLLM(LLM, UtilityManager):
         return "custom"
 
 
-class LocalLLMManager(UtilityManager):
+class LocalLLMManager(UtilityManager, StreamingChatManager, CachedLLMChainManager):
     def __init__(self):
         super().__init__()
+        load_dotenv()
         
         self.TEMPERATURE = int(self.get_env_variable(EnvKeys.LOCAL_LLM_TEMPERATURE.value))
         self.MAX_TOKENS = int(self.get_env_variable(EnvKeys.LOCAL_LLM_MAX_TOKENS.value))
@@ -88,16 +193,48 @@ class LocalLLMManager(UtilityManager):
 
         return {"response": response}
 
+    async def arun_conversational_chain(self, prompt: str, output_parser: StructuredOutputParser = None) -> dict:
+        """
+        Async version of `run_conversational_chain`.
+        """
+        response = await self.conversation_chain.apredict(input=prompt)
+
+        if output_parser:
+            parsed_response = output_parser.parse(response)
+            return parsed_response
+
+        return {"response": response}
+
+    def response_cache_identity(self) -> tuple:
+        return ("local_llm", self.llm_model.LLM_ENDPOINT, self.TEMPERATURE)
+
     def run_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
         """
         This LLM chain without memory, Chats will be stored by default.
+        Temperature-0 completions are served from the shared LLMResponseCache.
+        """
+        llm_chain = LLMChain(
+            llm=self.llm_model,
+            prompt=prompt_template,
+        )
+
+        result = self.cached_completion(prompt_template, input_values, lambda: llm_chain.run(input_values))
+
+        if output_parser:
+            return output_parser.parse(result)
+
+        return {"response": result}
+
+    async def arun_llm_chain(self, prompt_template: PromptTemplate, output_parser: StructuredOutputParser = None, input_values: dict = {}) -> dict:
+        """
+        Async version of `run_llm_chain`.
         """
         llm_chain = LLMChain(
             llm=self.llm_model,
             prompt=prompt_template,
         )
 
-        result = llm_chain.run(input_values)
+        result = await self.acached_completion(prompt_template, input_values, lambda: llm_chain.arun(input_values))
 
         if output_parser:
             return output_parser.parse(result)
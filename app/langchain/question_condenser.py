@@ -0,0 +1,84 @@
+import re
+import threading
+import time
+from typing import Any, List, Tuple
+from langchain.chains import ConversationalRetrievalChain
+from app.enums.condense_mode import CondenseMode
+from app.langchain.conversation_memory_store import Turn
+
+# Words that only make sense with the previous turns in view
+FOLLOW_UP_WORDS = frozenset({
+    "it", "its", "they", "them", "their", "theirs", "this", "that", "these", "those",
+    "he", "him", "his", "she", "her", "hers", "there", "same", "above", "previous",
+    "former", "latter", "else", "again", "instead", "one", "ones",
+})
+FOLLOW_UP_OPENERS = ("and", "also", "but", "so", "then", "or", "what about", "how about", "why not", "more")
+MIN_STANDALONE_WORDS = 4
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+class QuestionCondenser:
+    """
+    Decides whether a question has to be rewritten into a standalone one before
+    retrieval, and keeps running averages of what a rewrite costs so that skipped
+    rewrites can be reported as time and tokens saved.
+
+    Without history the rewrite is always skipped. With history, `CondenseMode.ALWAYS`
+    rewrites every question, while `CondenseMode.HEURISTIC` only rewrites short
+    questions and ones that lean on the conversation ("what about it?", "and for contractors?").
+    """
+
+    def __init__(self, mode: CondenseMode = CondenseMode.ALWAYS, smoothing: float = 0.2):
+        self.mode = mode
+        self.smoothing = smoothing
+        self.__LOCK = threading.Lock()
+        self.__AVERAGE_SECONDS = 0.0
+        self.__AVERAGE_TOKENS = 0.0
+
+    def needs_condensing(self, question: str, turns: List[Turn]) -> bool:
+        if not turns:
+            return False
+        if self.mode == CondenseMode.ALWAYS:
+            return True
+        return self.is_follow_up(question)
+
+    @staticmethod
+    def is_follow_up(question: str) -> bool:
+        text = question.strip().lower()
+        words = WORD_PATTERN.findall(text)
+        if len(words) < MIN_STANDALONE_WORDS:
+            return True
+        if any(text.startswith(opener + " ") or text.startswith(opener + ",") for opener in FOLLOW_UP_OPENERS):
+            return True
+        return any(word in FOLLOW_UP_WORDS for word in words)
+
+    @staticmethod
+    def format_history(turns: List[Turn]) -> str:
+        """Same transcript format ConversationalRetrievalChain builds for its question generator."""
+        return "".join(f"\nHuman: {human}\nAssistant: {ai}" for human, ai in turns)
+
+    def condense(self, chain: ConversationalRetrievalChain, question: str, turns: List[Turn], cb: Any) -> str:
+        """Rewrites `question` with the chain's question generator, recording its latency and tokens on `cb`."""
+        start, tokens = time.perf_counter(), cb.total_tokens
+        result = chain.question_generator.invoke({"question": question, "chat_history": self.format_history(turns)})
+        self.record(time.perf_counter() - start, cb.total_tokens - tokens)
+        return result[chain.question_generator.output_key]
+
+    async def acondense(self, chain: ConversationalRetrievalChain, question: str, turns: List[Turn], cb: Any) -> str:
+        start, tokens = time.perf_counter(), cb.total_tokens
+        result = await chain.question_generator.ainvoke({"question": question, "chat_history": self.format_history(turns)})
+        self.record(time.perf_counter() - start, cb.total_tokens - tokens)
+        return result[chain.question_generator.output_key]
+
+    def record(self, seconds: float, tokens: int):
+        with self.__LOCK:
+            if not self.__AVERAGE_SECONDS:
+                self.__AVERAGE_SECONDS, self.__AVERAGE_TOKENS = seconds, float(tokens)
+            else:
+                self.__AVERAGE_SECONDS += self.smoothing * (seconds - self.__AVERAGE_SECONDS)
+                self.__AVERAGE_TOKENS += self.smoothing * (tokens - self.__AVERAGE_TOKENS)
+
+    def estimated_savings(self) -> Tuple[float, int]:
+        """Average (seconds, tokens) of a rewrite, i.e. what skipping one saves; zero until a rewrite was measured."""
+        with self.__LOCK:
+            return round(self.__AVERAGE_SECONDS, 4), round(self.__AVERAGE_TOKENS)
@@ -0,0 +1,155 @@
+import threading
+import time
+import weakref
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+class CachedResponse:
+    __slots__ = ("query", "scope", "answer", "documents", "sources", "total_tokens", "total_cost", "expires_at")
+
+    def __init__(self, query: str, scope: Hashable, answer: str, documents: List[Document], total_tokens: int, total_cost: float, expires_at: float):
+        self.query = query
+        self.scope = scope
+        self.answer = answer
+        self.documents = documents
+        self.sources: Set[str] = {doc.metadata.get('source') for doc in documents}
+        self.total_tokens = total_tokens
+        self.total_cost = total_cost
+        self.expires_at = expires_at
+
+
+_live_caches: "weakref.WeakSet[SemanticResponseCache]" = weakref.WeakSet()
+_live_caches_lock = threading.Lock()
+
+
+class SemanticResponseCache:
+    """
+    Answers keyed on the embedding of the standalone question.
+
+    A lookup returns the cached answer of the most similar earlier question when the
+    cosine similarity reaches `threshold`, the entry was stored under the same scope
+    (e.g. retrieval settings) and it has neither expired nor been invalidated because
+    one of its cited sources was re-ingested. At most `max_entries` answers are kept;
+    the oldest is overwritten first.
+    """
+
+    def __init__(self, embeddings: Embeddings, threshold: float = 0.95, ttl_seconds: Optional[float] = 3600, max_entries: int = 5000):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lookups = 0
+        self.hits = 0
+        self.tokens_saved = 0
+        self.cost_saved = 0.0
+        self.invalidations = 0
+        self.__LOCK = threading.Lock()
+        # Row i of the matrix is the normalized query vector of slot i; free slots are zero rows
+        self.__VECTORS: Optional[np.ndarray] = None
+        self.__ENTRIES: List[Optional[CachedResponse]] = []
+        self.__NEXT_SLOT = 0
+        with _live_caches_lock:
+            _live_caches.add(self)
+
+    def embed(self, query: str) -> np.ndarray:
+        return self.__normalize(self.embeddings.embed_query(query))
+
+    async def aembed(self, query: str) -> np.ndarray:
+        return self.__normalize(await self.embeddings.aembed_query(query))
+
+    def lookup(self, vector: np.ndarray, scope: Hashable = None) -> Optional[CachedResponse]:
+        with self.__LOCK:
+            self.lookups += 1
+            if self.__VECTORS is None:
+                return None
+            scores = self.__VECTORS[:len(self.__ENTRIES)] @ vector
+            candidates = np.flatnonzero(scores >= self.threshold)
+            now = time.monotonic()
+            for slot in candidates[np.argsort(-scores[candidates])]:
+                entry = self.__ENTRIES[slot]
+                if entry is None or entry.scope != scope:
+                    continue
+                if entry.expires_at < now:
+                    self.__free(slot)
+                    continue
+                self.hits += 1
+                self.tokens_saved += entry.total_tokens
+                self.cost_saved += entry.total_cost
+                return entry
+        return None
+
+    def store(self, vector: np.ndarray, query: str, answer: str, documents: List[Document], scope: Hashable = None, total_tokens: int = 0, total_cost: float = 0.0):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        entry = CachedResponse(query, scope, answer, documents, total_tokens, total_cost, expires_at)
+        with self.__LOCK:
+            if self.__VECTORS is None:
+                self.__VECTORS = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            slot = self.__NEXT_SLOT
+            self.__NEXT_SLOT = (slot + 1) % self.max_entries
+            if slot == len(self.__ENTRIES):
+                self.__ENTRIES.append(entry)
+            else:
+                self.__ENTRIES[slot] = entry
+            self.__VECTORS[slot] = vector
+
+    def invalidate_sources(self, sources: Iterable[str]) -> int:
+        """Drops every answer citing one of `sources`, e.g. after they were re-ingested. Returns the number dropped."""
+        sources = set(sources)
+        dropped = 0
+        with self.__LOCK:
+            for slot, entry in enumerate(self.__ENTRIES):
+                if entry is not None and entry.sources & sources:
+                    self.__free(slot)
+                    dropped += 1
+            self.invalidations += dropped
+        return dropped
+
+    def clear(self):
+        with self.__LOCK:
+            self.__VECTORS = None
+            self.__ENTRIES = []
+            self.__NEXT_SLOT = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self.__LOCK:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "tokens_saved": self.tokens_saved,
+                "cost_saved": round(self.cost_saved, 6),
+                "invalidations": self.invalidations,
+                "entries": sum(entry is not None for entry in self.__ENTRIES),
+            }
+
+    def __free(self, slot: int):
+        self.__ENTRIES[slot] = None
+        self.__VECTORS[slot] = 0.0
+
+    @staticmethod
+    def __normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+
+def invalidate_cached_sources(sources: Iterable[str]) -> int:
+    """
+    Drops the answers citing `sources` from every response cache of the process, so the
+    ingestion paths need no reference to the chatbots. Returns the number dropped.
+    """
+    sources = list(sources)
+    with _live_caches_lock:
+        caches = list(_live_caches)
+    return sum(cache.invalidate_sources(sources) for cache in caches)
+
+
+def clear_cached_responses():
+    """Empties every response cache of the process, e.g. after a whole collection was deleted."""
+    with _live_caches_lock:
+        caches = list(_live_caches)
+    for cache in caches:
+        cache.clear()
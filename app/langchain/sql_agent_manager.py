@@ -9,6 +9,7 @@ from langchain.prompts import PromptTemplate
 
 from app.utils.utility_manager import UtilityManager
 from app.enums.env_keys import EnvKeys
+from app.utils.http_client_registry import HTTPClientRegistry
 
 class SQLAgentManager(UtilityManager):
     def __init__(self):
@@ -29,7 +30,7 @@ class SQLAgentManager(UtilityManager):
             f"postgresql+psycopg2://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}",
         )
         
-        self.LLM = ChatOpenAI(model_name=self.OPENAI_MODEL, temperature=self.OPENAI_TEMPERATURE)
+        self.LLM = ChatOpenAI(model_name=self.OPENAI_MODEL, temperature=self.OPENAI_TEMPERATURE, http_client=HTTPClientRegistry.shared().get_client("openai"))
         
         # self.SQL_DB_TOOLKIT = SQLDatabaseChain.from_llm(llm=self.LLM, db=self.DB_CONNECTION, verbose=self.OPENAI_VERBOSE)
         self.SQL_DB_TOOLKIT = SQLDatabaseToolkit(db=self.DB_CONNECTION, llm=self.LLM)
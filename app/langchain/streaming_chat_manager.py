@@ -0,0 +1,42 @@
+from typing import Any, AsyncIterator
+from langchain.prompts import PromptTemplate
+
+
+class StreamingChatManager:
+    """
+    Token streaming for the LLM managers. Expects `llm_model`, `conversation_chain`
+    and `conversation_memory` on the class it is mixed into.
+
+    The chains are driven through LCEL `astream`, so every token goes through the
+    model's `on_llm_new_token` callbacks and is yielded as soon as it arrives.
+    Tokens are produced only as fast as the caller consumes them, and closing the
+    iterator (e.g. on client disconnect) closes the upstream request.
+    """
+
+    async def astream_llm_chain(self, prompt_template: PromptTemplate, input_values: dict = {}) -> AsyncIterator[str]:
+        """
+        Streams the answer of a chain without memory, token by token.
+        """
+        async for chunk in (prompt_template | self.llm_model).astream(input_values):
+            if text := self._chunk_text(chunk):
+                yield text
+
+    async def astream_conversational_chain(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Streams the answer of the conversation chain. The exchange is saved to the
+        conversation memory only once the full answer has been streamed.
+        """
+        chain = self.conversation_chain
+        inputs = chain.prep_inputs({chain.input_key: prompt})
+        tokens = []
+        async for chunk in (chain.prompt | self.llm_model).astream(inputs):
+            if text := self._chunk_text(chunk):
+                tokens.append(text)
+                yield text
+
+        self.conversation_memory.save_context({chain.input_key: prompt}, {chain.output_key: "".join(tokens)})
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        # LLMs stream plain strings, chat models stream message chunks
+        return chunk if isinstance(chunk, str) else chunk.content
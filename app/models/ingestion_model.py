@@ -0,0 +1,13 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from langchain_core.documents import Document
+
+
+class FileIngestionResult(BaseModel):
+    file_path: str
+    documents: List[Document] = Field(default_factory=list)
+    error: Optional[str] = Field(default=None)
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
@@ -1,6 +1,7 @@
 # app/routers/user_route.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from app.models.chat_model import ChatRequestModel
 from app.constants.route_paths import RoutePaths
 from app.constants.route_tags import RouteTags
@@ -17,5 +18,13 @@ class ChatRouter(ChatController):
         @self.catch_api_exceptions
         async def chat(chat_model: ChatRequestModel):
             return self.chat_with_llm(chat_model=chat_model)
+
+        @self.router.post(RoutePaths.CHAT_STREAM, tags=[RouteTags.CHAT])
+        async def stream_chat(chat_model: ChatRequestModel, request: Request):
+            return StreamingResponse(
+                self.stream_chat_with_llm(chat_model=chat_model, request=request),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
         
-    
\ No newline at end of file
+    
@@ -1,9 +1,12 @@
 import csv
 import re
-from typing import List
+from typing import Iterator, List
 import openpyxl
 import pdfplumber
 import xlrd
+from langchain_core.documents import Document
+
+EXCESS_NEW_LINES_PATTERN = re.compile(r'(\n\s*){3,}')
 
 class DocumentExtractor:
     def __init__(self, output_file: str = None) -> None:
@@ -30,47 +33,67 @@ class DocumentExtractor:
         return output_path
     
     def extract_csv_content(self, source_path: str, destination_path: str) -> None:
+        with open(destination_path, mode='w', encoding='utf-8') as txt_file:
+            txt_file.writelines(self.iter_csv_lines(source_path=source_path))
+
+    def iter_csv_lines(self, source_path: str) -> Iterator[str]:
         with open(source_path, mode='r', encoding='utf-8') as csv_file:
             csv_reader = csv.reader(csv_file)
-            with open(destination_path, mode='w', encoding='utf-8') as txt_file:
-                for row in csv_reader:
-                    txt_file.write(' '.join(row) + '\n')
+            for row in csv_reader:
+                yield ' '.join(row) + '\n'
                     
     def extract_excel_content(self, source_path: str, destination_path: str) -> None:
+        with open(destination_path, mode='w', encoding='utf-8') as txt_file:
+            txt_file.writelines(self.iter_excel_lines(source_path=source_path))
+
+    def iter_excel_lines(self, source_path: str) -> Iterator[str]:
         if source_path.endswith('.xlsx'):
-            workbook = openpyxl.load_workbook(source_path)
-            sheet = workbook.active
+            workbook = openpyxl.load_workbook(source_path, read_only=True)
+            # Also closed when the consumer stops early or fails, read-only workbooks keep the file open
+            try:
+                sheet = workbook.active
+                for row in sheet.iter_rows(values_only=True):
+                    yield ' '.join(str(cell) for cell in row) + '\n'
+            finally:
+                workbook.close()
         elif source_path.endswith('.xls'):
             workbook = xlrd.open_workbook(source_path)
-            sheet = workbook.sheet_by_index(0)
-        else:
-            raise ValueError("The provided file is not an Excel file")
-
-        with open(destination_path, mode='w', encoding='utf-8') as txt_file:
-            if source_path.endswith('.xlsx'):
-                for row in sheet.iter_rows(values_only=True):
-                    txt_file.write(' '.join(str(cell) for cell in row) + '\n')
-            elif source_path.endswith('.xls'):
+            try:
+                sheet = workbook.sheet_by_index(0)
                 for row_idx in range(sheet.nrows):
                     row = sheet.row(row_idx)
-                    txt_file.write(' '.join(str(cell.value) for cell in row) + '\n')
+                    yield ' '.join(str(cell.value) for cell in row) + '\n'
+            finally:
+                workbook.release_resources()
+        else:
+            raise ValueError("The provided file is not an Excel file")
                     
     def extract_pdf_content(self, source_path, destination_path):
-        content = ""
-
         # Open the PDF file using pdfplumber
         with pdfplumber.open(source_path) as pdf_document:
-            # Iterate through each page
-            for page in pdf_document.pages:
-                content += page.extract_text()
+            # Collect the page texts and join once instead of growing a string page by page
+            content = "".join(page.extract_text() or "" for page in pdf_document.pages)
 
         # Remove more than two consecutive new lines
-        cleaned_content = re.sub(r'(\n\s*){3,}', '\n\n', content)
+        cleaned_content = EXCESS_NEW_LINES_PATTERN.sub('\n\n', content)
 
         # Write the cleaned content to the destination file
         with open(destination_path, 'w', encoding='utf-8') as output_file:
             output_file.write(cleaned_content)
 
+    def iter_pdf_pages(self, source_path: str) -> Iterator[Document]:
+        """Yields one Document per non-empty PDF page with its 1-based `page_number`, without touching the disk."""
+        with pdfplumber.open(source_path) as pdf_document:
+            for page in pdf_document.pages:
+                text = page.extract_text()
+                if text:
+                    yield Document(
+                        page_content=EXCESS_NEW_LINES_PATTERN.sub('\n\n', text),
+                        metadata={'source': source_path, 'page_number': page.page_number},
+                    )
+                # Release the parsed layout of pages that were already extracted
+                page.flush_cache()
+
     def extract_text_by_header(self, pdf_file_path: str, headers: list, destination: str):
         content = {header: "" for header in headers}
 
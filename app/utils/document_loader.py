@@ -1,59 +1,196 @@
 import glob
+import logging
 import os
-from typing import List, Optional, Union
-from langchain.document_loaders.text import TextLoader
-from langchain_community.document_loaders.pdf import PyPDFLoader
-from langchain_community.document_loaders.csv_loader import CSVLoader
-from langchain_community.document_loaders.word_document import Docx2txtLoader
-from langchain_community.document_loaders.web_base import WebBaseLoader
-from langchain.document_loaders.html import UnstructuredHTMLLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_core.documents import Document
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Deque, Iterator, List, Optional, Tuple
 from app.enums.file_extensions import FileExtensions
 from app.utils.file_system import FileSystem
-from app.utils.document_extractor import DocumentExtractor
+
+# Every manager inherits DocumentLoader through UtilityManager, so LangChain, the loaders and
+# the extractors are imported on first use instead of when the app starts
+if TYPE_CHECKING:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from langchain_core.document_loaders import BaseLoader
+    from langchain_core.documents import Document
+    from app.models.ingestion_model import FileIngestionResult
+
+# Extraction of these formats is CPU bound (pdfplumber, openpyxl, xlrd) and is sent to the process pool
+CPU_BOUND_EXTENSIONS = (FileExtensions.PDF.value, FileExtensions.XLSX.value, FileExtensions.XLS.value)
+
+
+@lru_cache(maxsize=8)
+def _get_text_splitter(chunk_size: int, chunk_overlap: int) -> "RecursiveCharacterTextSplitter":
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _load_and_split_file(file_path: str, chunk_size: int, chunk_overlap: int, extract_to_file: bool = False) -> "FileIngestionResult":
+    """Loads and splits a single file. Kept at module level so it can be pickled into a process pool."""
+    from app.models.ingestion_model import FileIngestionResult
+    try:
+        texts = DocumentLoader.load_file(file_path=file_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                         extract_to_file=extract_to_file)
+        for chunk in texts:
+            chunk.metadata['source'] = file_path.replace("_extracted.txt", ".pdf")
+        return FileIngestionResult(file_path=file_path, documents=texts)
+    except Exception as e:
+        return FileIngestionResult(file_path=file_path, error=str(e))
+
 
 class DocumentLoader:
     @staticmethod
-    def load_directory(directory: str, chunk_size: int = 2000, chunk_overlap: int = 150) -> List[Document]:
-        all_documents = []
-        for file_path in glob.glob(os.path.join(directory, "*")):
-            loader = DocumentLoader.get_loader(file_path)
-            if loader:
-                documents = loader.load()
-                text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-                texts = text_splitter.split_documents(documents)
-                updated_texts: List[Document] = []
-                for chunk in texts:
-                    chunk.metadata['source'] = file_path.replace("_extracted.txt", ".pdf")
-                    updated_texts.append(chunk)
-                all_documents.extend(updated_texts)
-        return all_documents
+    def load_directory(
+        directory: str,
+        chunk_size: int = 2000,
+        chunk_overlap: int = 150,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        max_threads: Optional[int] = None,
+        extract_to_file: bool = False,
+    ) -> List["Document"]:
+        return list(DocumentLoader.iter_directory(
+            directory=directory,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            parallel=parallel,
+            max_workers=max_workers,
+            max_threads=max_threads,
+            extract_to_file=extract_to_file,
+        ))
 
     @staticmethod
-    def load_file(file_path: str, chunk_size: int = 2000, chunk_overlap: int = 150) -> List[Document]:
-        loader = DocumentLoader.get_loader(file_path)
-        if loader:
-            documents = loader.load()
-            text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-            texts = text_splitter.split_documents(documents)
-            return texts
-        else:
-            return []
+    def iter_directory(
+        directory: str,
+        chunk_size: int = 2000,
+        chunk_overlap: int = 150,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        max_threads: Optional[int] = None,
+        extract_to_file: bool = False,
+    ) -> Iterator["Document"]:
+        """
+        Yields the chunks of every file in a directory lazily, in sorted file path order.
+
+        Serially only the file being split is held in memory. With `parallel` the files are
+        loaded through `iter_directory_results` and failed files are logged and skipped.
+        """
+        if parallel:
+            for result in DocumentLoader.iter_directory_results(
+                directory=directory,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                max_workers=max_workers,
+                max_threads=max_threads,
+                extract_to_file=extract_to_file,
+            ):
+                if result.failed:
+                    logging.error(f"Failed to load {result.file_path}: {result.error}")
+                    continue
+                yield from result.documents
+            return
+
+        for file_path in sorted(glob.glob(os.path.join(directory, "*"))):
+            for chunk in DocumentLoader.iter_file(file_path=file_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                                  extract_to_file=extract_to_file):
+                chunk.metadata['source'] = file_path.replace("_extracted.txt", ".pdf")
+                yield chunk
 
     @staticmethod
-    def get_loader(file_path: str) -> Optional[Union[TextLoader, WebBaseLoader]]:
+    def iter_directory_results(
+        directory: str,
+        chunk_size: int = 2000,
+        chunk_overlap: int = 150,
+        max_workers: Optional[int] = None,
+        max_threads: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        extract_to_file: bool = False,
+    ) -> Iterator["FileIngestionResult"]:
+        """
+        Loads and splits every file of a directory in parallel and yields one result per file.
+
+        PDF and Excel files are extracted on a process pool of `max_workers`, all other loaders
+        run on a thread pool of `max_threads`. Results are yielded in sorted file path order and
+        at most `max_pending` files are in flight, so large directories are never submitted up front.
+        A file that fails is yielded with its `error` set instead of stopping the whole run.
+        """
+        file_paths = sorted(glob.glob(os.path.join(directory, "*")))
+        max_workers = max_workers or os.cpu_count() or 1
+        max_threads = max_threads or min(32, max_workers * 4)
+        max_pending = max_pending or (max_workers + max_threads) * 2
+
+        with ProcessPoolExecutor(max_workers=max_workers) as process_pool, \
+                ThreadPoolExecutor(max_workers=max_threads) as thread_pool:
+            pending: Deque[Tuple[str, Future]] = deque()
+            try:
+                for file_path in file_paths:
+                    pool = process_pool if DocumentLoader.is_cpu_bound(file_path) else thread_pool
+                    pending.append((file_path, pool.submit(_load_and_split_file, file_path, chunk_size, chunk_overlap, extract_to_file)))
+                    if len(pending) >= max_pending:
+                        yield DocumentLoader._collect_result(*pending.popleft())
+                while pending:
+                    yield DocumentLoader._collect_result(*pending.popleft())
+            finally:
+                # Consumer stopped early: do not wait for files nobody will read
+                for _, future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _collect_result(file_path: str, future: Future) -> "FileIngestionResult":
+        from app.models.ingestion_model import FileIngestionResult
+        try:
+            return future.result()
+        except Exception as e:
+            # Worker crashed (e.g. BrokenProcessPool) before it could report the error itself
+            return FileIngestionResult(file_path=file_path, error=str(e))
+
+    @staticmethod
+    def is_cpu_bound(file_path: str) -> bool:
+        return os.path.splitext(file_path)[1].lower() in CPU_BOUND_EXTENSIONS
+
+    @staticmethod
+    def load_file(file_path: str, chunk_size: int = 2000, chunk_overlap: int = 150, extract_to_file: bool = False) -> List["Document"]:
+        return list(DocumentLoader.iter_file(file_path=file_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                             extract_to_file=extract_to_file))
+
+    @staticmethod
+    def iter_file(file_path: str, chunk_size: int = 2000, chunk_overlap: int = 150, extract_to_file: bool = False) -> Iterator["Document"]:
+        """Yields the chunks of a single file, splitting each loaded document (e.g. PDF page) as it arrives."""
+        loader = DocumentLoader.get_loader(file_path, extract_to_file=extract_to_file)
+        if not loader:
+            return
+        text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
+        for document in loader.lazy_load():
+            yield from text_splitter.split_documents([document])
+
+    @staticmethod
+    def get_loader(file_path: str, extract_to_file: bool = False) -> Optional["BaseLoader"]:
+        """
+        Returns the loader for a file path or URL, or None for unsupported types.
+
+        PDF, CSV and Excel content is extracted in memory by default. With `extract_to_file`
+        it is written to a `*_extracted.txt` file next to the source and read back with TextLoader.
+        """
+        from langchain_community.document_loaders.text import TextLoader
+        from app.utils.document_extractor import DocumentExtractor
         cleaned_path = FileSystem().clean_path(path=file_path)
         if cleaned_path.startswith("http"):
+            from langchain_community.document_loaders.web_base import WebBaseLoader
             return WebBaseLoader(cleaned_path)
         else:
             file_extension = os.path.splitext(cleaned_path)[1].lower()
+            if file_extension in (FileExtensions.PDF.value, FileExtensions.CSV.value,
+                                  FileExtensions.XLSX.value, FileExtensions.XLS.value) and not extract_to_file:
+                from app.utils.extracted_content_loader import ExtractedContentLoader
+                return ExtractedContentLoader(cleaned_path)
             if file_extension == FileExtensions.PDF.value:
                 # Extract content from PDF and save to a temporary text file
                 temp_txt_path = cleaned_path.replace('.pdf', '_extracted.txt')
                 DocumentExtractor().extract_pdf_content(source_path=cleaned_path, destination_path=temp_txt_path)
                 return TextLoader(temp_txt_path, encoding='utf-8')
             elif file_extension == FileExtensions.DOCX.value:
+                from langchain_community.document_loaders.word_document import Docx2txtLoader
                 return Docx2txtLoader(cleaned_path)
             elif file_extension == FileExtensions.TXT.value:
                 return TextLoader(cleaned_path, encoding='utf-8')
@@ -68,6 +205,7 @@ class DocumentLoader:
                 DocumentExtractor().extract_excel_content(source_path=cleaned_path, destination_path=temp_txt_path)
                 return TextLoader(temp_txt_path, encoding='utf-8')
             elif file_extension == FileExtensions.HTML.value or file_extension == FileExtensions.HTM.value:
+                from langchain_community.document_loaders.html import UnstructuredHTMLLoader
                 return UnstructuredHTMLLoader(cleaned_path)
             else:
                 return None
@@ -0,0 +1,26 @@
+import os
+from typing import Iterator
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+from app.enums.file_extensions import FileExtensions
+from app.utils.document_extractor import DocumentExtractor
+
+class ExtractedContentLoader(BaseLoader):
+    """Loads PDF, CSV and Excel files straight into Documents through DocumentExtractor, without a temporary text file."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.extractor = DocumentExtractor()
+
+    def lazy_load(self) -> Iterator[Document]:
+        file_extension = os.path.splitext(self.file_path)[1].lower()
+        if file_extension == FileExtensions.PDF.value:
+            yield from self.extractor.iter_pdf_pages(source_path=self.file_path)
+        elif file_extension == FileExtensions.CSV.value:
+            content = "".join(self.extractor.iter_csv_lines(source_path=self.file_path))
+            yield Document(page_content=content, metadata={'source': self.file_path})
+        elif file_extension in (FileExtensions.XLSX.value, FileExtensions.XLS.value):
+            content = "".join(self.extractor.iter_excel_lines(source_path=self.file_path))
+            yield Document(page_content=content, metadata={'source': self.file_path})
+        else:
+            raise ValueError(f"Unsupported file type for extraction: {file_extension}")
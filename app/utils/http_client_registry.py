@@ -0,0 +1,262 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+import httpx
+from app.enums.env_keys import EnvKeys
+
+NEW_CONNECTION_EVENTS = ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete")
+TLS_HANDSHAKE_EVENT = "connection.start_tls.complete"
+
+
+class ConnectionStats:
+    """Request and handshake counters of one named client, shared by its sync and async variants."""
+
+    def __init__(self):
+        self.__LOCK = threading.Lock()
+        self.__COUNTERS: Dict[str, int] = defaultdict(int)
+
+    def increment(self, counter: str, amount: int = 1):
+        with self.__LOCK:
+            self.__COUNTERS[counter] += amount
+
+    def trace(self, event_name: str, info: dict):
+        if event_name in NEW_CONNECTION_EVENTS:
+            self.increment("connections_opened")
+        elif event_name == TLS_HANDSHAKE_EVENT:
+            self.increment("tls_handshakes")
+
+    async def atrace(self, event_name: str, info: dict):
+        self.trace(event_name, info)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self.__LOCK:
+            requests = self.__COUNTERS["requests"]
+            connections_opened = self.__COUNTERS["connections_opened"]
+            return {
+                "requests": requests,
+                "connections_opened": connections_opened,
+                "tls_handshakes": self.__COUNTERS["tls_handshakes"],
+                "reused_connections": max(0, requests - connections_opened),
+                "connection_reuse_ratio": round(1 - connections_opened / requests, 4) if requests else 0.0,
+                "in_flight": self.__COUNTERS["in_flight"],
+                "host_limit_waits": self.__COUNTERS["host_limit_waits"],
+            }
+
+
+class ReleasingByteStream(httpx.SyncByteStream):
+    """Keeps a per-host slot until the response body is closed, so streamed responses count as in flight."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]):
+        self.__STREAM = stream
+        self.__RELEASE = release
+
+    def __iter__(self):
+        yield from self.__STREAM
+
+    def close(self):
+        try:
+            self.__STREAM.close()
+        finally:
+            self.__RELEASE()
+
+
+class AsyncReleasingByteStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self.__STREAM = stream
+        self.__RELEASE = release
+
+    async def __aiter__(self):
+        async for chunk in self.__STREAM:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.__STREAM.aclose()
+        finally:
+            self.__RELEASE()
+
+
+class TrackedTransport(httpx.HTTPTransport):
+    def __init__(self, stats: ConnectionStats, max_connections_per_host: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.__STATS = stats
+        self.__MAX_PER_HOST = max_connections_per_host
+        self.__HOST_SLOTS: Dict[str, threading.BoundedSemaphore] = {}
+        self.__LOCK = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = self.__STATS.trace
+        slot = self.__acquire_host_slot(request.url.host)
+        self.__STATS.increment("requests")
+        self.__STATS.increment("in_flight")
+        released = threading.Event()
+
+        def release():
+            if not released.is_set():
+                released.set()
+                self.__STATS.increment("in_flight", -1)
+                if slot:
+                    slot.release()
+
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = ReleasingByteStream(response.stream, release)
+        return response
+
+    def __acquire_host_slot(self, host: str) -> Optional[threading.BoundedSemaphore]:
+        if not self.__MAX_PER_HOST:
+            return None
+        with self.__LOCK:
+            slot = self.__HOST_SLOTS.setdefault(host, threading.BoundedSemaphore(self.__MAX_PER_HOST))
+        if not slot.acquire(blocking=False):
+            self.__STATS.increment("host_limit_waits")
+            slot.acquire()
+        return slot
+
+
+class AsyncTrackedTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, stats: ConnectionStats, max_connections_per_host: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.__STATS = stats
+        self.__MAX_PER_HOST = max_connections_per_host
+        self.__HOST_SLOTS: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = self.__STATS.atrace
+        slot = await self.__acquire_host_slot(request.url.host)
+        self.__STATS.increment("requests")
+        self.__STATS.increment("in_flight")
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.__STATS.increment("in_flight", -1)
+                if slot:
+                    slot.release()
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = AsyncReleasingByteStream(response.stream, release)
+        return response
+
+    async def __acquire_host_slot(self, host: str) -> Optional[asyncio.Semaphore]:
+        if not self.__MAX_PER_HOST:
+            return None
+        slot = self.__HOST_SLOTS.setdefault(host, asyncio.Semaphore(self.__MAX_PER_HOST))
+        if slot.locked():
+            self.__STATS.increment("host_limit_waits")
+        await slot.acquire()
+        return slot
+
+
+class HTTPClientRegistry:
+    """
+    Keep-alive HTTP clients shared by every LLM and embedding backend.
+
+    Clients are created once per name (e.g. "openai", "groq", "local_llm") and reused
+    for the lifetime of the process; async clients are created once per name and
+    event loop. All clients of a registry share the same pool limits, timeouts and
+    per-host concurrency cap, and report connection reuse through `stats()`.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 120.0,
+        connect_timeout: float = 10.0,
+        max_connections_per_host: Optional[int] = None,
+        http2: bool = True,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logging.warning("The h2 package is not installed, shared HTTP clients fall back to HTTP/1.1")
+
+        self.__LOCK = threading.Lock()
+        self.__CLIENTS: Dict[str, httpx.Client] = {}
+        self.__ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+        self.__STATS: Dict[str, ConnectionStats] = defaultdict(ConnectionStats)
+
+    @classmethod
+    def shared(cls) -> "HTTPClientRegistry":
+        """Process wide registry, configured from the optional HTTP_* environment variables."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls.from_env()
+        return cls._instance
+
+    @classmethod
+    def from_env(cls) -> "HTTPClientRegistry":
+        per_host = os.getenv(EnvKeys.HTTP_MAX_CONNECTIONS_PER_HOST.value)
+        return cls(
+            max_connections=int(os.getenv(EnvKeys.HTTP_MAX_CONNECTIONS.value, 100)),
+            max_keepalive_connections=int(os.getenv(EnvKeys.HTTP_MAX_KEEPALIVE_CONNECTIONS.value, 20)),
+            timeout=float(os.getenv(EnvKeys.HTTP_TIMEOUT.value, 120.0)),
+            connect_timeout=float(os.getenv(EnvKeys.HTTP_CONNECT_TIMEOUT.value, 10.0)),
+            max_connections_per_host=int(per_host) if per_host else None,
+            http2=os.getenv(EnvKeys.HTTP_HTTP2.value, "true").lower() in ("true", "1", "yes"),
+        )
+
+    def get_client(self, name: str = "default") -> httpx.Client:
+        with self.__LOCK:
+            client = self.__CLIENTS.get(name)
+            if client is None or client.is_closed:
+                transport = TrackedTransport(
+                    self.__STATS[name],
+                    max_connections_per_host=self.max_connections_per_host,
+                    limits=self.limits,
+                    http2=self.http2,
+                )
+                client = self.__CLIENTS[name] = httpx.Client(transport=transport, timeout=self.timeout)
+            return client
+
+    def get_async_client(self, name: str = "default") -> httpx.AsyncClient:
+        """Returns the async client of `name` for the running event loop; async connections cannot move between loops."""
+        loop = asyncio.get_running_loop()
+        with self.__LOCK:
+            clients = self.__ASYNC_CLIENTS.setdefault(loop, {})
+            client = clients.get(name)
+            if client is None or client.is_closed:
+                transport = AsyncTrackedTransport(
+                    self.__STATS[name],
+                    max_connections_per_host=self.max_connections_per_host,
+                    limits=self.limits,
+                    http2=self.http2,
+                )
+                client = clients[name] = httpx.AsyncClient(transport=transport, timeout=self.timeout)
+            return client
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Connection reuse counters per client name."""
+        with self.__LOCK:
+            return {name: stats.snapshot() for name, stats in self.__STATS.items()}
+
+    def close(self):
+        """Closes the sync clients; async clients are closed with their event loop."""
+        with self.__LOCK:
+            for client in self.__CLIENTS.values():
+                client.close()
+            self.__CLIENTS.clear()
@@ -0,0 +1,9 @@
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
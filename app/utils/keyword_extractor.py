@@ -0,0 +1,108 @@
+import math
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from app.enums.env_keys import EnvKeys
+from app.enums.keyword_ranking import KeywordRanking
+
+KEYWORD_POS = ('NOUN', 'PROPN', 'ADJ')
+# Part-of-speech tags only need tok2vec, tagger and attribute_ruler
+UNUSED_COMPONENTS = ['parser', 'ner', 'lemmatizer', 'senter']
+
+
+class KeywordExtractor:
+    """
+    Ranked noun, proper noun and adjective keywords of many texts at once with spaCy.
+
+    The pipeline is loaded on first use without the components keyword extraction does
+    not need, and texts go through `nlp.pipe` in batches of `batch_size`, on `n_process`
+    processes. Candidates are alphabetic, non stop word tokens, counted case-insensitively.
+    They are ranked by TF-IDF over the texts of one `extract` call, so terms that every
+    text of the batch shares rank below the ones that set a text apart, or by frequency.
+    """
+
+    def __init__(
+        self,
+        model: str = 'en_core_web_sm',
+        max_keywords: int = 10,
+        ranking: str = KeywordRanking.TFIDF.value,
+        batch_size: int = 256,
+        n_process: int = 1,
+        nlp: Any = None,
+    ):
+        self.model = model
+        self.max_keywords = max_keywords
+        self.ranking = KeywordRanking(ranking)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.nlp = nlp
+        self.__LOCK = threading.Lock()
+
+    @classmethod
+    def from_env(cls, model: str = 'en_core_web_sm') -> "KeywordExtractor":
+        """Extractor configured from the optional KEYWORD_EXTRACTION_* environment variables."""
+        return cls(
+            model=model,
+            ranking=os.getenv(EnvKeys.KEYWORD_EXTRACTION_RANKING.value) or KeywordRanking.TFIDF.value,
+            batch_size=int(os.getenv(EnvKeys.KEYWORD_EXTRACTION_BATCH_SIZE.value) or 256),
+            n_process=int(os.getenv(EnvKeys.KEYWORD_EXTRACTION_PROCESSES.value) or 1),
+        )
+
+    def load(self):
+        with self.__LOCK:
+            if self.nlp is None:
+                # spaCy is an optional dependency, only needed when keywords are extracted
+                import spacy
+                self.nlp = spacy.load(self.model, exclude=UNUSED_COMPONENTS)
+
+    def extract(self, texts: List[str]) -> List[List[str]]:
+        """Keywords of every text, best ranked first."""
+        if not texts:
+            return []
+        self.load()
+        # A pipeline passed in whole still skips the components that are not needed
+        disabled = [name for name in UNUSED_COMPONENTS if name in self.nlp.pipe_names]
+        counts: List[Counter] = []
+        surface_forms: List[Dict[str, str]] = []
+        for doc in self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process, disable=disabled):
+            doc_counts: Counter = Counter()
+            forms: Dict[str, str] = {}
+            for token in doc:
+                if token.pos_ in KEYWORD_POS and token.is_alpha and not token.is_stop and len(token) > 1:
+                    doc_counts[token.lower_] += 1
+                    forms.setdefault(token.lower_, token.text)
+            counts.append(doc_counts)
+            surface_forms.append(forms)
+
+        idf = self.__idf(counts) if self.ranking == KeywordRanking.TFIDF else None
+        keywords = []
+        for doc_counts, forms in zip(counts, surface_forms):
+            # Counters keep first-seen order, so ties stay in document order
+            ranked = sorted(doc_counts, key=lambda term: doc_counts[term] * (idf[term] if idf else 1.0), reverse=True)
+            keywords.append([forms[term] for term in ranked[:self.max_keywords]])
+        return keywords
+
+    def extract_one(self, text: str) -> List[str]:
+        return self.extract([text])[0]
+
+    @staticmethod
+    def __idf(counts: List[Counter]) -> Dict[str, float]:
+        document_frequency: Counter = Counter()
+        for doc_counts in counts:
+            document_frequency.update(doc_counts.keys())
+        # Smoothed, so a term found in every text still counts
+        return {term: math.log((1 + len(counts)) / (1 + frequency)) + 1 for term, frequency in document_frequency.items()}
+
+
+_shared_extractor: Optional[KeywordExtractor] = None
+_shared_extractor_lock = threading.Lock()
+
+
+def get_keyword_extractor() -> KeywordExtractor:
+    """Process wide extractor, so the spaCy pipeline is loaded once."""
+    global _shared_extractor
+    with _shared_extractor_lock:
+        if _shared_extractor is None:
+            _shared_extractor = KeywordExtractor.from_env()
+        return _shared_extractor
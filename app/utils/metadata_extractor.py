@@ -1,13 +1,21 @@
 import os
 import json
-from typing import List, Dict, Any
+import asyncio
+import hashlib
+import random
+from typing import List, Dict, Any, Optional, Tuple
 from langchain.document_loaders import PyPDFLoader, UnstructuredWordDocumentLoader
-from langchain.text_splitter import CharacterTextSplitter
 from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 import tiktoken
-from app.llm.langchain_openai_manager import OpenAIManager
+from app.utils.rate_limiter import AdaptiveConcurrencyLimit, AsyncRateLimiter
+from app.utils.token_chunker import TextChunk, TokenChunker
+
+# Leaves room for the extraction prompt and its answer in the 16k context of gpt-3.5-turbo
+MAX_CHUNK_TOKENS = 12000
+CHUNK_OVERLAP_TOKENS = 250
+MAX_BACKOFF_SECONDS = 60
 
 class DocumentMetadata(BaseModel):
     entities: List[Dict[str, str]] = Field(description="List of named entities and their types")
@@ -18,10 +26,33 @@ class DocumentMetadata(BaseModel):
     page_numbers: List[int] = Field(description="Page numbers this chunk corresponds to")
 
 class DocumentProcessor:
-    def __init__(self, output_dir: str = "output"):
-        self.openai_manager = OpenAIManager()
+    def __init__(
+        self,
+        output_dir: str = "output",
+        llm_manager: Any = None,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 5,
+        max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+    ):
+        """
+        Extracts metadata from documents chunk by chunk. Up to `max_concurrency` chunks are
+        sent to the LLM at once, within the optional per-minute request and token budgets.
+        Rate-limited calls lower the concurrency and are retried with exponential backoff.
+        Chunks are packed by token count, up to `max_chunk_tokens` each.
+        """
+        if llm_manager is None:
+            # langchain-openai is an optional dependency, only needed for the default manager
+            from app.langchain.langchain_openai_manager import OpenAIManager
+            llm_manager = OpenAIManager()
+        self.openai_manager = llm_manager
         self.output_dir = output_dir
-        self.encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.max_chunk_tokens = max_chunk_tokens
+        self.rate_limiter = AsyncRateLimiter(requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+        self.__ENCODING = None
         
         # Initialize processing components
         self.setup_components()
@@ -29,6 +60,13 @@ class DocumentProcessor:
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
 
+    @property
+    def encoding(self):
+        # Loading the BPE ranks is slow, only pay for it once tokens are counted
+        if self.__ENCODING is None:
+            self.__ENCODING = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        return self.__ENCODING
+
     def setup_components(self):
         """Initialize processing components"""
         self.parser = PydanticOutputParser(pydantic_object=DocumentMetadata)
@@ -70,6 +108,11 @@ class DocumentProcessor:
         pages = loader.load()
         return pages
 
+    def split_chunks(self, pages: List[Any]) -> List[TextChunk]:
+        """Pack the pages into chunks of at most max_chunk_tokens tokens, with the pages each chunk covers"""
+        chunker = TokenChunker(self.encoding, max_tokens=self.max_chunk_tokens, overlap_tokens=CHUNK_OVERLAP_TOKENS)
+        return chunker.split_pages([page.page_content for page in pages])
+
     def save_results(self, results: List[Dict], file_path: str):
         """Save results to a JSON file"""
         filename = os.path.join(self.output_dir, f"{os.path.basename(file_path)}_results.json")
@@ -77,46 +120,115 @@ class DocumentProcessor:
         with open(filename, 'w') as f:
             json.dump(results, f, indent=2)
 
+    def checkpoint_path(self, file_path: str) -> str:
+        return os.path.join(self.output_dir, f"{os.path.basename(file_path)}_checkpoint.jsonl")
+
+    def load_checkpoint(self, checkpoint_path: str) -> Dict[str, Dict]:
+        """Results of chunks finished by an earlier, interrupted run, keyed by chunk hash"""
+        finished = {}
+        if not os.path.exists(checkpoint_path):
+            return finished
+        with open(checkpoint_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    finished[entry["chunk_hash"]] = entry["result"]
+                except (ValueError, KeyError):
+                    # A run killed mid-write leaves a partial last line
+                    continue
+        return finished
+
+    @staticmethod
+    def is_rate_limited(error: Exception) -> bool:
+        """True for HTTP 429 errors of the OpenAI SDK or of httpx (the local LLM), never from the error text alone."""
+        try:
+            import openai
+            if isinstance(error, openai.RateLimitError):
+                return True
+        except ImportError:
+            pass
+        response = getattr(error, "response", None)
+        return getattr(error, "status_code", None) == 429 or getattr(response, "status_code", None) == 429
+
     def process_document(self, file_path: str) -> str:
-        """Process a document and extract metadata"""
-        pages = self.load_document(file_path)
-        all_results = []
+        """Process a document and extract metadata. Async callers, e.g. FastAPI async routes, use `aprocess_document`."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aprocess_document(file_path))
+        raise RuntimeError("process_document cannot run inside an event loop, await aprocess_document instead")
 
-        # Combine text from all pages into a single string for processing
-        combined_text = "\n\n".join(page.page_content for page in pages)
+    async def aprocess_document(self, file_path: str, resume: bool = True) -> str:
+        """
+        Process a document and extract metadata, with the chunks processed concurrently.
 
-        # Split the combined text into chunks of max 40,000 characters
-        text_splitter = CharacterTextSplitter(
-            chunk_size=40000,  # Maximum chunk size
-            chunk_overlap=1000  # Overlap between chunks
-        )
-        chunks = text_splitter.split_text(combined_text)
-        
-        for chunk in chunks:
-            # Check token count
-            if self.count_tokens(chunk) > 12000:  # Limit for processing
-                print(f"Warning: Chunk too large ({self.count_tokens(chunk)} tokens), skipping")
-                continue
-            
-            try:
-                # Process the chunk using OpenAIManager
-                result = self.openai_manager.run_llm_chain(
-                    prompt_template=self.prompt_template,
-                    output_parser=self.parser,
-                    input_values={"text": chunk}
-                )
-                
-                # Add corresponding page numbers
-                # Assuming chunk starts from the first page, we need to adjust based on the actual range of pages
-                page_numbers = list(range(1, len(pages) + 1))
-                result_dict = result.dict() if hasattr(result, 'dict') else result
-                result_dict['page_numbers'] = page_numbers  # Adjust if needed
-                all_results.append(result_dict)
+        Every finished chunk is appended to a checkpoint file, so a run that is interrupted or
+        had failed chunks resumes with the chunks that are still missing. Results keep the chunk order.
+        """
+        pages = self.load_document(file_path)
+        chunks = self.split_chunks(pages)
+        checkpoint_path = self.checkpoint_path(file_path)
+        if not resume and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        all_results, failed = await self.aprocess_chunks(chunks, checkpoint_path=checkpoint_path)
 
-            except Exception as e:
-                print(f"Error processing chunk: {str(e)}")
-                continue
-        
         # Save all results to a single JSON file
         self.save_results(all_results, file_path)
+        if not failed:
+            os.remove(checkpoint_path)
         return os.path.join(self.output_dir, f"{os.path.basename(file_path)}_results.json")
+
+    async def aprocess_chunks(self, chunks: List[TextChunk], checkpoint_path: str) -> Tuple[List[Dict], int]:
+        """Returns the results in chunk order and the number of chunks that failed."""
+        finished = self.load_checkpoint(checkpoint_path)
+        concurrency = AdaptiveConcurrencyLimit(self.max_concurrency)
+        results: List[Optional[Dict]] = [None] * len(chunks)
+        failed = 0
+
+        with open(checkpoint_path, 'a') as checkpoint:
+            async def process_chunk(index: int, chunk: TextChunk):
+                nonlocal failed
+                chunk_hash = hashlib.sha256(chunk.text.encode("utf-8")).hexdigest()
+                if chunk_hash in finished:
+                    results[index] = finished[chunk_hash]
+                    return
+
+                try:
+                    result = await self.__extract(chunk.text, chunk.token_count, concurrency)
+                except Exception as e:
+                    failed += 1
+                    print(f"Error processing chunk: {str(e)}")
+                    return
+
+                # Add corresponding page numbers
+                result_dict = result.dict() if hasattr(result, 'dict') else result
+                result_dict['page_numbers'] = chunk.page_numbers
+                results[index] = result_dict
+                checkpoint.write(json.dumps({"chunk_hash": chunk_hash, "result": result_dict}) + "\n")
+                checkpoint.flush()
+
+            await asyncio.gather(*(process_chunk(index, chunk) for index, chunk in enumerate(chunks)))
+
+        return [result for result in results if result is not None], failed
+
+    async def __extract(self, chunk: str, token_count: int, concurrency: AdaptiveConcurrencyLimit) -> Any:
+        for attempt in range(self.max_retries + 1):
+            async with concurrency:
+                await self.rate_limiter.acquire(tokens=token_count)
+                try:
+                    result = await self.openai_manager.arun_llm_chain(
+                        prompt_template=self.prompt_template,
+                        output_parser=self.parser,
+                        input_values={"text": chunk}
+                    )
+                    concurrency.on_success()
+                    return result
+                except Exception as e:
+                    if attempt == self.max_retries or not self.is_rate_limited(e):
+                        raise
+                    concurrency.on_rate_limited()
+                    # Back off every worker, not just this one, with jitter so they do not return in lockstep
+                    delay = min(MAX_BACKOFF_SECONDS, 2 ** attempt) * random.uniform(0.5, 1.0)
+                    print(f"Rate limited, retrying chunk in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries}, concurrency {concurrency.limit})")
+                    self.rate_limiter.pause(delay)
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budgets shared by concurrent coroutines.
+
+    Both budgets are token buckets that refill continuously, so a burst of up to one
+    minute's budget goes out at once and the rest is spread evenly. `pause` holds every
+    caller back, e.g. for the Retry-After of a 429 response.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.__REQUESTS = float(requests_per_minute or 0)
+        self.__TOKENS = float(tokens_per_minute or 0)
+        self.__UPDATED_AT = time.monotonic()
+        self.__RESUME_AT = 0.0
+        self.__LOCK: Optional[asyncio.Lock] = None
+
+    async def acquire(self, tokens: int = 0):
+        if self.__LOCK is None:
+            self.__LOCK = asyncio.Lock()
+        while True:
+            async with self.__LOCK:
+                wait = self.__reserve(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        self.__RESUME_AT = max(self.__RESUME_AT, time.monotonic() + seconds)
+
+    def __reserve(self, tokens: int) -> float:
+        now = time.monotonic()
+        elapsed, self.__UPDATED_AT = now - self.__UPDATED_AT, now
+        if self.requests_per_minute:
+            self.__REQUESTS = min(self.requests_per_minute, self.__REQUESTS + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self.__TOKENS = min(self.tokens_per_minute, self.__TOKENS + elapsed * self.tokens_per_minute / 60)
+            # A request larger than the whole budget only waits for a full bucket
+            tokens = min(tokens, self.tokens_per_minute)
+
+        wait = self.__RESUME_AT - now
+        if self.requests_per_minute:
+            wait = max(wait, (1 - self.__REQUESTS) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            wait = max(wait, (tokens - self.__TOKENS) * 60 / self.tokens_per_minute)
+        if wait > 0:
+            return wait
+
+        if self.requests_per_minute:
+            self.__REQUESTS -= 1
+        if self.tokens_per_minute:
+            self.__TOKENS -= tokens
+        return 0.0
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Concurrency limit that adapts to rate limiting (additive increase, multiplicative decrease).
+
+    A rate-limited call halves the limit, down to `min_concurrency`; the calls rejected in
+    the same burst (within `cooldown_seconds`) count once. Every `limit` successful calls in
+    a row raise it by one again, up to `max_concurrency`. Callers hold a slot with
+    `async with limit:`.
+    """
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1, cooldown_seconds: float = 1.0):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.cooldown_seconds = cooldown_seconds
+        self.limit = max_concurrency
+        self.in_flight = 0
+        self.__SUCCESSES = 0
+        self.__DECREASED_AT = float("-inf")
+        self.__CONDITION: Optional[asyncio.Condition] = None
+
+    async def __aenter__(self):
+        if self.__CONDITION is None:
+            self.__CONDITION = asyncio.Condition()
+        async with self.__CONDITION:
+            await self.__CONDITION.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        async with self.__CONDITION:
+            self.in_flight -= 1
+            self.__CONDITION.notify_all()
+
+    def on_success(self):
+        self.__SUCCESSES += 1
+        if self.__SUCCESSES >= self.limit and self.limit < self.max_concurrency:
+            self.limit += 1
+            self.__SUCCESSES = 0
+
+    def on_rate_limited(self):
+        self.__SUCCESSES = 0
+        now = time.monotonic()
+        if now - self.__DECREASED_AT >= self.cooldown_seconds:
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            self.__DECREASED_AT = now
@@ -0,0 +1,70 @@
+from typing import Any, List
+
+
+class TextChunk:
+    __slots__ = ("text", "token_count", "page_numbers")
+
+    def __init__(self, text: str, token_count: int, page_numbers: List[int]):
+        self.text = text
+        self.token_count = token_count
+        self.page_numbers = page_numbers
+
+
+class TokenChunker:
+    """
+    Packs consecutive pages into chunks of at most `max_tokens` tokens, never dropping text.
+
+    Every page is encoded once. Pages are packed whole while they fit; a page larger than
+    the budget on its own is cut into token windows that overlap by `overlap_tokens`.
+    Each chunk records its token count and the (1-based) page numbers it covers.
+    """
+
+    def __init__(self, encoding: Any, max_tokens: int, overlap_tokens: int = 0, separator: str = "\n\n"):
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be smaller than max_tokens")
+        self.encoding = encoding
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.separator = separator
+        self.separator_tokens = len(encoding.encode(separator))
+
+    def split_pages(self, pages: List[str]) -> List[TextChunk]:
+        chunks: List[TextChunk] = []
+        texts: List[str] = []
+        page_numbers: List[int] = []
+        token_count = 0
+
+        def flush():
+            nonlocal token_count
+            if texts:
+                chunks.append(TextChunk(self.separator.join(texts), token_count, page_numbers[:]))
+                texts.clear()
+                page_numbers.clear()
+                token_count = 0
+
+        for page_number, text in enumerate(pages, start=1):
+            tokens = self.encoding.encode(text)
+            if not tokens:
+                continue
+            needed = len(tokens) + (self.separator_tokens if texts else 0)
+            if token_count + needed > self.max_tokens:
+                flush()
+                needed = len(tokens)
+            if needed > self.max_tokens:
+                chunks.extend(TextChunk(self.encoding.decode(window), len(window), [page_number]) for window in self.__windows(tokens))
+                continue
+            texts.append(text)
+            page_numbers.append(page_number)
+            # BPE merges across the separator can only lower the real count, so the sum is an upper bound
+            token_count += needed
+        flush()
+        return chunks
+
+    def __windows(self, tokens: List[int]) -> List[List[int]]:
+        step = self.max_tokens - self.overlap_tokens
+        windows = []
+        for start in range(0, len(tokens), step):
+            windows.append(tokens[start:start + self.max_tokens])
+            if start + self.max_tokens >= len(tokens):
+                break
+        return windows
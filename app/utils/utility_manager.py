@@ -1,11 +1,12 @@
 import hashlib
 import logging
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 from app.enums.env_keys import EnvKeys
 from app.utils.file_system import FileSystem
 from app.utils.generate_uuid import generate_uuid
 from app.utils.extract_data import extract_data
 from app.utils.data_mapper import data_mapper
+from app.utils.iter_batches import iter_batches
 from app.utils.get_current_timestamp import calculate_response_time, get_current_timestamp_str
 from app.utils.env_manager import EnvManager
 from app.utils.document_loader import DocumentLoader
@@ -26,6 +27,9 @@ class UtilityManager(FileSystem, EnvManager, DocumentLoader,CatchAPIException):
     
     def get_current_timestamp_str(self):
         return get_current_timestamp_str()
+
+    def iter_batches(self, items: Iterable, batch_size: int) -> Iterator[List]:
+        return iter_batches(items=items, batch_size=batch_size)
     
     def str_to_bool(self, value:str):
         if value.lower() in ('true', '1', 'yes'):
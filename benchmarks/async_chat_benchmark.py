@@ -0,0 +1,86 @@
+"""
+Requests/s of concurrent chats driven from one event loop, the way FastAPI's
+`async def` routes call the managers.
+
+"sync" awaits nothing: every chat blocks the loop on `run_llm_chain` / `chat`, so
+the concurrent chats run one after another. "async" gathers `arun_llm_chain` /
+`achat`. Both talk to a local fake LLM server with `--latency` seconds per
+completion. Run from the project root:
+
+    python -m benchmarks.async_chat_benchmark --concurrency 100 --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import time
+from benchmarks.fake_servers import FakeOpenAIServer
+
+
+def configure_local_llm(base_url: str):
+    # LocalLLM reads its settings at import time
+    os.environ["LOCAL_LLM_URL"] = f"{base_url}/chat/completions"
+    os.environ["LOCAL_LLM_TEMPERATURE"] = "0"
+    os.environ["LOCAL_LLM_MAX_TOKENS"] = "256"
+    os.environ["LOCAL_LLM_STEAM"] = "false"
+    os.environ["LOCAL_LLM_STREAM"] = "false"
+    os.environ["LOCAL_LLM_VERBOSE"] = "false"
+
+
+def build_chatbot(llm):
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from langchain_core.vectorstores import InMemoryVectorStore
+    from app.langchain.conversational_rag_chatbot import ConversationalRAGChatbot
+
+    vectorstore = InMemoryVectorStore(embedding=DeterministicFakeEmbedding(size=64))
+    vectorstore.add_documents([
+        Document(page_content=f"Policy section {index}: employees accrue leave monthly.", metadata={"source": f"policy_{index}.pdf"})
+        for index in range(50)
+    ])
+    return ConversationalRAGChatbot(llm=llm, vectorstore=vectorstore)
+
+
+async def run(label: str, concurrency: int, make_call):
+    start = time.perf_counter()
+    await asyncio.gather(*(make_call(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22}{elapsed:>10.2f}s{concurrency / elapsed:>14.1f}")
+
+
+async def main(concurrency: int):
+    from langchain.prompts import PromptTemplate
+    from app.langchain.local_llm_manager import LocalLLMManager
+
+    manager = LocalLLMManager()
+    prompt = PromptTemplate.from_template("Summarise the leave policy for employee {employee}.")
+    chatbot = build_chatbot(manager.llm_model)
+
+    async def sync_llm_chain(index: int):
+        return manager.run_llm_chain(prompt, input_values={"employee": index})
+
+    async def async_llm_chain(index: int):
+        return await manager.arun_llm_chain(prompt, input_values={"employee": index})
+
+    async def sync_chat(index: int):
+        return chatbot.chat(query="How is leave accrued?", user_id=f"sync-{index}")
+
+    async def async_chat(index: int):
+        return await chatbot.achat(query="How is leave accrued?", user_id=f"async-{index}")
+
+    print(f"{'path':<22}{'elapsed':>11}{'requests/s':>14}")
+    await run("run_llm_chain", concurrency, sync_llm_chain)
+    await run("arun_llm_chain", concurrency, async_llm_chain)
+    await run("chat", concurrency, sync_chat)
+    await run("achat", concurrency, async_chat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency) as server:
+        configure_local_llm(server.base_url)
+        asyncio.run(main(args.concurrency))
+        print(f"completions served: {server.request_count}")
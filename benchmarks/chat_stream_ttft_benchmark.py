@@ -0,0 +1,108 @@
+"""
+Time-to-first-token of the streaming chat path against the blocking one.
+
+A fake LLM server takes `--latency` seconds to the first token and `--token-latency`
+seconds per following token. Three paths are measured with `--concurrency` chats in
+flight:
+
+- arun_llm_chain: waits for the whole completion (first token == full answer)
+- astream_llm_chain: LocalLLMManager streaming through LangChain
+- SSE route: POST /chat/stream served by uvicorn, read with an HTTP client
+
+Run from the project root:
+
+    python -m benchmarks.chat_stream_ttft_benchmark --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+import httpx
+from benchmarks.async_chat_benchmark import configure_local_llm
+from benchmarks.fake_servers import FakeOpenAIServer
+
+
+async def measure(label: str, concurrency: int, run_one):
+    results = await asyncio.gather(*(run_one() for _ in range(concurrency)))
+    first_tokens = [first for first, _ in results]
+    totals = [total for _, total in results]
+    print(f"{label:<20}{statistics.median(first_tokens) * 1000:>12.0f}{max(first_tokens) * 1000:>12.0f}{statistics.median(totals) * 1000:>12.0f}")
+
+
+def start_api_server(llm_manager) -> str:
+    import uvicorn
+    from fastapi import FastAPI
+    from app.routers.chat_route import ChatRouter
+
+    chat_router = ChatRouter()
+    chat_router.llm_manager = llm_manager
+    app = FastAPI()
+    app.include_router(chat_router.router)
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+async def main(concurrency: int):
+    from langchain.prompts import PromptTemplate
+    from app.constants.route_paths import RoutePaths
+    from app.langchain.local_llm_manager import LocalLLMManager
+
+    manager = LocalLLMManager()
+    prompt = PromptTemplate.from_template("{question}")
+    input_values = {"question": "Summarise the leave policy."}
+
+    async def blocking():
+        start = time.perf_counter()
+        await manager.arun_llm_chain(prompt, input_values=input_values)
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed
+
+    async def streaming():
+        start = time.perf_counter()
+        first_token = None
+        async for _ in manager.astream_llm_chain(prompt, input_values=input_values):
+            first_token = first_token or time.perf_counter() - start
+        return first_token, time.perf_counter() - start
+
+    api_url = start_api_server(manager)
+    async with httpx.AsyncClient(base_url=api_url, timeout=60.0, limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def sse_route():
+            start = time.perf_counter()
+            first_token = None
+            async with client.stream("POST", f"{RoutePaths.API_PREFIX}{RoutePaths.CHAT_STREAM}", json=input_values) as response:
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        first_token = first_token or time.perf_counter() - start
+            return first_token, time.perf_counter() - start
+
+        print(f"{'path':<20}{'p50 TTFT ms':>12}{'max TTFT ms':>12}{'p50 total':>12}")
+        await measure("arun_llm_chain", concurrency, blocking)
+        await measure("astream_llm_chain", concurrency, streaming)
+        await measure("SSE route", concurrency, sse_route)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.02)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency, token_latency=args.token_latency, completion_tokens=args.tokens) as server, \
+            tempfile.TemporaryDirectory() as directory:
+        configure_local_llm(server.base_url)
+        from app.utils.file_system import FileSystem
+        os.environ["SQLITE_DB_PATH"] = os.path.relpath(os.path.join(directory, "chat.db"), FileSystem().get_project_dir())
+        asyncio.run(main(args.concurrency))
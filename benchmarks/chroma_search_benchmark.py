@@ -0,0 +1,76 @@
+"""
+Search QPS of a local Chroma collection when every search opens its own store, as
+ChromaVectorStoreWithLocalEmbeddings did, against stores reused from ChromaClientRegistry.
+
+A `--documents` document collection is generated in a temporary persist directory with
+deterministic fake embeddings, so the numbers isolate opening the store and resolving the
+collection from the embedding model. Searches run on `--threads` threads. Needs chromadb
+(commented out in requirements.txt). Run from the project root:
+
+    python -m benchmarks.chroma_search_benchmark --documents 5000 --searches 500 --threads 4
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_community.vectorstores.chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from app.embeddings.chroma_client_registry import ChromaClientRegistry
+from app.utils.iter_batches import iter_batches
+
+COLLECTION = "handbook"
+
+
+def build_collection(persist_directory: str, embedding: DeterministicFakeEmbedding, documents: int):
+    store = Chroma(persist_directory=persist_directory, embedding_function=embedding, collection_name=COLLECTION)
+    texts = (Document(page_content=f"Section {index}: leave, benefits and notice period rules.", metadata={"source": f"doc-{index % 50}.pdf"})
+             for index in range(documents))
+    for batch in iter_batches(texts, 1000):
+        store.add_documents(batch)
+
+
+def run(label: str, search, searches: int, threads: int):
+    queries = [f"How many days of leave in section {index}?" for index in range(searches)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(search, queries))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12}{searches / elapsed:>10.1f}{latencies[len(latencies) // 2] * 1000:>10.2f}{latencies[int(len(latencies) * 0.99)] * 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--searches", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    embedding = DeterministicFakeEmbedding(size=384)
+    with tempfile.TemporaryDirectory() as persist_directory:
+        build_collection(persist_directory, embedding, args.documents)
+        registry = ChromaClientRegistry()
+
+        def search_per_call(query: str) -> float:
+            start = time.perf_counter()
+            store = Chroma(persist_directory=persist_directory, embedding_function=embedding, collection_name=COLLECTION)
+            store.similarity_search(query, k=args.top_k)
+            return time.perf_counter() - start
+
+        def search_registry(query: str) -> float:
+            start = time.perf_counter()
+            store = registry.get_store(persist_directory, COLLECTION, embedding)
+            store.similarity_search(query, k=args.top_k)
+            return time.perf_counter() - start
+
+        print(f"{args.documents} documents, {args.searches} searches on {args.threads} threads")
+        print(f"{'stores':<12}{'QPS':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        run("per call", search_per_call, args.searches, args.threads)
+        run("registry", search_registry, args.searches, args.threads)
+        print(registry.stats())
+        registry.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Latency and LLM work of ConversationalRAGChatbot with the question-condensing call
+made for every follow-up (CondenseMode.ALWAYS) against CondenseMode.HEURISTIC,
+which only rewrites questions that lean on the conversation.
+
+The fake LLM sleeps `--llm-latency` seconds per call and counts the words it is
+sent, a stand-in for prompt tokens. Each simulated user asks the scripted
+conversation below. Run from the project root:
+
+    python -m benchmarks.condense_question_benchmark --users 20 --llm-latency 0.3
+"""
+import argparse
+import statistics
+import time
+from typing import Any, List, Optional
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListLLM
+from langchain_core.vectorstores import InMemoryVectorStore
+from app.enums.condense_mode import CondenseMode
+from app.langchain.conversational_rag_chatbot import ConversationalRAGChatbot
+
+CONVERSATION = [
+    "How many days of annual leave do employees get?",
+    "Can unused annual leave be carried over to next year?",
+    "And what about sick leave?",
+    "Who approves parental leave requests?",
+    "How long does it take?",
+    "What is the notice period for resignation?",
+]
+
+
+class SlowFakeLLM(FakeListLLM):
+    latency: float = 0.3
+    calls: int = 0
+    prompt_words: int = 0
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        self.calls += 1
+        self.prompt_words += len(prompt.split())
+        time.sleep(self.latency)
+        return super()._call(prompt, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def run(mode: CondenseMode, users: int, latency: float):
+    vectorstore = InMemoryVectorStore(embedding=DeterministicFakeEmbedding(size=64))
+    vectorstore.add_documents([
+        Document(page_content=f"Policy paragraph {index} about leave and notice periods.", metadata={"source": f"policy-{index % 5}.pdf"})
+        for index in range(50)
+    ])
+    llm = SlowFakeLLM(responses=["Employees get 30 days of annual leave per year."], latency=latency)
+    chatbot = ConversationalRAGChatbot(llm=llm, vectorstore=vectorstore, condense_mode=mode)
+
+    latencies, condensed, time_saved = [], 0, 0.0
+    for user in range(users):
+        for question in CONVERSATION:
+            answer = chatbot.chat(query=question, user_id=f"user-{user}")
+            latencies.append(answer["time_taken"])
+            condensed += answer["question_condensed"]
+            time_saved += answer["condense_time_saved"]
+
+    turns = len(latencies)
+    print(f"{mode.value:<11}{statistics.median(latencies) * 1000:>10.0f}{statistics.mean(latencies) * 1000:>11.0f}"
+          f"{llm.calls / turns:>11.2f}{llm.prompt_words / turns:>13.0f}{condensed / turns:>12.0%}{time_saved:>17.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(f"{'mode':<11}{'p50 ms':>10}{'mean ms':>11}{'LLM calls':>11}{'prompt words':>13}{'condensed':>12}{'reported s saved':>17}")
+    for mode in (CondenseMode.ALWAYS, CondenseMode.HEURISTIC):
+        run(mode, args.users, args.llm_latency)
+
+
+if __name__ == "__main__":
+    main()
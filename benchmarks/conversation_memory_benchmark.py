@@ -0,0 +1,73 @@
+"""
+Resident memory of the chatbot's conversation memory as simulated users keep arriving.
+
+"unbounded" is the previous behaviour, one ConversationBufferWindowMemory per user
+ever seen, measured for `--baseline-users` users and extrapolated. "lru" is
+InMemoryConversationStore with `--max-users`, driven through `--users` users;
+its RSS should level off once the cap is reached. Each scenario runs in its own
+process. Run from the project root:
+
+    python -m benchmarks.conversation_memory_benchmark --users 1000000 --max-users 10000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import time
+
+QUESTION = "How many days of annual leave do I get after my probation period?"
+ANSWER = "Employees accrue 2.5 days per month, 30 days per year, after probation."
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        # Peak rather than current RSS where /proc is unavailable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def unbounded(users: int, target_users: int):
+    from langchain.memory import ConversationBufferWindowMemory
+
+    memories = {}
+    start_rss = rss_mb()
+    for index in range(users):
+        memory = ConversationBufferWindowMemory(memory_key='chat_history', return_messages=True, output_key='answer', k=10)
+        memory.save_context({"question": QUESTION}, {"answer": ANSWER})
+        memories[f"user-{index}"] = memory
+    growth = rss_mb() - start_rss
+    print(f"unbounded: {users} users -> +{growth:.1f} MB ({growth * 1024 * 1024 / users:.0f} B/user), "
+          f"~{growth * target_users / users / 1024:.1f} GB at {target_users} users")
+
+
+def lru(users: int, max_users: int):
+    from app.langchain.conversation_memory_store import InMemoryConversationStore
+
+    store = InMemoryConversationStore(window=10, max_users=max_users)
+    start_rss = rss_mb()
+    start = time.perf_counter()
+    checkpoint = max(1, users // 10)
+    for index in range(users):
+        store.append_turn(f"user-{index}", QUESTION, ANSWER)
+        if (index + 1) % checkpoint == 0:
+            print(f"lru: {index + 1:>9} users, {len(store):>7} stored, +{rss_mb() - start_rss:7.1f} MB RSS")
+    print(f"lru: {users / (time.perf_counter() - start):.0f} turns/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--baseline-users", type=int, default=20_000)
+    parser.add_argument("--max-users", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for target, target_args in ((unbounded, (args.baseline_users, args.users)), (lru, (args.users, args.max_users))):
+        process = multiprocessing.Process(target=target, args=target_args)
+        process.start()
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
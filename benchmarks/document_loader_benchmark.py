@@ -0,0 +1,54 @@
+"""
+Throughput of DocumentLoader.load_directory against worker count.
+
+The mock/docs corpus is copied `--copies` times into a temporary directory so the
+pools have enough files to spread. Run from the project root:
+
+    python -m benchmarks.document_loader_benchmark --copies 40 --workers 1 2 4 8
+"""
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+from app.utils.document_loader import DocumentLoader
+
+
+def build_corpus(source_dir: str, destination: str, copies: int) -> int:
+    source_files = [path for path in glob.glob(os.path.join(source_dir, "*")) if os.path.isfile(path)]
+    for copy_index in range(copies):
+        for source_file in source_files:
+            name, extension = os.path.splitext(os.path.basename(source_file))
+            shutil.copy(source_file, os.path.join(destination, f"{name}_{copy_index}{extension}"))
+    return len(source_files) * copies
+
+
+def run(directory: str, file_count: int, label: str, **kwargs):
+    # Remove extraction leftovers of the previous run so every run loads the same files
+    for leftover in glob.glob(os.path.join(directory, "*_extracted.txt")):
+        os.remove(leftover)
+    start = time.perf_counter()
+    documents = DocumentLoader.load_directory(directory=directory, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12}{elapsed:>10.2f}s{file_count / elapsed:>12.1f}{len(documents) / elapsed:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="mock/docs")
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        file_count = build_corpus(args.source, corpus_dir, args.copies)
+        print(f"Corpus: {file_count} files from {args.source}")
+        print(f"{'mode':<12}{'elapsed':>11}{'files/s':>12}{'chunks/s':>14}")
+        run(corpus_dir, file_count, "serial")
+        for workers in args.workers:
+            run(corpus_dir, file_count, f"parallel-{workers}", parallel=True, max_workers=workers)
+
+
+if __name__ == "__main__":
+    main()
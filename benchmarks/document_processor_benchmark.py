@@ -0,0 +1,108 @@
+"""
+Throughput of DocumentProcessor on a large document against a fake LLM server.
+
+A synthetic `--pages` page document is packed into chunks of up to 12k tokens and every
+chunk takes `--latency` seconds to extract. Rows:
+
+- max_concurrency=1: the previous one-chunk-at-a-time behaviour
+- max_concurrency=N: bounded concurrent extraction
+- rate limited: the server answers 429 beyond `--server-limit` requests in flight,
+  the processor backs off and retries
+- resume: a run cancelled halfway, then resumed from its checkpoint
+
+Tokens are counted with the stand-in encoding of token_chunker_benchmark, as no tiktoken
+encoding can be downloaded here.
+Run from the project root:
+
+    python -m benchmarks.document_processor_benchmark --pages 500 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from benchmarks.async_chat_benchmark import configure_local_llm
+from benchmarks.fake_servers import FakeOpenAIServer
+from benchmarks.token_chunker_benchmark import build_encoding
+
+EXTRACTION = {
+    "entities": [{"name": "Acme Corp", "type": "ORG"}],
+    "keywords": ["leave", "benefits"],
+    "sentiment": 0.2,
+    "main_topics": ["HR policy"],
+    "summary": "Employee handbook section.",
+    "page_numbers": [],
+}
+
+
+def build_processor_class():
+    from langchain_core.documents import Document
+    from app.utils.metadata_extractor import DocumentProcessor
+
+    class SyntheticDocumentProcessor(DocumentProcessor):
+        encoding = build_encoding()
+
+        def __init__(self, pages: int, **kwargs):
+            super().__init__(**kwargs)
+            self.pages = pages
+
+        def load_document(self, file_path):
+            return [Document(page_content=f"Page {page} of {file_path}. " + "Policy text about leave and benefits. " * 80) for page in range(self.pages)]
+
+    return SyntheticDocumentProcessor
+
+
+def new_manager():
+    from app.langchain.llm_response_cache import LLMResponseCache
+    from app.langchain.local_llm_manager import LocalLLMManager
+
+    manager = LocalLLMManager()
+    # Every run starts cold, so the response cache cannot hide the LLM calls
+    manager.response_cache = LLMResponseCache()
+    return manager
+
+
+async def run(label: str, server: FakeOpenAIServer, processor_class, output_dir: str, pages: int, file_name: str, timeout: float = None, **kwargs):
+    processor = processor_class(pages, output_dir=output_dir, llm_manager=new_manager(), **kwargs)
+    requests_before = server.request_count
+    start = time.perf_counter()
+    try:
+        results_path = await asyncio.wait_for(processor.aprocess_document(file_name), timeout)
+    except asyncio.TimeoutError:
+        print(f"{label:<28}{'cancelled':>10}{server.request_count - requests_before:>10}")
+        return
+    elapsed = time.perf_counter() - start
+    with open(results_path) as results:
+        chunks = len(json.load(results))
+    print(f"{label:<28}{elapsed:>10.2f}{server.request_count - requests_before:>10}{chunks:>8}{chunks / elapsed:>12.2f}")
+
+
+async def main(args):
+    processor_class = build_processor_class()
+    with FakeOpenAIServer(latency=args.latency, completion_content=json.dumps(EXTRACTION)) as server, \
+            tempfile.TemporaryDirectory() as output_dir:
+        configure_local_llm(server.base_url)
+        print(f"{'run':<28}{'seconds':>10}{'requests':>10}{'chunks':>8}{'chunks/s':>12}")
+        for concurrency in (1, args.concurrency):
+            await run(f"max_concurrency={concurrency}", server, processor_class, output_dir, args.pages, f"handbook-{concurrency}.pdf", max_concurrency=concurrency)
+
+        server.max_concurrent_requests = args.server_limit
+        await run(f"rate limited ({args.server_limit} in flight)", server, processor_class, output_dir, args.pages, "rate-limited.pdf", max_concurrency=args.concurrency)
+        print(f"{'':<28}429 responses: {server.rejected_count}")
+        server.max_concurrent_requests = None
+
+        await run("interrupted", server, processor_class, output_dir, args.pages, "resumed.pdf", timeout=args.latency * 2.5, max_concurrency=args.concurrency // 2)
+        await run("resumed", server, processor_class, output_dir, args.pages, "resumed.pdf", max_concurrency=args.concurrency // 2)
+        assert not os.path.exists(os.path.join(output_dir, "resumed.pdf_checkpoint.jsonl"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--server-limit", type=int, default=6)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
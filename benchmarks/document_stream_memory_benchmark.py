@@ -0,0 +1,62 @@
+"""
+Peak Python heap of materialized vs streamed ingestion as the corpus grows.
+
+A synthetic corpus of text files is generated for every size in `--files`, then fed
+to a fake embedding sink once through DocumentLoader.load_directory (whole list in
+memory) and once through DocumentLoader.iter_directory + iter_batches. Run from the
+project root:
+
+    python -m benchmarks.document_stream_memory_benchmark --files 100 400 1600
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+from typing import Iterable, List
+from langchain_core.documents import Document
+from app.utils.document_loader import DocumentLoader
+from app.utils.iter_batches import iter_batches
+
+
+def build_corpus(destination: str, file_count: int, file_size: int):
+    paragraph = "Employees are entitled to annual leave, health cover and eye exams. "
+    body = (paragraph * (file_size // len(paragraph) + 1))[:file_size]
+    for index in range(file_count):
+        with open(os.path.join(destination, f"doc_{index:06d}.txt"), "w", encoding="utf-8") as file:
+            file.write(body)
+
+
+def fake_embed(batch: List[Document]) -> int:
+    # Stand-in for an embedding call: touches every chunk and keeps nothing
+    return sum(len(doc.page_content) for doc in batch)
+
+
+def measure(documents_factory, batch_size: int) -> float:
+    tracemalloc.start()
+    documents: Iterable[Document] = documents_factory()
+    for batch in iter_batches(documents, batch_size):
+        fake_embed(batch)
+    del documents
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 400, 1600])
+    parser.add_argument("--file-size", type=int, default=20000, help="characters per file")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'files':>8}{'materialized MiB':>20}{'streamed MiB':>16}")
+    for file_count in args.files:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            build_corpus(corpus_dir, file_count, args.file_size)
+            materialized = measure(lambda: DocumentLoader.load_directory(corpus_dir), args.batch_size)
+            streamed = measure(lambda: DocumentLoader.iter_directory(corpus_dir), args.batch_size)
+            print(f"{file_count:>8}{materialized:>20.1f}{streamed:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
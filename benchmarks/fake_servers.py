@@ -0,0 +1,181 @@
+"""
+Local stand-ins for the remote services the benchmarks talk to.
+
+FakeOpenAIServer speaks enough of the OpenAI REST API (embeddings and chat
+completions) for the SDKs, LangChain clients and LocalLLM to be pointed at it with
+a `base_url`. Every request sleeps `latency`
+seconds so network-bound code paths behave like they do against the real API.
+Chat completions generate `completion_tokens` tokens at `token_latency` seconds each;
+with `"stream": true` they are sent as server-sent events as they are generated.
+`completion_content` replaces the generated words with a fixed answer, and with
+`max_concurrent_requests` set, requests beyond that many in flight get a 429.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+
+def fake_embedding(text: str, dimensions: int) -> List[float]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [digest[index % len(digest)] / 255.0 for index in range(dimensions)]
+
+
+class BacklogHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 refuses connections when a benchmark opens ~100 at once
+    request_queue_size = 256
+
+
+class FakeOpenAIServer:
+    def __init__(
+        self,
+        latency: float = 0.05,
+        dimensions: int = 1536,
+        token_latency: float = 0.0,
+        completion_tokens: int = 20,
+        completion_content: Optional[str] = None,
+        max_concurrent_requests: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.dimensions = dimensions
+        self.token_latency = token_latency
+        self.completion_tokens = completion_tokens
+        self.completion_content = completion_content
+        self.max_concurrent_requests = max_concurrent_requests
+        self.request_count = 0
+        self.rejected_count = 0
+        self.in_flight = 0
+        self.__LOCK = threading.Lock()
+        self.server = BacklogHTTPServer(("127.0.0.1", 0), self.__build_handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count_request(self):
+        with self.__LOCK:
+            self.request_count += 1
+
+    def try_admit(self) -> bool:
+        with self.__LOCK:
+            if self.max_concurrent_requests and self.in_flight >= self.max_concurrent_requests:
+                self.rejected_count += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self.__LOCK:
+            self.in_flight -= 1
+
+    def handle_embeddings(self, payload: dict) -> dict:
+        inputs = payload["input"] if isinstance(payload["input"], list) else [payload["input"]]
+        return {
+            "object": "list",
+            "model": payload.get("model", "fake-embedding"),
+            "data": [
+                {"object": "embedding", "index": index, "embedding": fake_embedding(str(text), self.dimensions)}
+                for index, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    def completion_words(self) -> List[str]:
+        return [f"token{index}" for index in range(self.completion_tokens)]
+
+    def handle_chat_completions(self, payload: dict) -> dict:
+        prompt = payload["messages"][-1]["content"] if payload.get("messages") else ""
+        time.sleep(self.token_latency * self.completion_tokens)
+        content = self.completion_content if self.completion_content is not None else " ".join(self.completion_words())
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "fake-chat"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            ],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": self.completion_tokens, "total_tokens": len(prompt.split()) + self.completion_tokens},
+        }
+
+    def iter_chat_completion_events(self, payload: dict) -> Iterator[str]:
+        for index, word in enumerate(self.completion_words()):
+            if index:
+                time.sleep(self.token_latency)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": payload.get("model", "fake-chat"),
+                "choices": [{"index": 0, "delta": {"content": word if index == 0 else f" {word}"}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    def __build_handler(self):
+        fake_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; with Nagle on, kept-alive connections stall on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                fake_server.count_request()
+                if not fake_server.try_admit():
+                    self.send_json({"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}, status=429, headers={"Retry-After": "1"})
+                    return
+                try:
+                    time.sleep(fake_server.latency)
+                    if self.path.endswith("/embeddings"):
+                        self.send_json(fake_server.handle_embeddings(payload))
+                    elif self.path.endswith("/chat/completions") and payload.get("stream"):
+                        self.send_events(fake_server.iter_chat_completion_events(payload))
+                    elif self.path.endswith("/chat/completions"):
+                        self.send_json(fake_server.handle_chat_completions(payload))
+                    else:
+                        self.send_error(404)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on the request, e.g. a cancelled benchmark run
+                    pass
+                finally:
+                    fake_server.release()
+
+            def send_json(self, body: dict, status: int = 200, headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_events(self, events: Iterator[str]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event in events:
+                    data = event.encode("utf-8")
+                    self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
@@ -0,0 +1,61 @@
+"""
+Connections opened and per-request latency of LocalLLM requests with a fresh
+connection per request (the previous module-level `requests.post`) against the
+shared keep-alive clients of HTTPClientRegistry, plus LocalLLM.invoke end to end.
+
+Requests go to a local fake LLM server, so the gap is the connection setup alone;
+against a TLS endpoint the handshake makes it considerably larger. Run from the
+project root:
+
+    python -m benchmarks.http_client_reuse_benchmark --requests 500 --threads 8
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from benchmarks.async_chat_benchmark import configure_local_llm
+from benchmarks.fake_servers import FakeOpenAIServer
+
+
+def run(label: str, total: int, threads: int, call):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: call(), range(total)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22}{elapsed * 1000 / total * threads:>14.2f}{total / elapsed:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=0.0) as server:
+        configure_local_llm(server.base_url)
+        from app.langchain.local_llm_manager import LocalLLM
+        from app.utils.http_client_registry import HTTPClientRegistry
+
+        llm = LocalLLM()
+        payload = llm._build_payload("Summarise the leave policy.")
+
+        def per_request_connection():
+            response = requests.post(llm.LLM_ENDPOINT, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+        def shared_connection():
+            response = HTTPClientRegistry.shared().get_client("local_llm").post(llm.LLM_ENDPOINT, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+        print(f"{'client':<22}{'ms/request':>14}{'requests/s':>14}")
+        run("requests.post", args.requests, args.threads, per_request_connection)
+        run("shared registry", args.requests, args.threads, shared_connection)
+        # End to end through LangChain, which adds its callback overhead to every call
+        run("LocalLLM.invoke", args.requests, args.threads, lambda: llm.invoke("Summarise the leave policy."))
+        print("local_llm client:", HTTPClientRegistry.shared().stats()["local_llm"])
+
+
+if __name__ == "__main__":
+    main()
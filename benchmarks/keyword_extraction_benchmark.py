@@ -0,0 +1,143 @@
+"""
+Chunks/s of Milvus keyword extraction: the former per-text `nlp(text)` with the whole
+pipeline against KeywordExtractor, i.e. `nlp.pipe` batches without parser, NER and
+lemmatizer, on one and on `--processes` processes.
+
+`--model` names an installed pipeline such as en_core_web_sm. Without it, a pipeline
+with en_core_web_sm's components and layer sizes (tok2vec, tagger, parser, attribute_ruler,
+rule lemmatizer, NER with its own tok2vec) is generated and briefly trained on synthetic
+sentences. The timings reflect the real architecture; the tags, and so the keywords,
+are only roughly right. Run from the project root:
+
+    python -m benchmarks.keyword_extraction_benchmark --chunks 3000 --processes 2
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from app.utils.keyword_extractor import KEYWORD_POS, KeywordExtractor
+
+WORDS = {
+    "DT": ["the", "a", "each", "every", "this"],
+    "JJ": ["annual", "paid", "remote", "parental", "medical", "new", "eligible", "monthly", "unpaid", "internal"],
+    "NN": ["leave", "policy", "employee", "manager", "salary", "contract", "request", "benefit", "notice", "review",
+           "allowance", "pension", "overtime", "holiday", "training", "expense", "probation", "office", "team", "payroll"],
+    "NNS": ["employees", "days", "weeks", "managers", "benefits", "expenses", "holidays", "requests", "contracts", "hours"],
+    "NNP": ["Acme", "London", "HR", "Monday", "Berlin", "Payroll", "Finance", "Europe"],
+    "VBZ": ["covers", "requires", "allows", "includes", "grants", "limits", "approves", "reviews"],
+    "IN": ["for", "of", "in", "under", "after", "before", "within"],
+    ".": ["."],
+}
+TAG_MAP = {"DT": "DET", "JJ": "ADJ", "NN": "NOUN", "NNS": "NOUN", "NNP": "PROPN", "VBZ": "VERB", "IN": "ADP", ".": "PUNCT"}
+SENTENCE = ["DT", "JJ", "NN", "VBZ", "DT", "NN", "IN", "NNP", "IN", "JJ", "NNS", "."]
+
+
+def sentence(rng: random.Random):
+    tags = [tag for tag in SENTENCE if tag != "JJ" or rng.random() < 0.6]
+    return [rng.choice(WORDS[tag]) for tag in tags], tags
+
+
+def build_chunks(count: int, sentences: int, seed: int = 5):
+    rng = random.Random(seed)
+    return [" ".join(" ".join(sentence(rng)[0]) for _ in range(rng.randint(sentences // 2, sentences))) for _ in range(count)]
+
+
+def build_pipeline(directory: str):
+    import spacy
+    from spacy.cli.init_config import init_config
+    from spacy.lookups import Lookups
+    from spacy.tokens import Doc
+    from spacy.training import Example
+
+    config = init_config(lang="en", pipeline=["tagger", "parser", "ner"], optimize="efficiency")
+    # en_core_web_sm's NER has its own tok2vec, the tagger and parser share one
+    config["components"]["ner"]["model"]["tok2vec"] = {
+        "@architectures": "spacy.Tok2Vec.v2",
+        "embed": {"@architectures": "spacy.MultiHashEmbed.v2", "width": 96, "attrs": ["NORM", "PREFIX", "SUFFIX", "SHAPE"],
+                  "rows": [5000, 1000, 2500, 2500], "include_static_vectors": False},
+        "encode": {"@architectures": "spacy.MaxoutWindowEncoder.v2", "width": 96, "depth": 4, "window_size": 1, "maxout_pieces": 3},
+    }
+    nlp = spacy.util.load_model_from_config(config, auto_fill=True)
+
+    rng = random.Random(1)
+    examples = []
+    for _ in range(200):
+        words, tags = sentence(rng)
+        verb = tags.index("VBZ")
+        heads = [verb] * len(words)
+        deps = ["ROOT" if index == verb else "dep" for index in range(len(words))]
+        entities = ["U-ORG" if tag == "NNP" else "O" for tag in tags]
+        examples.append(Example.from_dict(Doc(nlp.vocab, words=words), {"tags": tags, "heads": heads, "deps": deps, "entities": entities}))
+    optimizer = nlp.initialize(lambda: examples)
+    for _ in range(6):
+        rng.shuffle(examples)
+        for start in range(0, len(examples), 16):
+            nlp.update(examples[start:start + 16], sgd=optimizer)
+
+    ruler = nlp.add_pipe("attribute_ruler", after="tagger")
+    ruler.load_from_tag_map({tag: {"POS": pos} for tag, pos in TAG_MAP.items()})
+    lemmatizer = nlp.add_pipe("lemmatizer", config={"mode": "rule"}, after="attribute_ruler")
+    lookups = Lookups()
+    lookups.add_table("lemma_rules", {"noun": [["s", ""]], "verb": [["s", ""], ["ing", ""], ["ed", ""]], "adj": []})
+    lookups.add_table("lemma_index", {"noun": [], "verb": [], "adj": []})
+    lookups.add_table("lemma_exc", {"noun": {}, "verb": {}, "adj": {}})
+    lemmatizer.initialize(lookups=lookups)
+    nlp.to_disk(directory)
+
+
+def per_text_keywords(nlp, texts):
+    """MilvusManager.extract_keywords before KeywordExtractor: the first 10 in document order."""
+    return [[token.text for token in nlp(text) if token.pos_ in KEYWORD_POS][:10] for text in texts]
+
+
+def piped_keywords(nlp, texts, batch_size):
+    return [[token.text for token in doc if token.pos_ in KEYWORD_POS][:10] for doc in nlp.pipe(texts, batch_size=batch_size)]
+
+
+def measure(label: str, texts, extract, baseline=None):
+    start = time.perf_counter()
+    keywords = extract(texts)
+    elapsed = time.perf_counter() - start
+    speedup = f"{baseline / elapsed:>8.1f}x" if baseline else f"{'1.0x':>9}"
+    print(f"{label:<38}{elapsed:>9.2f}{len(texts) / elapsed:>10.1f}{speedup}")
+    return elapsed, keywords
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=3000)
+    parser.add_argument("--sentences", type=int, default=12, help="at most this many sentences per chunk")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+
+    import spacy
+
+    with tempfile.TemporaryDirectory() as directory:
+        model = args.model
+        if not model:
+            build_pipeline(directory)
+            model = directory
+        texts = build_chunks(args.chunks, args.sentences)
+        full = spacy.load(model)
+        print(f"{args.chunks} chunks, {sum(len(text.split()) for text in texts)} words, on {os.cpu_count()} CPUs, pipeline {full.pipe_names}")
+        print(f"{'extraction':<38}{'seconds':>9}{'chunks/s':>10}{'speedup':>9}")
+
+        baseline, before = measure("nlp(text) per chunk, full pipeline", texts, lambda chunk: per_text_keywords(full, chunk))
+        measure("nlp.pipe, full pipeline", texts, lambda chunk: piped_keywords(full, chunk, args.batch_size), baseline)
+        extractor = KeywordExtractor(model=model, batch_size=args.batch_size)
+        extractor.load()
+        _, after = measure("KeywordExtractor, trimmed pipeline", texts, extractor.extract, baseline)
+        if args.processes > 1:
+            pooled = KeywordExtractor(model=model, batch_size=args.batch_size, n_process=args.processes)
+            pooled.load()
+            measure(f"KeywordExtractor, {args.processes} processes", texts, pooled.extract, baseline)
+
+        print(f"\nfirst chunk, before: {', '.join(before[0])}")
+        print(f"first chunk, after:  {', '.join(after[0])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Repeated extraction over the same chunks, as DocumentProcessor does when a document
+is processed again, through LocalLLMManager.run_llm_chain against a fake LLM server.
+
+Runs of `--passes` passes over `--chunks` chunks:
+
+- off: temperature 0.7, so every call bypasses the cache
+- memory: the in-process LRU tier only
+- sqlite: the LRU tier in front of a SQLite file
+- sqlite restart: one pass with a fresh in-process tier over the SQLite file of the previous run,
+  i.e. the first pass after a worker restart
+
+Run from the project root:
+
+    python -m benchmarks.llm_response_cache_benchmark --chunks 50 --passes 3 --latency 0.05
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.async_chat_benchmark import configure_local_llm
+from benchmarks.fake_servers import FakeOpenAIServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=50)
+    parser.add_argument("--passes", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as directory:
+        configure_local_llm(server.base_url)
+        from langchain.prompts import PromptTemplate
+        from app.langchain.llm_response_cache import LLMResponseCache, SQLiteResponseTier
+        from app.langchain.local_llm_manager import LocalLLMManager
+
+        prompt = PromptTemplate.from_template("Extract entities, keywords and a summary from: {text}")
+        chunks = [f"Chunk {index} of the employee handbook. " * 40 for index in range(args.chunks)]
+        path = os.path.join(directory, "responses.db")
+
+        def run(label: str, cache: LLMResponseCache, temperature: int = 0, passes: int = args.passes):
+            manager = LocalLLMManager()
+            manager.TEMPERATURE = temperature
+            manager.response_cache = cache
+            start = time.perf_counter()
+            for _ in range(passes):
+                for chunk in chunks:
+                    manager.run_llm_chain(prompt, input_values={"text": chunk})
+            elapsed = time.perf_counter() - start
+            stats = cache.stats()
+            print(f"{label:<16}{passes * len(chunks):>7}{elapsed:>10.2f}{stats['hit_rate']:>10.0%}"
+                  f"{stats['memory_hits']:>9}{stats['persistent_hits']:>12}{stats['skipped']:>9}")
+
+        print(f"{'cache':<16}{'calls':>7}{'seconds':>10}{'hit rate':>10}{'memory':>9}{'persistent':>12}{'skipped':>9}")
+        run("off", LLMResponseCache(), temperature=0.7)
+        run("memory", LLMResponseCache())
+        run("sqlite", LLMResponseCache(persistent_tier=SQLiteResponseTier(path)))
+        run("sqlite restart", LLMResponseCache(persistent_tier=SQLiteResponseTier(path)), passes=1)
+
+
+if __name__ == "__main__":
+    main()
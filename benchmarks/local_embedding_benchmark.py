@@ -0,0 +1,142 @@
+"""
+Docs/s of LocalEmbeddingEngine on a CPU ingestion workload.
+
+Rows:
+
+- batches of 32 in input order: what a plain fixed-size batching loop does
+- sorted batches of 32: sentence-transformers' own batching, i.e. the HuggingFaceEmbeddings path
+- token budget: length-sorted batches of up to `--max-batch-tokens` padded tokens
+- token budget int8: the same with ONNX Runtime dynamic int8 quantization
+- token budget, N processes: the batches spread over `--processes` worker processes
+
+`--model-path` points at a local export of all-MiniLM-L6-v2 (tokenizer.json and
+onnx/model.onnx). Without it, a model with the shape of all-MiniLM-L6-v2 (6 layers,
+384 hidden, 1536 intermediate, random weights) and a word-level tokenizer are generated,
+so the numbers show batching and runtime effects, not the real model's absolute speed.
+The torch backend is not measured. Run from the project root:
+
+    python -m benchmarks.local_embedding_benchmark --documents 2000 --processes 2
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from app.embeddings.local_embedding_engine import LocalEmbeddingEngine
+
+HIDDEN = 384
+INTERMEDIATE = 1536
+LAYERS = 6
+WORDS = [f"word{index}" for index in range(5000)]
+
+
+def build_synthetic_model(directory: str):
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+
+    vocab = {token: index for index, token in enumerate(["[PAD]", "[UNK]", "[CLS]", "[SEP]"] + WORDS)}
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.post_processor = processors.TemplateProcessing(single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)])
+    tokenizer.save(os.path.join(directory, "tokenizer.json"))
+
+    rng = np.random.default_rng(0)
+    initializers, nodes = [], []
+
+    def weight(name, *shape):
+        initializers.append(numpy_helper.from_array((rng.standard_normal(shape) * 0.05).astype(np.float32), name))
+        return name
+
+    def constant(name, value):
+        initializers.append(numpy_helper.from_array(np.asarray(value, dtype=np.float32), name))
+        return name
+
+    def node(op, inputs, name, **attributes):
+        nodes.append(helper.make_node(op, inputs, [name], **attributes))
+        return name
+
+    hidden = node("Gather", [weight("word_embeddings", len(vocab), HIDDEN), "input_ids"], "embeddings")
+    scale = constant("scale", 1 / np.sqrt(HIDDEN))
+    gamma, beta = constant("gamma", np.ones(HIDDEN)), constant("beta", np.zeros(HIDDEN))
+    for layer in range(LAYERS):
+        prefix = f"layer{layer}_"
+        query = node("MatMul", [hidden, weight(prefix + "wq", HIDDEN, HIDDEN)], prefix + "q")
+        key = node("MatMul", [hidden, weight(prefix + "wk", HIDDEN, HIDDEN)], prefix + "k")
+        value = node("MatMul", [hidden, weight(prefix + "wv", HIDDEN, HIDDEN)], prefix + "v")
+        scores = node("MatMul", [query, node("Transpose", [key], prefix + "kt", perm=[0, 2, 1])], prefix + "scores")
+        probabilities = node("Softmax", [node("Mul", [scores, scale], prefix + "scaled")], prefix + "probabilities", axis=-1)
+        attention = node("MatMul", [node("MatMul", [probabilities, value], prefix + "context"), weight(prefix + "wo", HIDDEN, HIDDEN)], prefix + "attention")
+        hidden = node("LayerNormalization", [node("Add", [hidden, attention], prefix + "residual1"), gamma, beta], prefix + "norm1")
+        intermediate = node("Relu", [node("MatMul", [hidden, weight(prefix + "w1", HIDDEN, INTERMEDIATE)], prefix + "up")], prefix + "relu")
+        output = node("MatMul", [intermediate, weight(prefix + "w2", INTERMEDIATE, HIDDEN)], prefix + "down")
+        hidden = node("LayerNormalization", [node("Add", [hidden, output], prefix + "residual2"), gamma, beta], prefix + "norm2")
+    nodes.append(helper.make_node("Identity", [hidden], ["last_hidden_state"]))
+
+    inputs = [helper.make_tensor_value_info(name, TensorProto.INT64, ["batch", "sequence"]) for name in ("input_ids", "attention_mask")]
+    output = helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["batch", "sequence", HIDDEN])
+    graph = helper.make_graph(nodes, "synthetic_minilm", inputs, [output], initializers)
+    os.makedirs(os.path.join(directory, "onnx"), exist_ok=True)
+    onnx.save(helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)], ir_version=9), os.path.join(directory, "onnx", "model.onnx"))
+
+
+def build_documents(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    # Mostly full chunks with a tail of short titles, table cells and captions
+    lengths = [rng.choice((rng.randint(4, 30), rng.randint(120, 320), rng.randint(150, 320))) for _ in range(count)]
+    return [" ".join(rng.choice(WORDS) for _ in range(length)) for length in lengths]
+
+
+def measure(label: str, documents, encode) -> np.ndarray:
+    start = time.perf_counter()
+    vectors = encode(documents)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34}{elapsed:>9.2f}{len(documents) / elapsed:>10.1f}")
+    return vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--max-batch-tokens", type=int, default=2048)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = args.model_path or directory
+        if not args.model_path:
+            build_synthetic_model(directory)
+        documents = build_documents(args.documents)
+
+        def engine(**kwargs) -> LocalEmbeddingEngine:
+            return LocalEmbeddingEngine(model_path=model_path, backend="onnx", **kwargs)
+
+        print(f"{args.documents} documents on {os.cpu_count()} CPUs")
+        print(f"{'batching':<34}{'seconds':>9}{'docs/s':>10}")
+        fixed = engine(max_batch_size=32, max_batch_tokens=10 ** 9)
+        fixed.load()
+        measure("batches of 32 in input order", documents, lambda texts: np.concatenate([fixed.encode(texts[start:start + 32]) for start in range(0, len(texts), 32)]))
+        measure("sorted batches of 32", documents, fixed.encode)
+
+        budget = engine(max_batch_tokens=args.max_batch_tokens)
+        budget.load()
+        reference = measure("token budget", documents, budget.encode)
+
+        quantized = engine(max_batch_tokens=args.max_batch_tokens, quantize=True)
+        quantized.load()
+        int8 = measure("token budget int8", documents, quantized.encode)
+
+        pooled = engine(max_batch_tokens=args.max_batch_tokens, processes=args.processes)
+        # Warm the workers up, loading the model is not part of the throughput
+        pooled.encode(documents[:args.processes])
+        measure(f"token budget, {args.processes} processes", documents, pooled.encode)
+        pooled.close()
+
+        similarity = np.sum(reference * int8, axis=1)
+        print(f"int8 vs fp32 cosine similarity: mean {similarity.mean():.4f}, min {similarity.min():.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Chunks/s of MilvusManager.insert_document against embedding batch size.
+
+Embeddings come from a local FakeOpenAIServer with a fixed per-request latency and
+Milvus is replaced by an in-memory stand-in for Collection/utility, so the numbers
+isolate the request batching. Run from the project root:
+
+    python -m benchmarks.milvus_insert_benchmark --chunks 2000 --batch-sizes 1 16 64 256
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+from app.embeddings import milvus_vector_manager
+from app.embeddings.cached_embeddings import EmbeddingCache
+from app.embeddings.milvus_vector_manager import HTTP_CLIENT_NAME, MilvusManager
+from app.utils.http_client_registry import HTTPClientRegistry
+from benchmarks.fake_servers import FakeOpenAIServer
+
+
+class InMemoryCollection:
+    """Milvus Collection stand-in that keeps inserted rows per collection name."""
+    rows: Dict[str, List[list]] = {}
+    insert_sizes: List[int] = []
+
+    def __init__(self, name: str, schema=None, **kwargs):
+        self.name = name
+        InMemoryCollection.rows.setdefault(name, [])
+
+    @property
+    def indexes(self):
+        return []
+
+    def insert(self, data: List[list]):
+        InMemoryCollection.insert_sizes.append(len(data[0]))
+        InMemoryCollection.rows[self.name].extend(zip(*data))
+
+    def create_index(self, field_name: str, index_params: dict):
+        pass
+
+
+class InMemoryUtility:
+    @staticmethod
+    def has_collection(name: str) -> bool:
+        return name in InMemoryCollection.rows
+
+
+class NoopConnections:
+    @staticmethod
+    def connect(*args, **kwargs):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per embedding request")
+    args = parser.parse_args()
+
+    milvus_vector_manager.Collection = InMemoryCollection
+    milvus_vector_manager.utility = InMemoryUtility
+    milvus_vector_manager.connections = NoopConnections
+
+    with FakeOpenAIServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        manager = MilvusManager(openai_api_key="fake-key")
+        print(f"{'batch size':>12}{'requests':>10}{'elapsed':>10}{'chunks/s':>12}")
+        for batch_size in args.batch_sizes:
+            # A fresh cache per run so every run really embeds every chunk
+            EmbeddingCache._instance = EmbeddingCache(path=f"{cache_dir}/cache_{batch_size}.db")
+            texts = [f"Chunk {index} of the employee handbook, batch size {batch_size}." for index in range(args.chunks)]
+            requests_before = server.request_count
+            start = time.perf_counter()
+            manager.insert_document(
+                collection_name=f"benchmark_{batch_size}",
+                texts=texts,
+                keywords=[[] for _ in texts],
+                embedding_batch_size=batch_size,
+                max_concurrency=args.concurrency,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{batch_size:>12}{server.request_count - requests_before:>10}{elapsed:>9.2f}s{args.chunks / elapsed:>12.1f}")
+        print(f"{HTTP_CLIENT_NAME} client:", HTTPClientRegistry.shared().stats()[HTTP_CLIENT_NAME])
+
+
+if __name__ == "__main__":
+    main()
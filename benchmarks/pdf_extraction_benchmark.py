@@ -0,0 +1,84 @@
+"""
+In-memory PDF extraction vs the `*_extracted.txt` temp file round-trip.
+
+Generates a text PDF for every page count in `--pages` (or uses `--pdf`) and times
+DocumentLoader.load_file with and without `extract_to_file`. Run from the project root:
+
+    python -m benchmarks.pdf_extraction_benchmark --pages 100 300 600
+"""
+import argparse
+import os
+import tempfile
+import time
+from app.utils.document_loader import DocumentLoader
+
+
+def write_sample_pdf(path: str, page_count: int, lines_per_page: int = 45):
+    """Writes a minimal uncompressed PDF with `lines_per_page` lines of Helvetica text on every page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled once the page object ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_index in range(page_count):
+        lines = [
+            f"({page_index + 1}.{line}: Employees may claim one annual eye exam under the standard plan.) Tj T*"
+            for line in range(lines_per_page)
+        ]
+        stream = ("BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(lines) + " ET").encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % page_count
+
+    with open(path, "wb") as pdf:
+        pdf.write(b"%PDF-1.4\n")
+        offsets = []
+        for object_id, body in enumerate(objects, start=1):
+            offsets.append(pdf.tell())
+            pdf.write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+        xref_offset = pdf.tell()
+        pdf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            pdf.write(b"%010d 00000 n \n" % offset)
+        pdf.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+
+
+def time_load(pdf_path: str, extract_to_file: bool):
+    start = time.perf_counter()
+    chunks = DocumentLoader.load_file(pdf_path, extract_to_file=extract_to_file)
+    elapsed = time.perf_counter() - start
+    if extract_to_file:
+        os.remove(pdf_path.replace(".pdf", "_extracted.txt"))
+    return elapsed, len(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--pdf", help="benchmark an existing PDF instead of generated ones")
+    args = parser.parse_args()
+
+    print(f"{'pages':>8}{'temp file s':>14}{'in-memory s':>14}{'chunks':>10}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_paths = []
+        if args.pdf:
+            pdf_paths.append(("-", args.pdf))
+        else:
+            for page_count in args.pages:
+                pdf_path = os.path.join(work_dir, f"sample_{page_count}.pdf")
+                write_sample_pdf(pdf_path, page_count)
+                pdf_paths.append((page_count, pdf_path))
+        for page_count, pdf_path in pdf_paths:
+            temp_file_time, _ = time_load(pdf_path, extract_to_file=True)
+            in_memory_time, chunks = time_load(pdf_path, extract_to_file=False)
+            print(f"{page_count:>8}{temp_file_time:>14.2f}{in_memory_time:>14.2f}{chunks:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Queries/s with a fresh psycopg2 connection per query vs PostgresConnectionPool.
+
+By default a stand-in connection simulates the TCP+auth handshake and the query
+round-trip with sleeps. Pass `--real` to run `SELECT 1` against the database from
+the POSTGRES_DB_* environment variables (e.g. docker/pgvector-compose.yml):
+
+    python -m benchmarks.postgres_pool_benchmark --threads 16 --queries 2000
+    python -m benchmarks.postgres_pool_benchmark --real --threads 16 --queries 2000
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import psycopg2
+from app.databases.postgres_connection_pool import PostgresConnectionPool
+
+
+class SimulatedConnection:
+    handshake_latency = 0.02
+    query_latency = 0.001
+
+    def __init__(self, **params):
+        time.sleep(self.handshake_latency)
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, query, params=None):
+        time.sleep(self.query_latency)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def run_query(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    connection.commit()
+
+
+def run(label: str, threads: int, queries: int, task):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: task(), range(queries)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10}{elapsed:>10.2f}s{queries / elapsed:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--real", action="store_true")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.real:
+        connect = psycopg2.connect
+        conn_params = {
+            'host': os.environ['POSTGRES_DB_HOST'],
+            'database': os.environ['POSTGRES_DB_NAME'],
+            'user': os.environ['POSTGRES_DB_USER'],
+            'password': os.environ['POSTGRES_DB_PASSWORD'],
+            'port': os.environ['POSTGRES_DB_PORT'],
+        }
+    else:
+        connect = SimulatedConnection
+        conn_params = {}
+
+    def unpooled():
+        connection = connect(**conn_params)
+        try:
+            run_query(connection)
+        finally:
+            connection.close()
+
+    pool = PostgresConnectionPool(conn_params, min_size=1, max_size=args.pool_size, connect=connect)
+
+    def pooled():
+        with pool.connection() as connection:
+            run_query(connection)
+
+    print(f"{'mode':<10}{'elapsed':>11}{'queries/s':>12}")
+    run("unpooled", args.threads, args.queries, unpooled)
+    run("pooled", args.threads, args.queries, pooled)
+    print("pool stats:", pool.stats())
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
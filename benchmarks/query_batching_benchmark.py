@@ -0,0 +1,67 @@
+"""
+Query embedding throughput and latency under concurrent searches, one forward pass per
+query (batch size 1) against MicroBatchingEmbeddings coalescing them.
+
+`--concurrency` clients each embed their next query as soon as the previous one returned,
+until `--requests` queries are done. The batch-size-1 path runs the model on the default
+thread pool, as LangChain's aembed_query does. The model is the generated all-MiniLM-L6-v2
+shaped ONNX model of local_embedding_benchmark (or `--model-path`). Run from the project root:
+
+    python -m benchmarks.query_batching_benchmark --requests 600 --concurrency 1 8 32 64 --wait-ms 3
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from app.embeddings.local_embedding_engine import LocalEmbeddingEngine
+from app.embeddings.micro_batching_embeddings import MicroBatchingEmbeddings
+from benchmarks.local_embedding_benchmark import WORDS, build_synthetic_model
+
+
+async def run(label: str, embed, queries, concurrency: int):
+    pending = list(queries)
+    latencies = []
+
+    async def client():
+        while pending:
+            query = pending.pop()
+            start = time.perf_counter()
+            await embed(query)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:<12}{concurrency:>6}{len(queries) / elapsed:>10.1f}"
+          f"{latencies[len(latencies) // 2] * 1000:>10.1f}{latencies[int(len(latencies) * 0.99)] * 1000:>10.1f}")
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.model_path:
+            build_synthetic_model(directory)
+        engine = LocalEmbeddingEngine(model_path=args.model_path or directory, backend="onnx")
+        engine.load()
+        rng = random.Random(5)
+        queries = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 24))) for _ in range(args.requests)]
+        engine.encode(queries[:8])
+
+        print(f"{'embedding':<12}{'clients':>6}{'QPS':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for concurrency in args.concurrency:
+            await run("batch of 1", lambda query: asyncio.to_thread(engine.embed_query, query), queries, concurrency)
+            batcher = MicroBatchingEmbeddings(engine, max_batch_size=args.max_batch_size, max_wait_ms=args.wait_ms)
+            await run("micro-batch", batcher.aembed_query, queries, concurrency)
+            batcher.close()
+            print(f"{'':<18}{batcher.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--wait-ms", type=float, default=3.0)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--model-path", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,93 @@
+"""
+Cost of building the ConversationalRetrievalChain on every chat call (the previous
+behaviour) against the compiled chain cache of ConversationalRAGChatbot.
+
+A fake LLM and an in-memory vector store keep model and database latency out of
+the numbers, so what remains is LangChain's own overhead. `--profile` prints the
+top functions of both paths by cumulative time. Run from the project root:
+
+    python -m benchmarks.rag_chain_construction_benchmark --calls 500 --profile
+"""
+import argparse
+import cProfile
+import pstats
+import time
+from langchain.chains import ConversationalRetrievalChain
+from langchain.memory import ConversationBufferWindowMemory
+from langchain_community.callbacks import get_openai_callback
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListLLM
+from langchain_core.vectorstores import InMemoryVectorStore
+from app.langchain.conversational_rag_chatbot import ConversationalRAGChatbot
+
+QUESTIONS = ["How is leave accrued?", "Can I carry leave over?", "Who approves sick leave?"]
+
+
+def build_per_call(llm, vectorstore, top_k: int = 5, relevancy: float = 0.5) -> ConversationalRetrievalChain:
+    """The chain as chat() used to build it for every query."""
+    memory = ConversationBufferWindowMemory(memory_key='chat_history', return_messages=True, output_key='answer', k=10)
+    return ConversationalRetrievalChain.from_llm(
+        llm=llm,
+        retriever=vectorstore.as_retriever(k=top_k, lambda_mult=relevancy),
+        memory=memory,
+        return_source_documents=True,
+    )
+
+
+def timed(label: str, calls: int, function, profile: bool):
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    for index in range(calls):
+        function(index)
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{elapsed * 1_000_000 / calls:>14.1f}")
+    return profiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    vectorstore = InMemoryVectorStore(embedding=DeterministicFakeEmbedding(size=64))
+    vectorstore.add_documents([
+        Document(page_content=f"Policy paragraph {index} about leave.", metadata={"source": f"policy-{index % 5}.pdf"})
+        for index in range(200)
+    ])
+    llm = FakeListLLM(responses=["Leave accrues monthly."])
+    chatbot = ConversationalRAGChatbot(llm=llm, vectorstore=vectorstore)
+    per_call_memories = {}
+
+    def per_call_chat(index: int):
+        user_id = f"user-{index % args.users}"
+        chain = build_per_call(llm, vectorstore)
+        # The previous code kept one memory per user and attached it to the new chain
+        chain.memory = per_call_memories.setdefault(user_id, chain.memory)
+        with get_openai_callback():
+            chain({"question": QUESTIONS[index % len(QUESTIONS)]})
+
+    def cached_chat(index: int):
+        chatbot.chat(query=QUESTIONS[index % len(QUESTIONS)], user_id=f"user-{index % args.users}")
+
+    print(f"{'path':<28}{'us/call':>14}")
+    timed("construct per call", args.calls, lambda _: build_per_call(llm, vectorstore), False)
+    timed("cached chain lookup", args.calls, lambda _: chatbot.get_conversation_chain(), False)
+    profiles = [
+        ("chat, chain per call", timed("chat, chain per call", args.calls, per_call_chat, args.profile)),
+        ("chat, cached chain", timed("chat, cached chain", args.calls, cached_chat, args.profile)),
+    ]
+    for label, profiler in profiles:
+        if profiler:
+            print(f"\n{label}:")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(12)
+
+
+if __name__ == "__main__":
+    main()
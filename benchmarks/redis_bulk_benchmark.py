@@ -0,0 +1,97 @@
+"""
+Loading and invalidating many session keys through RedisManager: one round-trip per key
+(set_value / get_value / delete_value) against the pipelined mset / mget / delete_by_prefix,
+with the JSON and msgpack serializers.
+
+Redis is stood in for by fakeredis served over TCP on loopback, so every round-trip
+crosses a real socket. Loopback round-trips are far cheaper than a network hop; the
+last column adds `--rtt-ms` per round-trip to estimate a remote Redis. Run from the
+project root:
+
+    python -m benchmarks.redis_bulk_benchmark --keys 5000 --rtt-ms 0.5
+"""
+import argparse
+import contextlib
+import io
+import socket
+import threading
+import time
+import redis
+from fakeredis import TcpFakeServer
+from app.databases.redis_store_manager import BATCH_SIZE, RedisManager
+
+
+def session(index: int) -> dict:
+    return {
+        "user_id": f"user-{index}",
+        "turns": [{"question": f"What is the leave policy for team {turn}?", "answer": "Employees get 25 days. " * 4} for turn in range(5)],
+        "scores": [0.91, 0.87, 0.55],
+        "updated_at": 1760000000.0 + index,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def per_key(manager: RedisManager, values: dict):
+    # The single-key methods print on every call; the output is discarded, not its cost
+    with contextlib.redirect_stdout(io.StringIO()):
+        for key, value in values.items():
+            manager.set_value(key, value)
+        for key in values:
+            manager.get_value(key)
+        for key in values:
+            manager.delete_value(key)
+    return 3 * len(values)
+
+
+def bulk(manager: RedisManager, values: dict):
+    manager.mset(values)
+    assert len(manager.mget(values)) == len(values)
+    assert manager.delete_by_prefix("session:") == len(values)
+    batches = -(-len(values) // BATCH_SIZE)
+    # mset, mget, then SCAN pages plus one UNLINK per batch
+    return 2 * batches + 2 * batches + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = TcpFakeServer(("127.0.0.1", port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    values = {f"session:{index}": session(index) for index in range(args.keys)}
+
+    print(f"{args.keys} keys, set + get + delete")
+    print(f"{'method':<18}{'serializer':<12}{'seconds':>9}{'round-trips':>13}{'est. at rtt':>13}")
+    for label, run, serializer in (("per key", per_key, "json"), ("pipelined", bulk, "json"), ("pipelined", bulk, "msgpack")):
+        client = redis.Redis(host="127.0.0.1", port=port, decode_responses=serializer == "json")
+        manager = RedisManager(redis_client=client, serializer=serializer)
+        start = time.perf_counter()
+        round_trips = run(manager, values)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<18}{serializer:<12}{elapsed:>9.2f}{round_trips:>13}{elapsed + round_trips * args.rtt_ms / 1000:>13.2f}")
+        client.close()
+
+    print()
+    print(f"{'serializer':<12}{'bytes/value':>12}{'dump+load µs':>14}")
+    value = session(0)
+    for serializer in ("json", "msgpack"):
+        manager = RedisManager(redis_client=object(), serializer=serializer)
+        payload = manager.serialize(value)
+        start = time.perf_counter()
+        for _ in range(10000):
+            manager.deserialize(manager.serialize(value))
+        elapsed = time.perf_counter() - start
+        print(f"{serializer:<12}{len(payload):>12}{elapsed / 10000 * 1e6:>14.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Helpdesk traffic through ConversationalRAGChatbot with and without SemanticResponseCache.
+
+Questions are drawn with a Zipf skew from a set of topics, each asked in several
+phrasings ("Does my plan cover eye exams?", "does my plan cover eye exams please").
+A hashing bag-of-words embedding stands in for the embedding model, and a fake LLM
+sleeps `--llm-latency` per call and reports gpt-4o-mini token usage, so
+`get_openai_callback` prices the calls. The last line times a lookup against a
+full cache of `--entries` 1536-dimensional vectors. Run from the project root:
+
+    python -m benchmarks.semantic_cache_benchmark --queries 300 --llm-latency 0.2
+"""
+import argparse
+import hashlib
+import random
+import statistics
+import time
+from typing import Any, List, Optional
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import FakeListLLM
+from langchain_core.outputs import Generation, LLMResult
+from langchain_core.vectorstores import InMemoryVectorStore
+from app.langchain.conversational_rag_chatbot import ConversationalRAGChatbot
+from app.langchain.semantic_response_cache import SemanticResponseCache
+
+TOPICS = [
+    "does my plan cover eye exams", "how many days of annual leave do i get", "how do i reset my vpn password",
+    "who approves travel expenses", "can i carry over unused leave", "is dental cleaning covered",
+    "how do i add a dependent to my insurance", "what is the notice period for resignation",
+    "how do i request a new laptop", "when is payroll processed", "is remote work allowed on fridays",
+    "how do i claim mileage", "what is the parental leave policy", "how do i book a meeting room",
+    "where can i find my payslip", "what is the sick leave policy",
+]
+PHRASINGS = ["{}?", "{}", "{} please", "Hi, {}?", "{}, thanks"]
+
+
+class HashingEmbeddings(Embeddings):
+    def __init__(self, size: int = 256):
+        self.size = size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        for word in text.lower().replace("?", " ").replace(",", " ").split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.size] += 1.0
+        return vector
+
+
+class PricedFakeLLM(FakeListLLM):
+    latency: float = 0.2
+    calls: int = 0
+
+    def _generate(self, prompts: List[str], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> LLMResult:
+        self.calls += len(prompts)
+        time.sleep(self.latency)
+        prompt_tokens = sum(len(prompt.split()) * 4 // 3 for prompt in prompts)
+        return LLMResult(
+            generations=[[Generation(text=self.responses[0])] for _ in prompts],
+            llm_output={"model_name": "gpt-4o-mini", "token_usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 60, "total_tokens": prompt_tokens + 60}},
+        )
+
+
+def run(label: str, questions: List[str], latency: float, use_cache: bool):
+    embeddings = HashingEmbeddings()
+    vectorstore = InMemoryVectorStore(embedding=embeddings)
+    vectorstore.add_documents([Document(page_content=f"Policy on {topic}.", metadata={"source": f"policy-{index}.pdf"}) for index, topic in enumerate(TOPICS)])
+    llm = PricedFakeLLM(responses=["Please see the policy document for details."], latency=latency)
+    cache = SemanticResponseCache(embeddings, threshold=0.9) if use_cache else None
+    chatbot = ConversationalRAGChatbot(llm=llm, vectorstore=vectorstore, response_cache=cache)
+
+    latencies, cost = [], 0.0
+    for index, question in enumerate(questions):
+        answer = chatbot.chat(query=question, user_id=f"user-{index}")
+        latencies.append(answer["time_taken"])
+        cost += answer["total_cost"]
+    stats = cache.stats() if cache else {"hit_rate": 0.0, "cost_saved": 0.0}
+    print(f"{label:<10}{statistics.median(latencies) * 1000:>9.0f}{statistics.mean(latencies) * 1000:>10.0f}"
+          f"{llm.calls:>11}{cost:>12.5f}{stats['hit_rate']:>10.0%}{stats['cost_saved']:>12.5f}")
+
+
+def time_lookup(entries: int, dimensions: int = 1536):
+    cache = SemanticResponseCache(HashingEmbeddings(), max_entries=entries)
+    rng = np.random.default_rng(0)
+    for index in range(entries):
+        vector = rng.standard_normal(dimensions).astype(np.float32)
+        cache.store(vector / np.linalg.norm(vector), query=str(index), answer="", documents=[])
+    probe = rng.standard_normal(dimensions).astype(np.float32)
+    probe /= np.linalg.norm(probe)
+    start = time.perf_counter()
+    for _ in range(100):
+        cache.lookup(probe)
+    print(f"lookup against {entries} x {dimensions} entries: {(time.perf_counter() - start) * 10:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--entries", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    weights = [1 / (rank + 1) for rank in range(len(TOPICS))]
+    questions = [rng.choice(PHRASINGS).format(rng.choices(TOPICS, weights)[0].capitalize()) for _ in range(args.queries)]
+
+    print(f"{'cache':<10}{'p50 ms':>9}{'mean ms':>10}{'LLM calls':>11}{'cost $':>12}{'hit rate':>10}{'saved $':>12}")
+    run("off", questions, args.llm_latency, use_cache=False)
+    run("semantic", questions, args.llm_latency, use_cache=True)
+    time_lookup(args.entries)
+
+
+if __name__ == "__main__":
+    main()
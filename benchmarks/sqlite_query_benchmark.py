@@ -0,0 +1,75 @@
+"""
+Latency of SQLiteDBManager._execute_query for a single-row lookup and a 10k-row scan.
+
+"per-query" reproduces the previous behaviour (connect per query, JSON round-trip of
+the result set); "persistent" is the current manager. Run from the project root:
+
+    python -m benchmarks.sqlite_query_benchmark --lookups 5000 --scans 50
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from app.databases.sqlite_database_manager import SQLiteDBManager
+from app.utils.file_system import FileSystem
+
+ROW_COUNT = 10_000
+
+
+def per_query(database: str, query: str, params=(), fetch_one=False):
+    conn = sqlite3.connect(database)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        column_names = [column[0] for column in cursor.description]
+        if fetch_one:
+            result = dict(zip(column_names, cursor.fetchone()))
+        else:
+            result = [dict(zip(column_names, row)) for row in cursor.fetchall()]
+        conn.commit()
+        return json.loads(json.dumps(result))
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def measure(label: str, iterations: int, call):
+    start = time.perf_counter()
+    for i in range(iterations):
+        call(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26}{iterations:>8}{elapsed * 1000 / iterations:>14.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--scans", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "benchmark.db")
+        os.environ["SQLITE_DB_PATH"] = os.path.relpath(database, FileSystem().get_project_dir())
+        manager = SQLiteDBManager()
+        manager._execute_query("CREATE TABLE chats (id INTEGER PRIMARY KEY, user_id TEXT, message TEXT, created_at TEXT)")
+        start = time.perf_counter()
+        manager._execute_many(
+            "INSERT INTO chats (id, user_id, message, created_at) VALUES (?, ?, ?, ?)",
+            ((i, f"user-{i % 100}", f"message number {i}", "2024-01-01 00:00:00") for i in range(ROW_COUNT)),
+        )
+        print(f"executemany insert of {ROW_COUNT} rows: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+        lookup = "SELECT * FROM chats WHERE id = ?"
+        scan = "SELECT * FROM chats"
+        print(f"{'query':<26}{'runs':>8}{'ms/query':>14}")
+        measure("single row, per-query", args.lookups, lambda i: per_query(database, lookup, (i % ROW_COUNT,), fetch_one=True))
+        measure("single row, persistent", args.lookups, lambda i: manager._execute_query(lookup, (i % ROW_COUNT,), fetch_one=True))
+        measure("10k rows, per-query", args.scans, lambda i: per_query(database, scan))
+        measure("10k rows, persistent", args.scans, lambda i: manager._execute_query(scan))
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Import-time report of the app's entry points, from `python -X importtime`.
+
+Every target runs `--repeats` times in a fresh interpreter: `main` is what a worker
+or `uvicorn main:app` pays before serving, `main.App()` adds building the routers and
+controllers, the managers show what the first chat or ingestion request pays later.
+Per target it prints the median wall time of the interpreter, the import time from
+the report, the heavy packages that were loaded and the top-level packages that took
+longest (self time of all their modules). Settings missing from the environment are
+taken from .env.example and logs go to a temporary folder. Run from the project root,
+without a sitecustomize or PYTHONSTARTUP that imports anything:
+
+    python -m benchmarks.startup_import_benchmark --repeats 5 --top 8
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from dotenv import dotenv_values
+
+TARGETS = {
+    "main": "import main",
+    "main.App()": "import main; main.App()",
+    "local_llm_manager": "import app.langchain.local_llm_manager",
+    "milvus_vector_manager": "import app.embeddings.milvus_vector_manager",
+}
+HEAVY_PACKAGES = ("langchain", "langchain_core", "langchain_community", "spacy", "transformers", "torch", "pymilvus", "boto3", "groq", "openai")
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_report(report: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, nesting depth) of every line of an importtime report."""
+    modules = []
+    for line in report.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            modules.append((match.group(4), int(match.group(1)), int(match.group(2)), (len(match.group(3)) - 1) // 2))
+    return modules
+
+
+def run_target(code: str, env: Dict[str, str]) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return elapsed, parse_report(completed.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--targets", nargs="*", default=list(TARGETS), choices=list(TARGETS))
+    args = parser.parse_args()
+
+    log_folder = tempfile.TemporaryDirectory()
+    env = {key: value for key, value in dotenv_values(".env.example").items() if value is not None}
+    env.update(os.environ, APP_LOGGING_FOLDER=log_folder.name)
+    env.setdefault("LOCAL_LLM_STEAM", "false")
+
+    print(f"{'target':<24}{'wall ms':>10}{'import ms':>11}{'modules':>9}  heavy packages loaded")
+    reports: Dict[str, List[Tuple[str, int, int, int]]] = {}
+    for target in args.targets:
+        walls, imports = [], []
+        try:
+            for _ in range(args.repeats):
+                elapsed, modules = run_target(TARGETS[target], env)
+                walls.append(elapsed)
+                imports.append(sum(cumulative for _, _, cumulative, depth in modules if depth == 0))
+                reports[target] = modules
+        except RuntimeError as e:
+            print(f"{target:<24}  import failed: {e}")
+            continue
+        loaded = {name.split(".")[0] for name, _, _, _ in reports[target]}
+        heavy = ", ".join(package for package in HEAVY_PACKAGES if package in loaded) or "-"
+        print(f"{target:<24}{statistics.median(walls) * 1000:>10.0f}{statistics.median(imports) / 1000:>11.0f}"
+              f"{len(reports[target]):>9}  {heavy}")
+
+    for target, modules in reports.items():
+        packages: Dict[str, int] = defaultdict(int)
+        for name, self_us, _, _ in modules:
+            packages[name.split(".")[0]] += self_us
+        slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(f"\n{target}: slowest top-level packages (self time, last run)")
+        for package, self_us in slowest:
+            print(f"  {package:<28}{self_us / 1000:>8.1f} ms")
+    log_folder.cleanup()
+
+
+if __name__ == "__main__":
+    main()
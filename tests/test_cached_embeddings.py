@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import List
+import pytest
+from langchain_core.embeddings import Embeddings
+from app.embeddings.cached_embeddings import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    model = "counting-model"
+
+    def __init__(self):
+        self.embedded_texts: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded_texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def test_repeated_chunks_are_embedded_once(tmp_path):
+    backend = CountingEmbeddings()
+    embeddings = CachedEmbeddings(backend, cache=EmbeddingCache(path=str(tmp_path / "cache.db")))
+
+    first = embeddings.embed_documents(["Page footer", "Intro", "Page  footer "])
+    second = embeddings.embed_documents(["Intro", "Page footer"])
+
+    assert backend.embedded_texts == ["Page footer", "Intro"]
+    assert first[0] == first[2] == second[1]
+    assert embeddings.cache.stats()["misses"] == 3
+    assert embeddings.cache.stats()["memory_hits"] == 2
+
+
+def test_disk_tier_survives_restart_and_is_size_bounded(tmp_path):
+    path = str(tmp_path / "cache.db")
+    EmbeddingCache(path=path).set_many("model", ["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+
+    reopened = EmbeddingCache(path=path, max_memory_entries=1, max_disk_bytes=64)
+    assert reopened.get_many("model", ["a", "b", "c"]) == [[1.0, 2.0], [3.0, 4.0], None]
+    assert reopened.stats()["disk_hits"] == 2
+    assert reopened.stats()["memory_entries"] == 1
+
+    reopened.set_many("model", [str(index) for index in range(20)], [[float(index)] * 2 for index in range(20)])
+    assert reopened.stats()["disk_bytes"] <= 64
+
+
+class ThirdsEmbeddings(CountingEmbeddings):
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded_texts.extend(texts)
+        return [[len(text) / 3, 0.1] for text in texts]
+
+
+def test_every_tier_returns_the_same_float32_vector(tmp_path):
+    path = str(tmp_path / "cache.db")
+    embeddings = CachedEmbeddings(ThirdsEmbeddings(), cache=EmbeddingCache(path=path))
+
+    fresh = embeddings.embed_documents(["The leave policy."])[0]
+    from_memory = embeddings.embed_documents(["The leave policy."])[0]
+    from_disk = EmbeddingCache(path=path).get_many("counting-model", ["The leave policy."])[0]
+
+    assert fresh == from_memory == from_disk
+    assert fresh != [17 / 3, 0.1] and fresh == pytest.approx([17 / 3, 0.1])
+
+
+def test_concurrent_callers_share_one_cache(monkeypatch):
+    created = []
+    monkeypatch.setattr(EmbeddingCache, "_instance", None)
+    monkeypatch.setattr(EmbeddingCache, "__init__", lambda self: time.sleep(0.01) or created.append(self))
+    caches = []
+    threads = [threading.Thread(target=lambda: caches.append(EmbeddingCache.shared())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1 and all(cache is created[0] for cache in caches)
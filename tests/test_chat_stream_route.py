@@ -0,0 +1,68 @@
+import json
+import os
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain.chains import ConversationChain
+from langchain.memory import ConversationBufferMemory
+from langchain_core.language_models import FakeStreamingListLLM
+from app.constants.route_paths import RoutePaths
+from app.langchain.streaming_chat_manager import StreamingChatManager
+from app.routers.chat_route import ChatRouter
+from app.utils.file_system import FileSystem
+
+
+class FakeStreamingManager(StreamingChatManager):
+    def __init__(self, responses):
+        self.llm_model = FakeStreamingListLLM(responses=responses)
+        self.conversation_memory = ConversationBufferMemory()
+        self.conversation_chain = ConversationChain(llm=self.llm_model, memory=self.conversation_memory)
+
+
+@pytest.fixture
+def chat_router(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_DB_PATH", os.path.relpath(tmp_path / "chat.db", FileSystem().get_project_dir()))
+    return ChatRouter()
+
+
+def read_events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    return events
+
+
+def test_stream_chat_sends_tokens_then_end_event(chat_router):
+    chat_router.llm_manager = FakeStreamingManager(responses=["Leave accrues monthly."])
+    app = FastAPI()
+    app.include_router(chat_router.router)
+
+    with TestClient(app) as client:
+        response = client.post(f"{RoutePaths.API_PREFIX}{RoutePaths.CHAT_STREAM}", json={"question": "How is leave accrued?", "store": True})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = read_events(response)
+    assert events[-1] == ("end", {})
+    tokens = [data["token"] for event, data in events[:-1]]
+    assert len(tokens) > 1 and "".join(tokens) == "Leave accrues monthly."
+    assert "Leave accrues monthly." in chat_router.llm_manager.conversation_memory.buffer
+
+
+def test_choice_less_stream_chunks_are_skipped(monkeypatch):
+    from app.langchain import groq_llm_manager
+    from app.langchain.local_llm_manager import parse_stream_line
+
+    def chunk(*texts):
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text)) for text in texts])
+
+    # Groq can end a stream with a usage-only chunk
+    chunks = [chunk("Leave "), chunk(None), chunk("accrues."), chunk()]
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: iter(chunks))))
+    monkeypatch.setattr(groq_llm_manager, "get_groq_client", lambda api_key: client)
+    llm = groq_llm_manager.GROQLLM(GROQ_API_KEY="key", MODEL="model")
+
+    assert [generation.text for generation in llm._stream("How is leave accrued?")] == ["Leave ", "accrues."]
+    assert parse_stream_line('data: {"choices": [], "usage": {"total_tokens": 12}}') is None
+    assert parse_stream_line('data: {"choices": [{"delta": {"content": "Leave"}}]}') == "Leave"
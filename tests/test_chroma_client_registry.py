@@ -0,0 +1,48 @@
+import threading
+import time
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from app.embeddings.chroma_client_registry import ChromaClientRegistry
+
+
+class FakeStore:
+    def __init__(self, client, collection_name, embedding_function):
+        time.sleep(0.01)
+        self.client = client
+        self.collection_name = collection_name
+        self.embeddings = embedding_function
+
+
+def test_concurrent_callers_share_one_client_and_store_per_collection(tmp_path):
+    registry = ChromaClientRegistry(open_client=lambda path: object(), open_store=FakeStore)
+    embedding = DeterministicFakeEmbedding(size=8)
+    stores = []
+
+    def search():
+        stores.append(registry.get_store(str(tmp_path), "handbook", embedding))
+
+    threads = [threading.Thread(target=search) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other = registry.get_store(str(tmp_path), "policies", embedding)
+
+    assert all(store is stores[0] for store in stores)
+    assert other.client is stores[0].client
+    assert registry.stats() == {"clients_opened": 1, "stores_opened": 2, "store_reuses": 7, "open_clients": 1, "open_stores": 2}
+
+
+def test_close_and_refresh_reopen_stores(tmp_path):
+    registry = ChromaClientRegistry(open_client=lambda path: object(), open_store=FakeStore)
+    embedding = DeterministicFakeEmbedding(size=8)
+    store = registry.get_store(str(tmp_path), "handbook", embedding)
+
+    refreshed = registry.refresh(str(tmp_path), "handbook")
+    assert refreshed is not store and refreshed.embeddings is embedding
+    assert registry.get_store(str(tmp_path), "handbook", embedding) is refreshed
+
+    registry.close(str(tmp_path), "handbook")
+    assert registry.stats()["open_clients"] == 1
+    registry.close()
+    assert registry.get_store(str(tmp_path), "handbook", embedding).client is not store.client
+    assert registry.refresh(str(tmp_path), "missing") is None
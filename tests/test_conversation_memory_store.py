@@ -0,0 +1,44 @@
+import os
+import time
+import pytest
+from app.langchain.conversation_memory_store import InMemoryConversationStore, RedisConversationStore, SQLiteConversationStore
+from app.utils.file_system import FileSystem
+
+
+def test_in_memory_store_keeps_window_and_evicts_least_recent_user():
+    store = InMemoryConversationStore(window=2, max_users=2)
+    for index in range(3):
+        store.append_turn("alice", f"question {index}", f"answer {index}")
+    store.append_turn("bob", "hi", "hello")
+    store.load_turns("alice")
+    store.append_turn("carol", "hi", "hello")
+
+    assert store.load_turns("alice") == [("question 1", "answer 1"), ("question 2", "answer 2")]
+    assert store.load_turns("bob") == []
+    assert len(store) == 2
+
+
+def test_in_memory_store_expires_idle_users():
+    store = InMemoryConversationStore(ttl_seconds=0.01)
+    store.append_turn("alice", "hi", "hello")
+    time.sleep(0.02)
+
+    assert store.load_turns("alice") == []
+    assert store.delete("alice") is False
+
+
+@pytest.mark.parametrize("backend", ["redis", "sqlite"])
+def test_shared_stores_round_trip_turns(backend, tmp_path, monkeypatch):
+    if backend == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        store = RedisConversationStore(window=3, redis_client=fakeredis.FakeRedis(decode_responses=True))
+    else:
+        monkeypatch.setenv("SQLITE_DB_PATH", os.path.relpath(tmp_path / "memory.db", FileSystem().get_project_dir()))
+        store = SQLiteConversationStore(window=3)
+
+    store.append_turn("alice", "Wie viele Urlaubstage?", "30 Tage.")
+    store.append_turn("alice", "And sick leave?", "Unlimited.")
+
+    assert store.load_turns("alice") == [("Wie viele Urlaubstage?", "30 Tage."), ("And sick leave?", "Unlimited.")]
+    assert store.delete("alice") is True
+    assert store.load_turns("alice") == []
@@ -0,0 +1,50 @@
+import asyncio
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListLLM
+from langchain_core.vectorstores import InMemoryVectorStore
+from app.enums.condense_mode import CondenseMode
+from app.langchain.conversational_rag_chatbot import ConversationalRAGChatbot
+
+
+def build_chatbot(responses, **kwargs):
+    vectorstore = InMemoryVectorStore(embedding=DeterministicFakeEmbedding(size=8))
+    vectorstore.add_documents([Document(page_content="Leave accrues monthly.", metadata={"source": "leave.pdf"})])
+    return ConversationalRAGChatbot(llm=FakeListLLM(responses=responses), vectorstore=vectorstore, **kwargs)
+
+
+def test_achat_answers_and_keeps_history_per_user():
+    chatbot = build_chatbot(["Monthly."])
+
+    answer = asyncio.run(chatbot.achat(query="How is leave accrued?", user_id="alice"))
+
+    assert answer["answer"] == "Monthly."
+    assert answer["sources"] == ["leave.pdf"]
+    assert chatbot.get_chat_history("alice") == [{"human": "How is leave accrued?", "ai": "Monthly."}]
+    assert chatbot.get_chat_history("bob") == []
+
+
+def test_chat_reuses_compiled_chain_and_injects_history():
+    # The follow-up question is condensed first, which takes one response of its own
+    chatbot = build_chatbot(["Monthly.", "What happens to accrued leave?", "It is paid out.", "30 days."])
+
+    chatbot.chat(query="How is leave accrued?", user_id="alice")
+    answer = chatbot.chat(query="And when I leave?", user_id="alice", return_history=True)
+    chatbot.chat(query="How many days?", user_id="bob")
+
+    assert [message.content for message in answer["chat_history"]] == ["How is leave accrued?", "Monthly."]
+    assert chatbot.get_conversation_chain() is chatbot.get_conversation_chain(top_k=5, relevancy=0.5)
+    assert chatbot.get_conversation_chain(top_k=3) is not chatbot.get_conversation_chain()
+    assert chatbot.get_chat_history("bob") == [{"human": "How many days?", "ai": "30 days."}]
+
+
+def test_heuristic_mode_condenses_only_follow_ups():
+    chatbot = build_chatbot(["Monthly.", "30 days.", "How is leave paid out?", "In the final salary."], condense_mode=CondenseMode.HEURISTIC)
+
+    first = chatbot.chat(query="How is leave accrued?")
+    standalone = chatbot.chat(query="How many days of annual leave do employees get?")
+    follow_up = chatbot.chat(query="And when leaving?")
+
+    assert not first["question_condensed"]
+    assert (standalone["question_condensed"], standalone["answer"]) == (False, "30 days.")
+    assert (follow_up["question_condensed"], follow_up["answer"]) == (True, "In the final salary.")
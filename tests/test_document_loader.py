@@ -0,0 +1,69 @@
+import shutil
+import pytest
+from app.utils.document_loader import DocumentLoader
+from app.utils.iter_batches import iter_batches
+
+
+@pytest.fixture
+def text_directory(tmp_path):
+    for index in range(6):
+        (tmp_path / f"doc_{index}.txt").write_text(f"Document number {index}. " * 50, encoding="utf-8")
+    return tmp_path
+
+
+def test_parallel_load_matches_serial_order(text_directory):
+    serial = DocumentLoader.load_directory(str(text_directory), chunk_size=200, chunk_overlap=0)
+    parallel = DocumentLoader.load_directory(str(text_directory), chunk_size=200, chunk_overlap=0,
+                                             parallel=True, max_workers=2, max_threads=3)
+    assert [doc.page_content for doc in parallel] == [doc.page_content for doc in serial]
+    assert [doc.metadata["source"] for doc in parallel] == [doc.metadata["source"] for doc in serial]
+
+
+def test_parallel_load_records_failures_per_file(text_directory):
+    (text_directory / "doc_3.txt").write_bytes(b"\xff\xfe\xfa invalid utf-8")
+    results = list(DocumentLoader.iter_directory_results(str(text_directory), max_workers=1, max_threads=2, max_pending=2))
+    assert [result.file_path.rsplit("/", 1)[-1] for result in results] == [f"doc_{index}.txt" for index in range(6)]
+    assert [result.failed for result in results] == [False, False, False, True, False, False]
+    assert all(result.documents for result in results if not result.failed)
+
+
+def test_iter_directory_streams_same_chunks_in_batches(text_directory):
+    chunks = DocumentLoader.iter_directory(str(text_directory), chunk_size=200, chunk_overlap=0)
+    assert not isinstance(chunks, list)
+    batches = list(iter_batches(chunks, 4))
+    assert all(len(batch) <= 4 for batch in batches)
+    expected = DocumentLoader.load_directory(str(text_directory), chunk_size=200, chunk_overlap=0)
+    assert [doc.page_content for batch in batches for doc in batch] == [doc.page_content for doc in expected]
+
+
+def test_pdf_is_extracted_in_memory_with_page_numbers(tmp_path):
+    pdf_path = tmp_path / "employee_handbook.pdf"
+    shutil.copy("mock/docs/employee_handbook.pdf", pdf_path)
+    chunks = DocumentLoader.load_file(str(pdf_path))
+    assert chunks
+    assert all(chunk.metadata["page_number"] >= 1 for chunk in chunks)
+    assert not list(tmp_path.glob("*_extracted.txt"))
+
+
+def test_abandoned_excel_iteration_closes_the_workbook(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    from app.utils import document_extractor
+    path = tmp_path / "leave.xlsx"
+    workbook = openpyxl.Workbook()
+    for row in range(5):
+        workbook.active.append([f"employee {row}", row])
+    workbook.save(path)
+    load = openpyxl.load_workbook
+    closed = []
+
+    def load_workbook(*args, **kwargs):
+        opened = load(*args, **kwargs)
+        opened.close = lambda: closed.append(True)
+        return opened
+
+    monkeypatch.setattr(document_extractor.openpyxl, "load_workbook", load_workbook)
+    lines = document_extractor.DocumentExtractor().iter_excel_lines(str(path))
+    assert next(lines) == "employee 0 0\n"
+    lines.close()
+
+    assert closed == [True]
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+import random
+import httpx
+import pytest
+from langchain_core.documents import Document
+from app.utils.metadata_extractor import DocumentProcessor
+from app.utils.token_chunker import TextChunk
+
+
+class FakeExtractionManager:
+    def __init__(self, rate_limited_calls=0):
+        self.calls = []
+        self.rate_limited_calls = rate_limited_calls
+
+    async def arun_llm_chain(self, prompt_template, output_parser=None, input_values={}):
+        self.calls.append(input_values["text"])
+        if self.rate_limited_calls:
+            self.rate_limited_calls -= 1
+            request = httpx.Request("POST", "http://llm/v1/chat/completions")
+            raise httpx.HTTPStatusError("Rate limit reached", request=request, response=httpx.Response(429, request=request))
+        await asyncio.sleep(random.uniform(0, 0.02))
+        return {"summary": input_values["text"][:12]}
+
+
+class ByteEncoding:
+    def encode(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+
+class PagedDocumentProcessor(DocumentProcessor):
+    encoding = ByteEncoding()
+
+    def load_document(self, file_path):
+        return [Document(page_content=f"Page {page:03d} " + "x" * 19990) for page in range(12)]
+
+
+def test_chunks_run_concurrently_in_order_and_resume_from_checkpoint(tmp_path):
+    manager = FakeExtractionManager()
+    processor = PagedDocumentProcessor(output_dir=str(tmp_path), llm_manager=manager, max_concurrency=4, max_chunk_tokens=20000)
+    # An earlier run that was interrupted after five chunks
+    chunks = processor.split_chunks(processor.load_document("handbook.pdf"))
+    asyncio.run(processor.aprocess_chunks(chunks[:5], checkpoint_path=processor.checkpoint_path("handbook.pdf")))
+
+    manager.calls.clear()
+    results_path = processor.process_document("handbook.pdf")
+
+    with open(results_path) as results:
+        results = json.load(results)
+    assert [result["summary"] for result in results] == [f"Page {page:03d} xxx" for page in range(12)]
+    assert [result["page_numbers"] for result in results] == [[page] for page in range(1, 13)]
+    assert len(manager.calls) == 7
+    assert not os.path.exists(processor.checkpoint_path("handbook.pdf"))
+
+
+def test_rate_limited_calls_are_retried(tmp_path):
+    manager = FakeExtractionManager(rate_limited_calls=2)
+    processor = PagedDocumentProcessor(output_dir=str(tmp_path), llm_manager=manager, max_concurrency=2)
+    processor.rate_limiter.pause = lambda seconds: None
+
+    chunks = [TextChunk("first chunk", 11, [1]), TextChunk("second chunk", 12, [1])]
+    results, failed = asyncio.run(processor.aprocess_chunks(chunks, checkpoint_path=str(tmp_path / "checkpoint.jsonl")))
+
+    assert failed == 0
+    assert [result["summary"] for result in results] == ["first chunk", "second chunk"]
+    assert len(manager.calls) == 4
+
+
+def test_only_real_rate_limits_are_retried_and_sync_entry_point_refuses_a_running_loop(tmp_path):
+    processor = PagedDocumentProcessor(output_dir=str(tmp_path), llm_manager=FakeExtractionManager())
+
+    # An error that merely mentions 429 (a token count, an ID) is not a rate limit
+    assert not processor.is_rate_limited(ValueError("Could not parse output of chunk 4290"))
+
+    async def called_from_async_route():
+        return processor.process_document("handbook.pdf")
+
+    with pytest.raises(RuntimeError, match="aprocess_document"):
+        asyncio.run(called_from_async_route())
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.utils.http_client_registry import HTTPClientRegistry
+
+
+class SlowOkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(0.05)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowOkHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sequential_requests_reuse_one_connection(server_url):
+    registry = HTTPClientRegistry(http2=False)
+    client = registry.get_client("llm")
+    assert registry.get_client("llm") is client
+
+    for _ in range(5):
+        assert client.get(server_url).text == "ok"
+
+    stats = registry.stats()["llm"]
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["reused_connections"] == 4
+    assert stats["in_flight"] == 0
+    registry.close()
+
+
+def test_per_host_cap_limits_concurrent_async_requests(server_url):
+    registry = HTTPClientRegistry(http2=False, max_connections_per_host=1)
+
+    async def fetch_all():
+        client = registry.get_async_client("embeddings")
+        assert registry.get_async_client("embeddings") is client
+        responses = await asyncio.gather(*(client.get(server_url) for _ in range(3)))
+        await client.aclose()
+        return responses
+
+    assert [response.text for response in asyncio.run(fetch_all())] == ["ok"] * 3
+    stats = registry.stats()["embeddings"]
+    assert stats["connections_opened"] == 1
+    assert stats["host_limit_waits"] == 2
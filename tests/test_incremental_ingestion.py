@@ -0,0 +1,43 @@
+import os
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+from app.embeddings.incremental_ingestion_manager import IncrementalIngestionManager
+from app.utils.document_loader import DocumentLoader
+from app.utils.file_system import FileSystem
+
+
+@pytest.fixture
+def ingestion_manager(tmp_path, monkeypatch):
+    database_path = os.path.relpath(tmp_path / "manifest.db", FileSystem().get_project_dir())
+    monkeypatch.setenv("SQLITE_DB_PATH", database_path)
+    return IncrementalIngestionManager()
+
+
+def sync(ingestion_manager, vector_store, directory):
+    return ingestion_manager.sync_directory(
+        vector_store=vector_store,
+        collection_name="handbook",
+        directory=str(directory),
+        load_chunks=lambda file_path: DocumentLoader.iter_file(file_path, chunk_size=100, chunk_overlap=0),
+    )
+
+
+def test_only_new_and_changed_files_are_embedded(ingestion_manager, tmp_path):
+    documents = tmp_path / "docs"
+    documents.mkdir()
+    for name in ("leave", "benefits", "travel"):
+        (documents / f"{name}.txt").write_text(f"The {name} policy. " * 20, encoding="utf-8")
+    vector_store = InMemoryVectorStore(embedding=DeterministicFakeEmbedding(size=8))
+
+    assert sync(ingestion_manager, vector_store, documents) == {"added": 3, "updated": 0, "unchanged": 0, "deleted": 0}
+    assert sync(ingestion_manager, vector_store, documents) == {"added": 0, "updated": 0, "unchanged": 3, "deleted": 0}
+
+    (documents / "leave.txt").write_text("The revised leave policy.", encoding="utf-8")
+    (documents / "travel.txt").unlink()
+    assert sync(ingestion_manager, vector_store, documents) == {"added": 0, "updated": 1, "unchanged": 1, "deleted": 1}
+
+    sources = {document["metadata"]["source"] for document in vector_store.store.values()}
+    assert sources == {str(documents / "leave.txt"), str(documents / "benefits.txt")}
+    leave_texts = [document["text"] for document in vector_store.store.values() if document["metadata"]["source"].endswith("leave.txt")]
+    assert leave_texts == ["The revised leave policy."]
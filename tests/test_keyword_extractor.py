@@ -0,0 +1,55 @@
+import pytest
+from app.utils.keyword_extractor import KeywordExtractor
+
+spacy = pytest.importorskip("spacy")
+Language = spacy.language.Language
+
+POS = {"policy": "NOUN", "pension": "NOUN", "rules": "NOUN", "leave": "NOUN", "42": "NOUN", "days": "NOUN", "acme": "PROPN"}
+
+
+@Language.component("test_lookup_tagger")
+def lookup_tagger(doc):
+    for token in doc:
+        token.pos_ = POS.get(token.lower_, "X")
+    return doc
+
+
+@Language.component("test_exploding_component")
+def exploding_component(doc):
+    raise AssertionError("components keyword extraction does not need must not run")
+
+
+def build_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("test_lookup_tagger")
+    return nlp
+
+
+def test_keywords_are_ranked_by_tfidf_over_the_batch():
+    texts = ["The policy covers the pension. Policy and pension rules: 42 days.", "The policy covers leave at Acme."]
+
+    tfidf = KeywordExtractor(nlp=build_nlp(), max_keywords=3).extract(texts)
+    frequency = KeywordExtractor(nlp=build_nlp(), max_keywords=3, ranking="frequency").extract(texts)
+
+    # "policy" is in every text, so the equally frequent "pension" ranks first; "42" and stop words are skipped
+    assert tfidf == [["pension", "policy", "rules"], ["leave", "Acme", "policy"]]
+    assert frequency[0] == ["policy", "pension", "rules"]
+    assert KeywordExtractor(nlp=build_nlp()).extract([]) == []
+
+
+def test_unneeded_components_are_excluded_and_disabled(monkeypatch):
+    loaded = {}
+
+    def load(name, exclude):
+        loaded.update(name=name, exclude=exclude)
+        return build_nlp()
+
+    monkeypatch.setattr(spacy, "load", load)
+    KeywordExtractor(model="en_core_web_sm").load()
+    assert loaded["name"] == "en_core_web_sm"
+    assert {"parser", "ner", "lemmatizer"} <= set(loaded["exclude"])
+
+    nlp = build_nlp()
+    nlp.add_pipe("test_exploding_component", name="parser")
+    nlp.add_pipe("test_exploding_component", name="ner")
+    assert KeywordExtractor(nlp=nlp).extract_one("Acme pension rules") == ["Acme", "pension", "rules"]
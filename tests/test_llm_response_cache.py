@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import pytest
+from langchain.prompts import PromptTemplate
+from langchain_core.language_models import FakeListLLM
+from app.langchain.llm_response_cache import CachedLLMChainManager, LLMResponseCache, SQLiteResponseTier
+
+PROMPT = PromptTemplate.from_template("Extract the keywords of: {text}")
+
+
+class FakeManager(CachedLLMChainManager):
+    def __init__(self, temperature, response_cache, responses=("first", "second")):
+        self.temperature = temperature
+        self.response_cache = response_cache
+        self.llm_model = FakeListLLM(responses=list(responses))
+
+    def response_cache_identity(self):
+        return ("fake", "fake-model", self.temperature)
+
+    def complete(self, text):
+        return self.cached_completion(PROMPT, {"text": text}, lambda: self.llm_model.invoke(PROMPT.format(text=text)))
+
+
+def test_deterministic_calls_hit_memory_then_the_persistent_tier(tmp_path):
+    path = str(tmp_path / "responses.db")
+    manager = FakeManager("0", LLMResponseCache(persistent_tier=SQLiteResponseTier(path)))
+
+    assert [manager.complete("leave policy"), manager.complete("leave policy"), manager.complete("travel policy")] == ["first", "first", "second"]
+    assert manager.response_cache.stats()["memory_hits"] == 1
+
+    restarted = FakeManager(0.0, LLMResponseCache(persistent_tier=SQLiteResponseTier(path)), responses=("fresh",))
+    assert asyncio.run(restarted.acached_completion(PROMPT, {"text": "leave policy"}, lambda: restarted.llm_model.ainvoke("leave policy"))) == "first"
+    assert restarted.response_cache.stats()["persistent_hits"] == 1
+
+
+def test_sampled_calls_and_errors_are_not_cached():
+    sampled = FakeManager(0.7, LLMResponseCache())
+    assert [sampled.complete("leave policy"), sampled.complete("leave policy")] == ["first", "second"]
+    assert sampled.response_cache.stats()["skipped"] == 2
+
+    failing = FakeManager(0, LLMResponseCache(), responses=("Request failed: timeout", "ok"))
+    assert [failing.complete("leave policy"), failing.complete("leave policy")] == ["Request failed: timeout", "ok"]
+
+
+def test_identity_is_required_and_the_default_backend_is_memory(monkeypatch):
+    class WithoutIdentity(CachedLLMChainManager):
+        pass
+
+    with pytest.raises(TypeError):
+        WithoutIdentity()
+
+    monkeypatch.delenv("LLM_RESPONSE_CACHE_BACKEND", raising=False)
+    assert LLMResponseCache.from_env().persistent_tier is None
+
+
+def test_async_calls_use_the_persistent_tier_off_the_event_loop(tmp_path, monkeypatch):
+    tier = SQLiteResponseTier(str(tmp_path / "responses.db"))
+    manager = FakeManager(0, LLMResponseCache(persistent_tier=tier), responses=("first",))
+    threads = []
+    original_get = tier.get
+    monkeypatch.setattr(tier, "get", lambda key: threads.append(threading.get_ident()) or original_get(key))
+
+    result = asyncio.run(manager.acached_completion(PROMPT, {"text": "leave policy"}, lambda: manager.llm_model.ainvoke("leave policy")))
+
+    assert result == "first" and tier.get(manager._response_cache_key(PROMPT, {"text": "leave policy"})) == "first"
+    assert threads[0] != threading.get_ident()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from app.embeddings.local_embedding_engine import LocalEmbeddingEngine
+
+tokenizers = pytest.importorskip("tokenizers")
+
+VOCAB = ["[UNK]", "leave", "policy", "benefits", "salary", "notice", "period"]
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordLevel({word: index for index, word in enumerate(VOCAB)}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer.save(str(tmp_path / "tokenizer.json"))
+    return str(tmp_path)
+
+
+def one_hot_runner(inputs):
+    # Token embeddings are one-hot rows, so a sentence embedding is its normalized bag of words
+    return np.eye(len(VOCAB), dtype=np.float32)[inputs["input_ids"]]
+
+
+def test_batches_stay_within_token_budget_longest_first(model_path):
+    engine = LocalEmbeddingEngine(model_path=model_path, max_batch_tokens=12, max_batch_size=3)
+
+    batches = engine.plan_batches([2, 6, 1, 3, 3, 1, 1, 1])
+
+    assert batches == [[1, 3], [4, 0, 2], [5, 6, 7]]
+    assert all(len(batch) * max([2, 6, 1, 3, 3, 1, 1, 1][index] for index in batch) <= 12 for batch in batches)
+
+
+def test_vectors_keep_input_order_and_ignore_padding(model_path):
+    engine = LocalEmbeddingEngine(model_path=model_path, max_batch_tokens=8)
+    engine.runner = one_hot_runner
+    texts = ["leave policy", "salary", "leave policy benefits notice period", "notice period", "benefits"]
+
+    vectors = np.array(engine.embed_documents(texts))
+
+    assert np.allclose(vectors, [engine.embed_query(text) for text in texts])
+    assert np.allclose(vectors[0], [0, 1, 1, 0, 0, 0, 0] / np.sqrt(2))
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1)
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+from app.embeddings.micro_batching_embeddings import MicroBatchingEmbeddings
+
+
+class RecordingEmbeddings:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model failed")
+        return [[float(len(text))] for text in texts]
+
+
+def test_concurrent_queries_share_one_forward_pass():
+    model = RecordingEmbeddings()
+    batcher = MicroBatchingEmbeddings(model, max_batch_size=8, max_wait_ms=50)
+    texts = ["a", "bb", "ccc", "bb", "dddd", "eeeee"]
+
+    async def search_all():
+        return await asyncio.gather(*(batcher.aembed_query(text) for text in texts))
+
+    vectors = asyncio.run(search_all())
+    sync_vector = batcher.embed_query("ffffff")
+    batcher.close()
+
+    assert vectors == [[1.0], [2.0], [3.0], [2.0], [4.0], [5.0]]
+    assert sync_vector == [6.0]
+    assert model.batches == [["a", "bb", "ccc", "dddd", "eeeee"], ["ffffff"]]
+    assert batcher.stats() == {"queries": 7, "batches": 2, "mean_batch_size": 3.5, "max_batch_size": 6}
+
+
+def test_errors_reach_every_caller_of_the_batch():
+    batcher = MicroBatchingEmbeddings(RecordingEmbeddings(fail=True), max_wait_ms=50)
+    errors = []
+
+    def search(text):
+        try:
+            batcher.embed_query(text)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=search, args=(f"query {index}",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert errors == ["model failed"] * 4
@@ -0,0 +1,204 @@
+import threading
+from types import SimpleNamespace
+from typing import Dict, List
+import httpx
+import openai
+import pytest
+from app.embeddings import milvus_vector_manager
+from app.embeddings.cached_embeddings import EmbeddingCache
+from app.embeddings.milvus_vector_manager import MilvusManager
+
+
+def api_error(error_class, status_code: int):
+    response = httpx.Response(status_code, request=httpx.Request("POST", "http://test/embeddings"))
+    return error_class(f"status {status_code}", response=response, body=None)
+
+
+class StubEmbeddingsAPI:
+    """`client.embeddings` stand-in, the embedding of "chunk N" is [N], returned out of order like the API may."""
+
+    def __init__(self):
+        self.requests: List[List[str]] = []
+        self.models: List[str] = []
+        self.failures: List[Exception] = []
+        self.__LOCK = threading.Lock()
+
+    def create(self, input: List[str], model: str):
+        with self.__LOCK:
+            self.requests.append(list(input))
+            self.models.append(model)
+            failure = self.failures.pop(0) if self.failures else None
+        if failure:
+            raise failure
+        data = [SimpleNamespace(index=index, embedding=[float(text.split()[-1])]) for index, text in enumerate(input)]
+        return SimpleNamespace(data=data[::-1])
+
+
+class StubCollection:
+    """Milvus Collection stand-in, `hits` holds the (id, distance, file name) search results of every collection."""
+    inserts: Dict[str, List[list]] = {}
+    hits: Dict[str, List[tuple]] = {}
+    loads: List[str] = []
+    searches: List[dict] = []
+    queries: List[str] = []
+
+    def __init__(self, name: str, schema=None, **kwargs):
+        self.name = name
+
+    @property
+    def indexes(self):
+        return ["embedding"]
+
+    def insert(self, data: List[list]):
+        StubCollection.inserts.setdefault(self.name, []).append(data)
+
+    def update(self, expr, data):
+        StubCollection.inserts.setdefault(self.name, []).append(data)
+
+    def load(self):
+        StubCollection.loads.append(self.name)
+
+    def search(self, data, anns_field, param, limit, expr, output_fields):
+        StubCollection.searches.append({"collection": self.name, "limit": limit, "expr": expr, "output_fields": output_fields})
+        hits = sorted(StubCollection.hits[self.name], key=lambda hit: hit[1])[:limit]
+        return [[SimpleNamespace(id=id, distance=distance, entity={"file_name": file_name, "keywords": "leave", "text_content": f"text of {id}"})
+                 for id, distance, file_name in hits]]
+
+    def query(self, expr, output_fields):
+        StubCollection.queries.append(expr)
+        return []
+
+
+class StubUtility:
+    dropped: List[str] = []
+
+    @staticmethod
+    def has_collection(name: str) -> bool:
+        return True
+
+    @staticmethod
+    def list_collections() -> List[str]:
+        return list(StubCollection.hits)
+
+    @staticmethod
+    def drop_collection(name: str):
+        StubUtility.dropped.append(name)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(milvus_vector_manager, "connections", SimpleNamespace(connect=lambda *args, **kwargs: None))
+    monkeypatch.setattr(milvus_vector_manager, "Collection", StubCollection)
+    monkeypatch.setattr(milvus_vector_manager, "utility", StubUtility)
+    for name, value in (("inserts", {}), ("hits", {}), ("loads", []), ("searches", []), ("queries", [])):
+        monkeypatch.setattr(StubCollection, name, value)
+    monkeypatch.setattr(StubUtility, "dropped", [])
+    monkeypatch.setattr(MilvusManager, "_instance", None)
+    monkeypatch.setattr(EmbeddingCache, "_instance", EmbeddingCache(path=str(tmp_path / "embeddings.db")))
+    manager = MilvusManager(openai_api_key="test-key")
+    manager._openai_client = SimpleNamespace(embeddings=StubEmbeddingsAPI())
+    manager.sleeps = []
+    monkeypatch.setattr(milvus_vector_manager, "time", SimpleNamespace(sleep=manager.sleeps.append))
+    return manager
+
+
+def chunks(start: int, stop: int) -> List[str]:
+    return [f"chunk {index}" for index in range(start, stop)]
+
+
+def test_one_request_per_batch_and_cached_texts_are_not_requested_again(manager):
+    api = manager._openai_client.embeddings
+
+    embeddings = manager.create_embeddings(chunks(0, 10), batch_size=4, max_concurrency=2)
+
+    assert embeddings == [[float(index)] for index in range(10)]
+    assert sorted(len(request) for request in api.requests) == [2, 4, 4]
+
+    again = manager.create_embeddings(chunks(5, 15), batch_size=4)
+    assert again == [[float(index)] for index in range(5, 15)]
+    assert sorted(api.requests[3:]) == [chunks(10, 14), chunks(14, 15)]
+    assert manager.create_embedding("chunk 3") == [3.0] and len(api.requests) == 5
+
+
+def test_transient_errors_are_retried_until_max_retries(manager):
+    api = manager._openai_client.embeddings
+    api.failures = [api_error(openai.RateLimitError, 429), api_error(openai.InternalServerError, 503)]
+
+    assert manager.create_embeddings(chunks(0, 2), max_retries=2) == [[0.0], [1.0]]
+    assert len(api.requests) == 3 and len(manager.sleeps) == 2
+
+    api.failures = [api_error(openai.RateLimitError, 429)] * 3
+    with pytest.raises(openai.RateLimitError):
+        manager.create_embeddings(chunks(2, 4), max_retries=2)
+    assert len(api.requests) == 6
+
+    api.failures = [api_error(openai.BadRequestError, 400)]
+    with pytest.raises(openai.BadRequestError):
+        manager.create_embeddings(chunks(4, 6), max_retries=2)
+    assert len(api.requests) == 7
+
+
+def test_the_callers_model_is_used_for_inserts_searches_and_updates(manager):
+    api = manager._openai_client.embeddings
+    StubCollection.hits = {"handbook": [(1, 0.4, "leave.pdf")]}
+
+    manager.insert_document("handbook", chunks(0, 2), keywords=[[]] * 2, model="text-embedding-3-large", dim=3072)
+    manager.search_similar("chunk 7", model="text-embedding-3-large", nprobe=5)
+    manager.update_document("handbook", 1, "chunk 8", new_keywords=["leave"], model="text-embedding-3-large", index_type="HNSW")
+    manager.create_embedding("chunk 9")
+
+    assert api.models == ["text-embedding-3-large"] * 3 + ["text-embedding-ada-002"]
+    with pytest.raises(TypeError):
+        manager.create_embeddings(chunks(0, 1), dimensions=256)
+
+
+def test_documents_are_inserted_in_insert_batch_size_chunks(manager):
+    texts = chunks(0, 5)
+
+    manager.insert_document("handbook", texts, file_names=[f"{index}.pdf" for index in range(5)], keywords=[["leave"]] * 5,
+                            embedding_batch_size=2, insert_batch_size=2, index_type="HNSW")
+
+    inserts = StubCollection.inserts["handbook"]
+    assert [len(data[0]) for data in inserts] == [2, 2, 1]
+    embeddings, file_names, keywords, text_content = (sum(column, []) for column in zip(*inserts))
+    assert embeddings == [[float(index)] for index in range(5)]
+    assert file_names == ["0.pdf", "1.pdf", "2.pdf", "3.pdf", "4.pdf"]
+    assert keywords == ["leave"] * 5 and text_content == texts
+
+    with pytest.raises(ValueError):
+        manager.insert_document("handbook", texts, file_names=["0.pdf"])
+    assert len(StubCollection.inserts["handbook"]) == 3
+
+
+def test_search_fans_out_and_merges_the_global_top_k(manager):
+    StubCollection.hits = {
+        "handbook": [(1, 0.4, "leave.pdf"), (2, 0.1, "leave.pdf"), (3, 0.9, "travel.pdf")],
+        "policies": [(4, 0.2, "pension.pdf"), (5, 0.3, "pension.pdf")],
+        "empty": [],
+    }
+
+    results = manager.search_similar("chunk 7", top_k=3, filters={"file": ["leave.pdf", "pension.pdf"], "keywords": ["leave"]})
+    again = manager.search_similar("chunk 7", top_k=3)
+
+    assert [(result["collection"], result["id"], result["distance"]) for result in results] == [("handbook", 2, 0.1), ("policies", 4, 0.2), ("policies", 5, 0.3)]
+    assert results[0] == {"collection": "handbook", "id": 2, "distance": 0.1, "file_name": "leave.pdf", "keywords": "leave", "text_content": "text of 2"}
+    assert [result["id"] for result in again] == [2, 4, 5]
+    assert sorted(search["collection"] for search in StubCollection.searches) == ["empty", "empty", "handbook", "handbook", "policies", "policies"]
+    assert StubCollection.searches[0]["output_fields"] == ["file_name", "keywords", "text_content"]
+    assert {search["limit"] for search in StubCollection.searches} == {3}
+    assert {search["expr"] for search in StubCollection.searches[:3]} == {'(file_name == "leave.pdf" or file_name == "pension.pdf") and (keywords like "%leave%")'}
+    assert sorted(StubCollection.loads) == ["empty", "handbook", "policies"]
+    assert StubCollection.queries == []
+    assert manager._openai_client.embeddings.requests == [["chunk 7"]]
+
+
+def test_dropped_collections_are_loaded_again(manager):
+    StubCollection.hits = {"handbook": [(1, 0.4, "leave.pdf")]}
+
+    manager.search_similar("chunk 1", collection_name="handbook")
+    manager.search_similar("chunk 1", collection_name="handbook")
+    manager.drop_collection("handbook")
+    assert manager.search_similar("chunk 1", collection_name="handbook")[0]["id"] == 1
+
+    assert StubUtility.dropped == ["handbook"]
+    assert StubCollection.loads == ["handbook", "handbook"]
@@ -0,0 +1,77 @@
+import threading
+import pytest
+from app.databases.postgres_connection_pool import PostgresConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, query, params=None):
+        if self.connection.broken:
+            raise ConnectionError("server closed the connection unexpectedly")
+
+
+class FakeConnection:
+    def __init__(self, **params):
+        self.closed = False
+        self.broken = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_connections_are_reused():
+    pool = PostgresConnectionPool({}, min_size=1, max_size=2, connect=FakeConnection)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["acquired"] == 2
+
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    pool = PostgresConnectionPool({}, min_size=0, max_size=1, connect=FakeConnection)
+    held = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    threading.Timer(0.05, pool.release, args=(held,)).start()
+    assert pool.acquire(timeout=2) is held
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_broken_idle_connection_is_replaced_after_health_check():
+    pool = PostgresConnectionPool({}, min_size=1, max_size=1, health_check_interval=0, connect=FakeConnection)
+    with pool.connection() as connection:
+        connection.broken = True
+    with pool.connection() as replacement:
+        assert replacement is not connection
+    assert connection.closed
+    assert pool.stats()["health_check_failures"] == 1
+    assert pool.stats()["size"] == 1
+
+
+def test_shared_pool_keeps_first_sizing_and_warns_about_different_sizing(caplog):
+    params = {"host": "db", "database": "test_shared_pool_sizing"}
+    first = PostgresConnectionPool.for_params(params, min_size=0, max_size=4, connect=FakeConnection)
+
+    same = PostgresConnectionPool.for_params(dict(params), min_size=0, max_size=4, connect=FakeConnection)
+    assert same is first and not caplog.records
+
+    other = PostgresConnectionPool.for_params(params, min_size=0, max_size=20, connect=FakeConnection)
+    assert other is first and other.max_size == 4
+    assert "ignoring {'max_size': 20}" in caplog.text
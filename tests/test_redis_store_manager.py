@@ -0,0 +1,32 @@
+import pytest
+from app.databases.redis_store_manager import RedisManager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def test_bulk_operations_with_ttl_and_prefix_invalidation():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    manager = RedisManager(redis_client=client)
+
+    assert manager.mset({f"session:{index}": {"turns": index} for index in range(25)}, ttl=60, batch_size=10) == 25
+    manager.mset({"session*:literal": 1, "user:1": {"name": "alice"}})
+
+    assert manager.mget(["session:3", "missing", "user:1"], batch_size=2) == {"session:3": {"turns": 3}, "user:1": {"name": "alice"}}
+    assert 0 < client.ttl("session:3") <= 60
+    assert client.ttl("user:1") == -1
+    assert manager.delete_by_prefix("session:", batch_size=7) == 25
+    assert manager.delete_many(["session*:literal", "user:1", "missing"]) == 2
+    assert client.dbsize() == 0
+
+
+def test_msgpack_serializer_round_trips_values():
+    pytest.importorskip("msgpack")
+    manager = RedisManager(redis_client=fakeredis.FakeRedis(), serializer="msgpack", default_ttl=30)
+    value = {"question": "What is the leave policy?", "scores": [0.5, 1.0], "cached": True}
+
+    manager.set_value("answer", value)
+    manager.mset({"first": [1, 2], "second": None})
+
+    assert manager.get_value("answer") == value
+    assert manager.mget(["first", "second"]) == {"first": [1, 2], "second": None}
+    assert 0 < manager.redis_client.ttl("first") <= 30
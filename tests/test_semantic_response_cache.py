@@ -0,0 +1,116 @@
+import asyncio
+import os
+import time
+from typing import List
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import FakeListLLM
+from langchain_core.vectorstores import InMemoryVectorStore
+from app.embeddings.chroma_client_registry import ChromaClientRegistry
+from app.langchain.conversational_rag_chatbot import ConversationalRAGChatbot
+from app.langchain.local_embeddings import ChromaVectorStoreWithLocalEmbeddings
+from app.langchain.semantic_response_cache import SemanticResponseCache
+from app.utils.file_system import FileSystem
+
+VOCABULARY = ["plan", "cover", "eye", "exams", "dental", "leave", "does", "my"]
+
+
+class BagOfWordsEmbeddings(Embeddings):
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        words = text.lower().replace("?", "").split()
+        return [float(words.count(word)) for word in VOCABULARY] + [0.1]
+
+
+class PersistedStore(InMemoryVectorStore):
+    def persist(self):
+        pass
+
+    def delete_collection(self):
+        self.store.clear()
+
+
+def test_near_duplicates_hit_until_their_source_is_reingested():
+    embeddings = BagOfWordsEmbeddings()
+    vectorstore = InMemoryVectorStore(embedding=embeddings)
+    vectorstore.add_documents([Document(page_content="The plan covers eye exams.", metadata={"source": "vision.pdf"})])
+    cache = SemanticResponseCache(embeddings, threshold=0.95)
+    chatbot = ConversationalRAGChatbot(llm=FakeListLLM(responses=["Yes, once a year.", "No."]), vectorstore=vectorstore, response_cache=cache)
+
+    first = chatbot.chat(query="Does my plan cover eye exams?", user_id="alice")
+    duplicate = chatbot.chat(query="does my plan cover EYE exams", user_id="bob")
+    unrelated = chatbot.chat(query="Does my plan cover dental?", user_id="carol")
+
+    assert (first["cache_hit"], duplicate["cache_hit"], unrelated["cache_hit"]) == (False, True, False)
+    assert duplicate["answer"] == "Yes, once a year." and duplicate["sources"] == ["vision.pdf"]
+    assert cache.invalidate_sources(["vision.pdf"]) == 2
+    assert chatbot.chat(query="Does my plan cover eye exams?", user_id="dave")["cache_hit"] is False
+    assert cache.stats()["hits"] == 1 and cache.stats()["lookups"] == 4
+
+
+def test_entries_expire_and_respect_scope():
+    cache = SemanticResponseCache(BagOfWordsEmbeddings(), ttl_seconds=0.05, max_entries=2)
+    vector = cache.embed("eye exams")
+    cache.store(vector, query="eye exams", answer="Yes.", documents=[], scope=(5, 0.5))
+
+    assert cache.lookup(vector, scope=(3, 0.5)) is None
+    assert cache.lookup(vector, scope=(5, 0.5)).answer == "Yes."
+    time.sleep(0.06)
+    assert cache.lookup(vector, scope=(5, 0.5)) is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.fixture
+def local_store(tmp_path, monkeypatch):
+    """ChromaVectorStoreWithLocalEmbeddings over an in-memory store, with a vision and a dental policy to ingest."""
+    monkeypatch.setenv("SQLITE_DB_PATH", os.path.relpath(tmp_path / "manifest.db", FileSystem().get_project_dir()))
+    embeddings = BagOfWordsEmbeddings()
+    monkeypatch.setattr(ChromaVectorStoreWithLocalEmbeddings, "_embedding", embeddings)
+    vectorstore = PersistedStore(embedding=embeddings)
+    registry = ChromaClientRegistry(open_client=lambda path: object(), open_store=lambda client, collection_name, embedding_function: vectorstore)
+    documents = tmp_path / "docs"
+    documents.mkdir()
+    (documents / "vision.txt").write_text("The plan covers eye exams.", encoding="utf-8")
+    (documents / "dental.txt").write_text("The plan covers dental.", encoding="utf-8")
+    return ChromaVectorStoreWithLocalEmbeddings(registry=registry), vectorstore, documents
+
+
+def cache_answer(cache: SemanticResponseCache, query: str, source: str):
+    vector = cache.embed(query)
+    cache.store(vector, query=query, answer="Yes.", documents=[Document(page_content="", metadata={"source": source})], scope=(5, 0.5))
+    return vector
+
+
+def test_reingesting_a_file_evicts_the_answers_citing_it(local_store):
+    manager, vectorstore, documents = local_store
+    asyncio.run(manager.create_embeddings(document_path=str(documents), collection_name="handbook", incremental=True))
+
+    cache = SemanticResponseCache(vectorstore.embeddings, threshold=0.95)
+    chatbot = ConversationalRAGChatbot(llm=FakeListLLM(responses=["Yes, once a year.", "Twice a year."]), vectorstore=vectorstore, response_cache=cache)
+    chatbot.chat(query="Does my plan cover eye exams?", user_id="alice")
+    dental = cache_answer(cache, "Does my plan cover dental?", str(documents / "dental.txt"))
+
+    (documents / "vision.txt").write_text("The plan covers eye exams twice a year.", encoding="utf-8")
+    asyncio.run(manager.create_embeddings(document_path=str(documents), collection_name="handbook", incremental=True))
+
+    assert cache.stats()["invalidations"] == 1
+    assert cache.lookup(dental, scope=(5, 0.5)).answer == "Yes."
+    refreshed = chatbot.chat(query="Does my plan cover eye exams?", user_id="bob")
+    assert (refreshed["cache_hit"], refreshed["answer"]) == (False, "Twice a year.")
+
+
+def test_full_reingestion_and_collection_deletion_evict_cached_answers(local_store):
+    manager, vectorstore, documents = local_store
+    cache = SemanticResponseCache(vectorstore.embeddings, threshold=0.95)
+    cache_answer(cache, "Does my plan cover eye exams?", str(documents / "vision.txt"))
+    other = cache_answer(cache, "Does my plan cover leave?", "leave.pdf")
+
+    asyncio.run(manager.create_embeddings(document_path=str(documents), collection_name="handbook"))
+
+    assert cache.stats()["invalidations"] == 1
+    assert cache.lookup(other, scope=(5, 0.5)).answer == "Yes."
+    asyncio.run(manager.delete_collection_data(collection_name="handbook"))
+    assert cache.stats()["entries"] == 0
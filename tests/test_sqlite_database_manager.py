@@ -0,0 +1,37 @@
+import os
+import threading
+import pytest
+from app.databases.sqlite_database_manager import SQLiteDBManager
+from app.utils.file_system import FileSystem
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    database_path = os.path.relpath(tmp_path / "app.db", FileSystem().get_project_dir())
+    monkeypatch.setenv("SQLITE_DB_PATH", database_path)
+    manager = SQLiteDBManager()
+    manager._execute_query("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    yield manager
+    manager.close()
+
+
+def test_connection_is_reused_per_thread_in_wal_mode(database):
+    connection = database._get_connection()
+    assert database._get_connection() is connection
+    assert database._execute_query("PRAGMA journal_mode", fetch_one=True) == {"journal_mode": "wal"}
+
+    other_thread_connections = []
+    thread = threading.Thread(target=lambda: other_thread_connections.append(database._get_connection()))
+    thread.start()
+    thread.join()
+    assert other_thread_connections[0] is not connection
+
+
+def test_execute_many_inserts_in_one_batch(database):
+    inserted = database._execute_many("INSERT INTO users (id, name) VALUES (?, ?)", ((i, f"user-{i}") for i in range(100)))
+
+    assert inserted == 100
+    assert database._execute_query("SELECT name FROM users WHERE id = ?", (7,), fetch_one=True) == {"name": "user-7"}
+    rows = database._execute_query("SELECT id, name FROM users ORDER BY id")
+    assert len(rows) == 100 and rows[-1] == {"id": 99, "name": "user-99"}
+    assert database._execute_many("INSERT INTO users (id, name) VALUES (?, ?)", [(1, "duplicate")]) == -1
@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ("langchain", "langchain_core", "langchain_community", "spacy", "pymilvus", "transformers", "boto3")
+
+
+def test_importing_the_app_and_llm_managers_loads_no_heavy_packages_or_settings():
+    code = (
+        "import json, sys\n"
+        "import main\n"
+        f"app_heavy = [name for name in {HEAVY_PACKAGES!r} if name in sys.modules]\n"
+        "import app.langchain.local_llm_manager\n"
+        f"manager_heavy = [name for name in {HEAVY_PACKAGES!r} if name in sys.modules]\n"
+        "print(json.dumps([app_heavy, manager_heavy]))\n"
+    )
+    # A fresh interpreter without the test session's modules, .env or LOCAL_LLM_* settings
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH" and not key.startswith("LOCAL_LLM_")}
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    app_heavy, manager_heavy = json.loads(completed.stdout.splitlines()[-1])
+    assert app_heavy == []
+    # The local LLM manager builds on langchain, nothing heavier comes with it
+    assert [name for name in manager_heavy if not name.startswith("langchain")] == []
+
+
+def test_local_llm_reads_its_settings_when_created(monkeypatch):
+    from app.langchain.local_llm_manager import LocalLLM
+
+    monkeypatch.setenv("LOCAL_LLM_URL", "http://127.0.0.1:9/first")
+    monkeypatch.setenv("LOCAL_LLM_MAX_TOKENS", "64")
+    monkeypatch.setenv("LOCAL_LLM_TEMPERATURE", "0")
+    monkeypatch.setenv("LOCAL_LLM_STEAM", "false")
+    first = LocalLLM()
+    monkeypatch.setenv("LOCAL_LLM_URL", "http://127.0.0.1:9/second")
+
+    assert first.LLM_ENDPOINT == "http://127.0.0.1:9/first"
+    assert LocalLLM().LLM_ENDPOINT == "http://127.0.0.1:9/second"
+    assert first._build_payload("hi")["max_tokens"] == "64"
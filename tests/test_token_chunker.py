@@ -0,0 +1,31 @@
+from app.utils.token_chunker import TokenChunker
+
+
+class ByteEncoding:
+    def encode(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+
+def test_pages_are_packed_whole_with_their_page_numbers():
+    chunker = TokenChunker(ByteEncoding(), max_tokens=25)
+    pages = ["a" * 10, "b" * 10, "", "c" * 10]
+
+    chunks = chunker.split_pages(pages)
+
+    assert [chunk.text for chunk in chunks] == ["a" * 10 + "\n\n" + "b" * 10, "c" * 10]
+    assert [chunk.page_numbers for chunk in chunks] == [[1, 2], [4]]
+    assert [chunk.token_count for chunk in chunks] == [22, 10]
+
+
+def test_oversized_page_is_windowed_instead_of_dropped():
+    chunker = TokenChunker(ByteEncoding(), max_tokens=10, overlap_tokens=2)
+    page = "".join(chr(ord("a") + index) for index in range(26))
+
+    chunks = chunker.split_pages(["short", page])
+
+    assert [chunk.text for chunk in chunks] == ["short", "abcdefghij", "ijklmnopqr", "qrstuvwxyz"]
+    assert [chunk.page_numbers for chunk in chunks] == [[1], [2], [2], [2]]
+    assert max(chunk.token_count for chunk in chunks) <= 10